@@ -0,0 +1,100 @@
+"""
+Measures how long `import pydra` takes in a fresh interpreter, and checks
+that the optional heavy backends (dill, PyYAML, pydantic) and pydra's own
+rarely used modules are not imported along with it. Fails if the median
+time is over the budget.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--budget-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+HEAVY_MODULES = ("dill", "yaml", "pydantic")
+# imported the first time one of their names is used (see pydra/__init__.py)
+LAZY_MODULES = (
+    "pydra.cache",
+    "pydra.diffing",
+    "pydra.expr",
+    "pydra.hooks",
+    "pydra.multirun",
+    "pydra.parallel",
+    "pydra.profile",
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import pydra
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure_import(
+    heavy_modules=HEAVY_MODULES + LAZY_MODULES,
+) -> tuple[float, list[str]]:
+    # bytecode is cached, as it is for installed packages, so that the time
+    # isn't mostly spent compiling pydra
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=tuple(heavy_modules))],
+        cwd=REPO_ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+
+    elapsed = float(out[0])
+    loaded = out[1].split(",") if len(out) > 1 else []
+    return elapsed, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=60.0)
+    args = parser.parse_args()
+
+    # writes the bytecode caches, if they're missing
+    measure_import()
+    timings = []
+    loaded = []
+    for _ in range(args.runs):
+        elapsed, loaded = measure_import()
+        timings.append(elapsed)
+
+    print(
+        f"import pydra: median {statistics.median(timings) * 1000:.2f} ms, "
+        f"min {min(timings) * 1000:.2f} ms over {args.runs} runs"
+    )
+
+    failed = False
+    if loaded:
+        print(f"FAIL: modules imported eagerly: {', '.join(loaded)}")
+        failed = True
+    else:
+        print(f"OK: none of {', '.join(HEAVY_MODULES + LAZY_MODULES)} imported")
+
+    median_ms = statistics.median(timings) * 1000
+    if median_ms > args.budget_ms:
+        print(f"FAIL: median {median_ms:.2f} ms is over the {args.budget_ms} ms budget")
+        failed = True
+    else:
+        print(f"OK: median is within the {args.budget_ms} ms budget")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
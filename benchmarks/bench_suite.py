@@ -0,0 +1,240 @@
+"""
+Times pydra's hot paths (parsing, applying overrides, finalizing,
+serialization and wrapper builds) on synthetic configs, scaled by depth,
+width and list length, with argv lengths from 10 up to 100k.
+
+Results can be saved as JSON and compared against a previous run:
+
+Usage:
+    python benchmarks/bench_suite.py [--quick] [-k FILTER] [--repeat N]
+        [--save results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import make_dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import pydra  # noqa: E402
+from pydra.config import finalize_tree  # noqa: E402
+from pydra.parser import parse  # noqa: E402
+
+ARGV_LENGTHS = [10, 100, 1_000, 10_000, 100_000]
+QUICK_ARGV_LENGTHS = [10, 1_000]
+
+# (depth, width, list length) of the synthetic config trees
+SHAPES = [(2, 8, 16), (4, 16, 256), (6, 32, 4096)]
+QUICK_SHAPES = [(2, 8, 16), (4, 16, 256)]
+
+SWEEP_POINTS = 100
+
+
+def make_config_class(depth: int, width: int, list_len: int) -> type:
+    """
+    A Config class whose instances have width int/float/str fields, a
+    list of list_len floats, a dataclass wrapper and (unless depth is 1)
+    a child of the same shape with depth - 1.
+    """
+    fields = make_dataclass(f"Fields{depth}", [(f"f{i}", int, i) for i in range(width)])
+    child_cls = make_config_class(depth - 1, width, list_len) if depth > 1 else None
+
+    def __init__(self):
+        for i in range(width):
+            setattr(self, f"i{i}", i)
+            setattr(self, f"x{i}", i * 0.5)
+            setattr(self, f"s{i}", f"value{i}")
+        self.values = [i * 0.25 for i in range(list_len)]
+        self.fields = pydra.DataclassWrapper(fields)
+        if child_cls is not None:
+            self.child = child_cls()
+
+    def finalize(self):
+        self.total = sum(self.values)
+
+    return type(
+        f"Level{depth}", (pydra.Config,), {"__init__": __init__, "finalize": finalize}
+    )
+
+
+def make_args(n: int, depth: int, width: int) -> list[str]:
+    """n assignments spread across every level and field of the tree."""
+    args = []
+    for j in range(n):
+        level = j % depth
+        prefix = "child." * level
+        kind = "ixs"[j % 3]
+        value = {"i": str(j), "x": f"{j}.5", "s": f"name{j}"}[kind]
+        args.append(f"{prefix}{kind}{j % width}={value}")
+    return args
+
+
+def build_wrappers(config) -> None:
+    node = config
+    while node is not None:
+        node.fields.build()
+        node = getattr(node, "child", None)
+
+
+def benchmarks(quick: bool, tmp_dir: Path):
+    """Yields (name, setup) pairs, where setup() returns the function to time."""
+    argv_lengths = QUICK_ARGV_LENGTHS if quick else ARGV_LENGTHS
+    shapes = QUICK_SHAPES if quick else SHAPES
+    depth, width, list_len = shapes[1]
+    cls = make_config_class(depth, width, list_len)
+
+    for n in argv_lengths:
+        args = make_args(n, depth, width)
+        yield f"parse[argv={n}]", lambda args=args: lambda: parse(args)
+        yield (
+            f"apply_overrides[argv={n}]",
+            lambda args=args: lambda: pydra.apply_overrides(cls(), args),
+        )
+
+    # sweep-style: the same overrides applied to many fresh configs
+    args = make_args(32, depth, width)
+
+    def sweep_apply():
+        for _ in range(SWEEP_POINTS):
+            pydra.apply_overrides(cls(), args)
+
+    def sweep_plan():
+        plan = pydra.compile_overrides(cls, args)
+
+        def run():
+            for _ in range(SWEEP_POINTS):
+                plan.apply(cls())
+
+        return run
+
+    yield f"sweep_apply_overrides[points={SWEEP_POINTS}]", lambda: sweep_apply
+    yield f"sweep_compiled_plan[points={SWEEP_POINTS}]", sweep_plan
+
+    for depth, width, list_len in shapes:
+        shape = f"d={depth},w={width},l={list_len}"
+        cls = make_config_class(depth, width, list_len)
+
+        yield f"construct[{shape}]", lambda cls=cls: cls
+        yield f"finalize[{shape}]", lambda cls=cls: (
+            lambda config=cls(): finalize_tree(config)
+        )
+        yield f"to_dict[{shape}]", lambda cls=cls: cls().to_dict
+        yield f"from_dict[{shape}]", lambda cls=cls: (
+            lambda data=cls().to_dict(): cls.from_dict(data)
+        )
+        yield f"build_wrappers[{shape}]", lambda cls=cls: (
+            lambda config=cls(): build_wrappers(config)
+        )
+        yield f"save_yaml[{shape}]", lambda cls=cls: _yaml_bench(
+            cls, tmp_dir, save=True
+        )
+        yield f"load_yaml[{shape}]", lambda cls=cls: _yaml_bench(
+            cls, tmp_dir, save=False
+        )
+
+
+def _yaml_bench(cls: type, tmp_dir: Path, save: bool):
+    path = tmp_dir / f"{cls.__name__}.yaml"
+    config = cls()
+    config.save_yaml(path)
+    if save:
+        return lambda: config.save_yaml(path)
+    return lambda: pydra.load_yaml(path)
+
+
+def measure(fn, repeat: int, min_time: float = 0.05) -> list[float]:
+    """Per-call timings (in seconds) of fn, one for each of repeat rounds."""
+    # like timeit's autorange: find a loop count taking at least min_time
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="smaller workloads")
+    parser.add_argument("-k", "--filter", help="only run benchmarks containing this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", type=Path, help="write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="compare against saved results")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())["results"]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, setup in benchmarks(args.quick, Path(tmp_dir)):
+            if args.filter and args.filter not in name:
+                continue
+
+            timings = measure(setup(), args.repeat)
+            best = min(timings)
+            results[name] = {"best": best, "median": statistics.median(timings)}
+
+            line = f"{name:<45} {_format_seconds(best)}"
+            if name in baseline:
+                ratio = best / baseline[name]["best"]
+                line += f"  {ratio:6.2f}x vs baseline"
+            print(line, flush=True)
+
+    if args.save is not None:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": args.quick,
+        }
+        args.save.write_text(
+            json.dumps({"metadata": metadata, "results": results}, indent=2)
+        )
+        print(f"Saved results to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,65 @@
+import importlib
 from pathlib import Path
 
-from pydra.cli import Alias, apply_overrides, main, run
-from pydra.config import REQUIRED, Config
+from pydra.cli import Alias, OverridePlan, apply_overrides, compile_overrides, main, run
+from pydra.config import (
+    REQUIRED,
+    Config,
+    SlotsConfig,
+    build_all,
+    iter_configs,
+    iter_leaves,
+)
+from pydra.frozen import FrozenConfigError, FrozenDict, FrozenList, is_frozen
+from pydra.interpolation import InterpolationError, Ref
+from pydra.lazy import Lazy
 from pydra.utils import (
     DataclassWrapper,
     PydanticWrapper,
+    build_many,
     load_binary,
     load_dill,
     load_pickle,
     load_yaml,
+    load_yaml_all,
     save_dill,
     save_pickle,
     save_yaml,
 )
 
+# names from modules that most programs don't use, which are imported the
+# first time one of their names is accessed, to keep importing pydra fast
+_LAZY_NAMES = {
+    "ResultCache": "pydra.cache",
+    "ConfigDiff": "pydra.diffing",
+    "diff": "pydra.diffing",
+    "Evaluator": "pydra.expr",
+    "BatchingSink": "pydra.hooks",
+    "Event": "pydra.hooks",
+    "observe": "pydra.hooks",
+    "MultirunError": "pydra.multirun",
+    "MultirunResult": "pydra.multirun",
+    "FinalizeError": "pydra.parallel",
+    "ParallelFinalize": "pydra.parallel",
+    "Profiler": "pydra.profile",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'pydra' has no attribute '{name}'")
+
+    value = getattr(importlib.import_module(module_name), name)
+    # so later lookups don't come through here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
+
 version_file = Path(__file__).parent / "version.txt"
 __version__ = version_file.read_text().strip()
 
@@ -22,16 +68,43 @@ __all__ = [
     "main",
     "run",
     "apply_overrides",
+    "compile_overrides",
+    "OverridePlan",
+    "MultirunResult",
+    "MultirunError",
+    "ResultCache",
     "Alias",
+    "Evaluator",
+    "Profiler",
+    "ParallelFinalize",
+    "FinalizeError",
+    "observe",
+    "Event",
+    "BatchingSink",
     "Config",
+    "SlotsConfig",
     "REQUIRED",
+    "Lazy",
+    "Ref",
+    "InterpolationError",
+    "is_frozen",
+    "diff",
+    "ConfigDiff",
+    "FrozenConfigError",
+    "FrozenList",
+    "FrozenDict",
+    "iter_configs",
+    "iter_leaves",
     "load_dill",
     "load_pickle",
     "load_yaml",
+    "load_yaml_all",
     "load_binary",
     "save_dill",
     "save_pickle",
     "save_yaml",
     "DataclassWrapper",
     "PydanticWrapper",
+    "build_many",
+    "build_all",
 ]
@@ -0,0 +1,63 @@
+import array
+import sys
+from typing import Callable
+
+# the dtypes accepted by --list:<dtype>, mapped to their array.array typecodes
+LIST_DTYPES = {
+    "i8": "b",
+    "u8": "B",
+    "i16": "h",
+    "u16": "H",
+    "i32": "i",
+    "u32": "I",
+    "i64": "q",
+    "u64": "Q",
+    "f32": "f",
+    "f64": "d",
+    "int": "q",
+    "float": "d",
+}
+
+
+def is_ndarray_type(t) -> bool:
+    # checked by name, so that numpy is never imported just to check
+    return getattr(t, "__module__", None) == "numpy" and t.__name__ == "ndarray"
+
+
+def is_array(value) -> bool:
+    """Whether value is an array.array or a numpy array."""
+    return isinstance(value, array.array) or is_ndarray_type(type(value))
+
+
+def to_array(values, typecode: str | None = None) -> array.array:
+    """
+    Converts values to an array.array, with a typecode of "q" (int64) if
+    every value is an int and "d" (float64) otherwise, unless given.
+    """
+    if isinstance(values, array.array):
+        if typecode is None or values.typecode == typecode:
+            return values
+    elif typecode is None:
+        typecode = "q" if all(isinstance(v, int) for v in values) else "d"
+    return array.array(typecode, values)
+
+
+def to_ndarray(values, dtype=None):
+    # numpy must already be imported, since something is annotated with it
+    return sys.modules["numpy"].asarray(values, dtype=dtype)
+
+
+def array_caster(t) -> Callable | None:
+    """The function casting values into fields annotated with t, if t is an array type."""
+    if t is array.array:
+        return to_array
+    elif is_ndarray_type(t):
+        return to_ndarray
+    return None
+
+
+def restore_array(template, data: list):
+    """Rebuilds an array from its to_dict() form, with the same type as template."""
+    if isinstance(template, array.array):
+        return array.array(template.typecode, data)
+    return to_ndarray(data, template.dtype)
@@ -0,0 +1,238 @@
+import hashlib
+import os
+import pickle
+import time
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+
+@dataclass(frozen=True)
+class Serializer:
+    """How cached results are written to and read from disk."""
+
+    name: str
+    dump: Callable[[Any, BinaryIO], None]
+    load: Callable[[BinaryIO], Any]
+
+
+def _pickle_dump(obj, f: BinaryIO):
+    pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _dill_dump(obj, f: BinaryIO):
+    import dill
+
+    dill.dump(obj, f)
+
+
+def _dill_load(f: BinaryIO):
+    import dill
+
+    return dill.load(f)
+
+
+SERIALIZERS = {
+    "pickle": Serializer("pickle", _pickle_dump, pickle.load),
+    "dill": Serializer("dill", _dill_dump, _dill_load),
+}
+
+ENTRY_SUFFIX = ".result"
+LOCK_NAME = ".lock"
+TMP_PREFIX = ".tmp-"
+
+# temp files this old must have been left behind by a crashed writer
+STALE_TMP_SECONDS = 60 * 60
+
+
+class ResultCache:
+    """
+    A directory of results, keyed by the fingerprint of the config they were
+    computed from (and the function that computed them). Entries are written
+    atomically, so any number of processes can share a cache directory.
+    When max_entries or max_bytes is set, the least recently used entries
+    are evicted after each write to stay within them.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        serializer: str | Serializer = "pickle",
+    ):
+        if isinstance(serializer, str):
+            if serializer not in SERIALIZERS:
+                raise ValueError(
+                    f"Unknown serializer '{serializer}', expected one of {list(SERIALIZERS)}"
+                )
+            serializer = SERIALIZERS[serializer]
+
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.serializer = serializer
+
+    def __repr__(self) -> str:
+        return f"ResultCache({str(self.cache_dir)!r})"
+
+    def key(self, fn: Callable, config) -> str:
+        """
+        The cache key of fn(config). Raises pydra.hashing.FingerprintError (a
+        TypeError) naming the field if config can't be fingerprinted.
+        """
+        fn_name = f"{fn.__module__}.{fn.__qualname__}"
+        data = "\0".join([fn_name, self.serializer.name, config.fingerprint()])
+        return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Returns (True, result) if key is cached, and (False, None) otherwise."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = self.serializer.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            # e.g. a result whose class no longer exists; recompute it
+            return False, None
+
+        try:
+            # mark as recently used, for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return True, result
+
+    def put(self, key: str, result) -> None:
+        # only needed when writing, so kept out of `import pydra`
+        import tempfile
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(prefix=TMP_PREFIX, dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self.serializer.dump(result, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        if self.max_entries is not None or self.max_bytes is not None:
+            self.evict()
+
+    def call(self, fn: Callable, config):
+        """
+        Returns fn(config), from the cache if possible. Configs that can't
+        be fingerprinted (e.g. one holding an object that finalize() built)
+        can't be cached, so fn is called with a warning naming the field.
+        """
+        try:
+            key = self.key(fn, config)
+        except TypeError as e:
+            warnings.warn(
+                f"Not caching {fn.__qualname__}, since its config can't be fingerprinted ({e})",
+                stacklevel=2,
+            )
+            return fn(config)
+
+        hit, result = self.get(key)
+        if not hit:
+            result = fn(config)
+            self.put(key, result)
+
+        return result
+
+    @contextmanager
+    def _lock(self):
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.cache_dir / LOCK_NAME, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        now = time.time()
+
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+                elif (
+                    entry.name.startswith(TMP_PREFIX)
+                    and now - stat.st_mtime > STALE_TMP_SECONDS
+                ):
+                    _remove(Path(entry.path))
+
+        return entries
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache is within its limits."""
+        with self._lock():
+            entries = sorted(self._entries(), key=lambda entry: entry[0])
+
+            count = len(entries)
+            total_bytes = sum(size for _, size, _ in entries)
+
+            for _, size, path in entries:
+                if (self.max_entries is None or count <= self.max_entries) and (
+                    self.max_bytes is None or total_bytes <= self.max_bytes
+                ):
+                    break
+                _remove(path)
+                count -= 1
+                total_bytes -= size
+
+    def clear(self) -> None:
+        if not self.cache_dir.exists():
+            return
+
+        with self._lock():
+            for _, _, path in self._entries():
+                _remove(path)
+
+    def __len__(self) -> int:
+        if not self.cache_dir.exists():
+            return 0
+        return len(self._entries())
+
+
+def _remove(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        # already removed by another process
+        pass
+
+
+def as_cache(
+    cache_dir: str | Path | None = None, cache: ResultCache | None = None
+) -> ResultCache | None:
+    if cache_dir is not None and cache is not None:
+        raise ValueError("Only one of cache_dir and cache can be given")
+    if cache_dir is not None:
+        return ResultCache(cache_dir)
+    return cache
@@ -1,12 +1,38 @@
+import functools
 import inspect
 import sys
-from dataclasses import dataclass
-from typing import Callable, Type, TypeVar
-
-import yaml
+from copy import deepcopy
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Type, TypeVar
 
+import pydra.lazy
 import pydra.parser
-from pydra.config import Config
+from pydra.config import (
+    _COPY_ON_WRITE_ROOTS,
+    Config,
+    _ConfigBase,
+    _is_config_type,
+    active_observers,
+    active_profiler,
+    copy_on_write_path,
+    copy_on_write_subtree,
+    finalize_tree,
+    invalidate_fingerprint_path,
+    iter_configs,
+    phase,
+    plain_at,
+    unresolved_lazy_fields,
+)
+from pydra.lazy import has_attr, peek_attr
+from pydra.references import forget_resolved_path
+from pydra.utils import _FINGERPRINTS, _SYMBOLIC, dump_yaml
+
+if TYPE_CHECKING:
+    # imported when they're first used, to keep importing pydra fast
+    from pydra.cache import ResultCache
+    from pydra.expr import Evaluator
+    from pydra.profile import Profiler
 
 
 @dataclass
@@ -14,86 +40,572 @@ class Alias:
     name: str
 
 
-def drill_through_objects(obj, key: str):
-    split_dots = key.split(".")
+def _has(o, k: str) -> bool:
+    if isinstance(o, dict):
+        return k in o
+    else:
+        return has_attr(o, k)
 
-    obj_path = [obj]
-    for i, k in enumerate(split_dots):
-        cur_obj = obj_path[-1]
 
-        def has_func(o, k):
-            if isinstance(o, dict):
-                return k in o
-            else:
-                return hasattr(o, k)
+def _get(o, k: str):
+    if isinstance(o, dict):
+        return o[k]
+    else:
+        return getattr(o, k)
 
-        def get_func(o, k):
-            if isinstance(o, dict):
-                return o[k]
-            else:
-                return getattr(o, k)
 
-        if has_func(cur_obj, k):
-            next_obj = get_func(cur_obj, k)
+def _drill(obj, key: str):
+    """
+    Like drill_through_objects, but also returns the alias-resolved path
+    that was taken, as a list of (type, name, is_dict) hops, and the name
+    in key that each hop went through an alias at (or None).
+    """
+    split_dots = key.split(".")
+    last = len(split_dots) - 1
+
+    hops = []
+    alias_sources = []
+    cur_obj = obj
+    for i, k in enumerate(split_dots):
+        source = None
+        if _has(cur_obj, k):
+            # peeked, so that assigning to a Lazy field doesn't build it
+            next_obj = (
+                cur_obj.get(k) if isinstance(cur_obj, dict) else peek_attr(cur_obj, k)
+            )
             if isinstance(next_obj, Alias):
-                k = next_obj.name
+                source, k = k, next_obj.name
 
-        if not has_func(cur_obj, k):
+        if not _has(cur_obj, k):
             raise AttributeError(
                 f"Config does not have attribute '{key}' (failed at '{'.'.join(split_dots[:i + 1])}')"
             )
 
+        hops.append((type(cur_obj), k, isinstance(cur_obj, dict)))
+        alias_sources.append(source)
+
         # at our destination
-        if i == len(split_dots) - 1:
-            return cur_obj, k
+        if i == last:
+            return cur_obj, k, hops, alias_sources
         else:
-            new_obj = get_func(cur_obj, k)
-            obj_path.append(new_obj)
+            cur_obj = _get(cur_obj, k)
+
+
+# returned by lookups for names that don't exist
+_MISSING = object()
+
+
+def _holds_alias(obj, source: str, name: str, is_dict: bool) -> bool:
+    # whether obj's source still holds an Alias of name, as _drill found
+    held = obj.get(source) if is_dict else peek_attr(obj, source)
+    return isinstance(held, Alias) and held.name == name
+
+
+class Accessor:
+    """
+    A dotted key compiled against the layout of a particular config: aliases
+    are already resolved, and each hop records the type of object it
+    expects and whether it indexes a dict or reads an attribute.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        hops: list[tuple[type, str, bool]],
+        alias_sources: list[str | None] | None = None,
+    ):
+        self.key = key
+        self.parent_hops = tuple(hops[:-1])
+        self.final_hop = hops[-1]
+        if alias_sources is None:
+            alias_sources = [None] * len(hops)
+        # the hops along with the name in key that each went through an
+        # alias at (or None), which resolve checks still hold those aliases
+        steps = [hop + (source,) for hop, source in zip(hops, alias_sources)]
+        self._parent_steps = tuple(steps[:-1])
+        self._final_step = steps[-1]
+
+    def resolve(self, root):
+        """
+        Returns the (object, name) pair that the key refers to, or None if
+        root's layout doesn't match the one this accessor was compiled for
+        (including which names hold aliases).
+        """
+        obj = root
+        try:
+            for expected_type, name, is_dict, source in self._parent_steps:
+                if type(obj) is not expected_type:
+                    return None
+                if source is not None and not _holds_alias(obj, source, name, is_dict):
+                    return None
+                obj = obj[name] if is_dict else getattr(obj, name)
+                if source is None and isinstance(obj, Alias):
+                    return None
+        except (AttributeError, KeyError, TypeError):
+            return None
+
+        expected_type, name, is_dict, source = self._final_step
+        if type(obj) is not expected_type:
+            return None
+        if source is None:
+            held = (
+                obj.get(name, _MISSING) if is_dict else peek_attr(obj, name, _MISSING)
+            )
+            if held is _MISSING or isinstance(held, Alias):
+                return None
+        elif not (
+            _holds_alias(obj, source, name, is_dict)
+            and (name in obj if is_dict else has_attr(obj, name))
+        ):
+            return None
+        return obj, name
 
+    def __repr__(self) -> str:
+        return f"Accessor({self.key!r})"
 
-def assign(obj, key: str, value):
-    drilled_obj, k = drill_through_objects(obj, key)
 
+# accessors keyed by (root type, dotted key)
+_ACCESSOR_CACHE: dict[tuple[type, str], Accessor] = {}
+_MAX_CACHED_ACCESSORS = 4096
+
+
+def compile_accessor(obj, key: str) -> Accessor:
+    """
+    Compiles key against obj's current layout, raising AttributeError if
+    it doesn't exist, and caches the result for objects of the same type.
+    """
+    _, _, hops, alias_sources = _drill(obj, key)
+    accessor = Accessor(key, hops, alias_sources)
+
+    if len(_ACCESSOR_CACHE) >= _MAX_CACHED_ACCESSORS:
+        _ACCESSOR_CACHE.clear()
+    _ACCESSOR_CACHE[(type(obj), key)] = accessor
+
+    return accessor
+
+
+def _accessor_for(obj, key: str) -> Accessor:
+    accessor = _ACCESSOR_CACHE.get((type(obj), key))
+    if accessor is None or accessor.resolve(obj) is None:
+        accessor = compile_accessor(obj, key)
+    return accessor
+
+
+def _copy_on_write(obj, key: str, accessor: Accessor | None = None, subtree=False):
+    # only copy-on-write clones need this, so callers skip it entirely
+    # (with a length check) unless one exists
+    if _COPY_ON_WRITE_ROOTS.get(obj) is None:
+        return
+
+    if accessor is None or accessor.resolve(obj) is None:
+        accessor = _accessor_for(obj, key)
+
+    if subtree:
+        copy_on_write_subtree(obj, accessor.parent_hops)
+    else:
+        copy_on_write_path(obj, accessor.parent_hops)
+
+
+def _invalidate_fingerprints(
+    obj, key: str, accessor: Accessor | None = None, subtree=False
+):
+    # only needed once something has been fingerprinted, so callers skip
+    # it entirely (with a length check) until then. Writes to configs and
+    # wrappers invalidate themselves, but writes into lists and dicts don't
+    if accessor is None or accessor.resolve(obj) is None:
+        accessor = _accessor_for(obj, key)
+
+    invalidate_fingerprint_path(obj, accessor.parent_hops, subtree)
+
+
+def _forget_resolved(obj, key: str, accessor: Accessor | None = None):
+    # only needed once references have been resolved, so callers skip it
+    # entirely (with a length check) until then. Assigning to a config's
+    # field forgets what was resolved into it, but assigning into a dict or
+    # wrapper doesn't
+    if accessor is None or accessor.resolve(obj) is None:
+        accessor = _accessor_for(obj, key)
+
+    forget_resolved_path(obj, accessor.parent_hops + (accessor.final_hop,))
+
+
+def drill_through_objects(obj, key: str):
+    accessor = _ACCESSOR_CACHE.get((type(obj), key))
+    if accessor is not None:
+        resolved = accessor.resolve(obj)
+        if resolved is not None:
+            return resolved
+
+    # either we haven't seen this key before, or obj's layout differs from
+    # the one the cached accessor was compiled against (e.g. a dict key was
+    # added by a method call), so recompile from scratch
+    return compile_accessor(obj, key).resolve(obj)
+
+
+def _set(drilled_obj, k: str, value):
     match drilled_obj:
         case dict():
             drilled_obj[k] = value
-        case Config():
+        case _ConfigBase():
             drilled_obj._assign_maybe_cast(k, value)
         case _:
             setattr(drilled_obj, k, value)
 
 
+def assign(obj, key: str, value):
+    if len(_COPY_ON_WRITE_ROOTS) > 0:
+        _copy_on_write(obj, key)
+
+    drilled_obj, k = drill_through_objects(obj, key)
+    _set(drilled_obj, k, value)
+
+    if len(_FINGERPRINTS) > 0:
+        _invalidate_fingerprints(obj, key)
+    if len(_SYMBOLIC) > 0:
+        _forget_resolved(obj, key)
+
+
+def call_method(obj, key: str, args: list, kwargs: dict):
+    if len(_COPY_ON_WRITE_ROOTS) > 0:
+        _copy_on_write(obj, key, subtree=True)
+
+    drilled_obj, drilled_method_name = drill_through_objects(obj, key)
+    method = getattr(drilled_obj, drilled_method_name)
+    method(*args, **kwargs)
+
+    if len(_FINGERPRINTS) > 0:
+        _invalidate_fingerprints(obj, key, subtree=True)
+
+
+def _finish(
+    config: Config,
+    enforce_required: bool,
+    finalize: bool,
+    resolve_lazy: bool = True,
+):
+    if enforce_required or finalize:
+        finalize_tree(
+            config,
+            enforce_required=enforce_required,
+            finalize=finalize,
+            resolve_lazy=resolve_lazy,
+        )
+
+
 def apply_overrides(
     config: Config,
     args: list[str],
     enforce_required: bool = True,
     finalize: bool = True,
+    evaluator: "Evaluator | None" = None,
+    freeze: bool = False,
 ) -> bool:
-    parsed_args = pydra.parser.parse(args)
+    # commands are applied as they're parsed, so huge argument files are
+    # never fully held in memory
+    stream = pydra.parser.CommandStream(args, evaluator)
+    _apply_commands(config, stream, enforce_required, finalize)
+    if freeze:
+        config.freeze()
+    return stream.show
+
+
+def _apply_command(config: Config, command):
+    if isinstance(command, pydra.parser.Assignment):
+        assign(
+            config,
+            command.kv_pair.key,
+            command.kv_pair.value,
+        )
+    elif isinstance(command, pydra.parser.MethodCall):
+        call_method(config, command.method_name, command.args, command.kwargs)
+    else:
+        raise ValueError(f"Unknown command type {command}")
 
-    for command in parsed_args.commands:
-        if isinstance(command, pydra.parser.Assignment):
-            assign(
+
+def _apply_commands(
+    config: Config,
+    commands: pydra.parser.CommandStream,
+    enforce_required: bool,
+    finalize: bool,
+):
+    profiler = active_profiler()
+    observers = active_observers()
+    if profiler is None and not observers:
+        for command in commands:
+            _apply_command(config, command)
+    else:
+        _apply_commands_instrumented(config, commands, profiler, observers)
+
+    # --show lists Lazy fields that are still unbuilt, rather than building them
+    _finish(config, enforce_required, finalize, resolve_lazy=not commands.show)
+
+
+def _apply_commands_instrumented(
+    config: Config, commands, profiler: "Profiler | None", observers: tuple
+):
+    # commands are parsed lazily, so time pulling each one out separately
+    commands = iter(commands)
+    while True:
+        with phase("parse"):
+            command = next(commands, None)
+        if command is None:
+            break
+
+        with phase("apply"):
+            if isinstance(command, pydra.parser.MethodCall):
+                key = command.method_name
+                value = (command.args, command.kwargs)
+            else:
+                key = command.kv_pair.key
+                value = command.kv_pair.value
+
+            _apply_observed(
                 config,
-                command.kv_pair.key,
-                command.kv_pair.value,
+                key,
+                value,
+                isinstance(command, pydra.parser.MethodCall),
+                lambda: _apply_command(config, command),
+                profiler,
+                observers,
             )
-        elif isinstance(command, pydra.parser.MethodCall):
-            drilled_obj, drilled_method_name = drill_through_objects(
-                config, command.method_name
+
+
+def _current_value(obj, key: str):
+    drilled_obj, k = drill_through_objects(obj, key)
+    if isinstance(drilled_obj, dict):
+        return drilled_obj[k]
+    return peek_attr(drilled_obj, k)
+
+
+def _apply_observed(
+    config: Config,
+    key: str,
+    value,
+    is_method_call: bool,
+    apply: Callable[[], None],
+    profiler: "Profiler | None",
+    observers: tuple,
+):
+    """Runs apply (a single override of key), timing it and emitting events around it."""
+    from pydra.hooks import emit
+
+    if is_method_call:
+        emit(observers, "before_method_call", key, value)
+        if profiler is not None:
+            with profiler.node(key, "method"):
+                apply()
+        else:
+            apply()
+        emit(observers, "after_method_call", key, value)
+        return
+
+    if not observers:
+        apply()
+        return
+
+    old_value = _current_value(config, key)
+    emit(observers, "before_assign", key, value, old_value)
+    apply()
+
+    stored = _current_value(config, key)
+    if _was_coerced(stored, value):
+        emit(observers, "coerce", key, stored, value)
+    emit(observers, "after_assign", key, stored, old_value)
+
+
+def _was_coerced(stored, value) -> bool:
+    # a cast can return a different value of the same type (e.g. clamped or
+    # normalized), while plans store equal copies of mutable values
+    if stored is value:
+        return False
+    if type(stored) is not type(value):
+        return True
+    try:
+        return bool(stored != value)
+    except Exception:
+        # e.g. arrays, whose != is elementwise
+        return True
+
+
+IMMUTABLE_TYPES = (int, float, complex, str, bytes, bool, type(None))
+
+
+def _fresh_copy(value):
+    # values in a plan are shared by every config it's applied to, so
+    # mutable ones (e.g. lists from "x=[1,2]") are copied on each use
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    return deepcopy(value)
+
+
+@dataclass
+class PlannedStep:
+    accessor: Accessor
+    is_method_call: bool
+    value: Any = None
+    args: list = field(default_factory=list)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    def resolve(self, config: Config):
+        resolved = self.accessor.resolve(config)
+        if resolved is not None:
+            return resolved
+
+        # this config's shape differs from the one the plan was compiled
+        # against, so fall back to resolving the key from scratch
+        return drill_through_objects(config, self.accessor.key)
+
+    def apply(self, config: Config):
+        if len(_COPY_ON_WRITE_ROOTS) > 0:
+            _copy_on_write(
+                config, self.accessor.key, self.accessor, subtree=self.is_method_call
+            )
+
+        obj, name = self.resolve(config)
+        if self.is_method_call:
+            method = getattr(obj, name)
+            method(
+                *[_fresh_copy(x) for x in self.args],
+                **{k: _fresh_copy(v) for k, v in self.kwargs.items()},
             )
-            method = getattr(drilled_obj, drilled_method_name)
-            method(*command.args, **command.kwargs)
+        else:
+            _set(obj, name, _fresh_copy(self.value))
+            if len(_SYMBOLIC) > 0:
+                _forget_resolved(config, self.accessor.key, self.accessor)
+
+        if len(_FINGERPRINTS) > 0:
+            _invalidate_fingerprints(
+                config, self.accessor.key, self.accessor, subtree=self.is_method_call
+            )
+
+
+class OverridePlan:
+    """
+    A set of overrides that has been parsed and validated once against a
+    Config class, and can then be applied cheaply to many instances of it.
+    Create with compile_overrides.
+    """
+
+    def __init__(
+        self,
+        config_cls: type[Config],
+        steps: list[PlannedStep],
+        show: bool,
+    ):
+        self.config_cls = config_cls
+        self.steps = steps
+        self.show = show
+
+    def apply(
+        self,
+        config: Config,
+        enforce_required: bool = True,
+        finalize: bool = True,
+        freeze: bool = False,
+    ) -> bool:
+        if not isinstance(config, self.config_cls):
+            raise ValueError(
+                f"Override plan was compiled for {self.config_cls.__name__}, but got {type(config).__name__}"
+            )
+
+        observers = active_observers()
+        if observers:
+            for step in self.steps:
+                _apply_observed(
+                    config,
+                    step.accessor.key,
+                    (step.args, step.kwargs) if step.is_method_call else step.value,
+                    step.is_method_call,
+                    lambda: step.apply(config),
+                    None,
+                    observers,
+                )
+        else:
+            for step in self.steps:
+                step.apply(config)
+
+        _finish(config, enforce_required, finalize)
+        if freeze:
+            config.freeze()
+
+        return self.show
+
+    def __repr__(self) -> str:
+        return f"OverridePlan({self.config_cls.__name__}, {len(self.steps)} steps)"
+
+
+def compile_overrides(
+    config_cls: type[Config], args: list[str], evaluator: "Evaluator | None" = None
+) -> OverridePlan:
+    """
+    Parses args and resolves every key they reference against a fresh
+    instance of config_cls, so the result can be applied to many configs
+    without re-parsing or re-resolving. Method calls in args are run on
+    that probe instance, so keys that only exist after a method call are
+    validated correctly. All invalid keys and values are reported together.
+    """
+    parsed_args = pydra.parser.parse(args, evaluator)
+    probe = config_cls()
+
+    steps = []
+    errors = []
+    # the exceptions raised by steps, e.g. for values that can't be cast
+    step_errors = []
+
+    for command in parsed_args.commands:
+        if isinstance(command, pydra.parser.Assignment):
+            key = command.kv_pair.key
+        elif isinstance(command, pydra.parser.MethodCall):
+            key = command.method_name
         else:
             raise ValueError(f"Unknown command type {command}")
 
-    if enforce_required:
-        config._enforce_required()
+        try:
+            accessor = compile_accessor(probe, key)
+        except AttributeError as e:
+            errors.append(str(e))
+            continue
+
+        if isinstance(command, pydra.parser.Assignment):
+            step = PlannedStep(
+                accessor=accessor,
+                is_method_call=False,
+                value=command.kv_pair.value,
+            )
+        else:
+            step = PlannedStep(
+                accessor=accessor,
+                is_method_call=True,
+                args=command.args,
+                kwargs=command.kwargs,
+            )
+
+        try:
+            # keep the probe's shape in sync with what later steps will see
+            step.apply(probe)
+        except Exception as e:
+            errors.append(f"{key}: {type(e).__name__}: {e}")
+            step_errors.append(e)
+            continue
+
+        steps.append(step)
+
+    if len(errors) == 1 and step_errors:
+        raise step_errors[0]
+    if errors:
+        error_lines = "\n".join(f"  - {e}" for e in errors)
+        error_t = ValueError if len(step_errors) == len(errors) else AttributeError
+        raise error_t(f"Invalid overrides for {config_cls.__name__}:\n{error_lines}")
 
-    if finalize:
-        config._recursive_finalize()
+    return OverridePlan(config_cls, steps, parsed_args.show)
 
-    return parsed_args.show
+
+def _as_cache(cache_dir: str | Path | None, cache: "ResultCache | None"):
+    if cache_dir is None:
+        return cache
+    from pydra.cache import as_cache
+
+    return as_cache(cache_dir, cache)
 
 
 # SE (02/24/25): Using the old generic class syntax for compatibility with Python <3.12
@@ -102,33 +614,138 @@ U = TypeVar("U")
 
 
 def _apply_overrides_and_call(
-    fn: Callable[[T], U], config_t: Type[T], args: list[str] | None = None
+    fn: Callable[[T], U],
+    config_t: Type[T],
+    args: list[str] | None = None,
+    cache: "ResultCache | None" = None,
+    evaluator: "Evaluator | None" = None,
 ):
-    config = config_t()
-
     if args is None:
         args = sys.argv[1:]
 
-    show = apply_overrides(config, args, finalize=True)
+    launcher_args, args = pydra.parser.extract_launcher_args(args)
+    if launcher_args.jobs is not None and not launcher_args.multirun:
+        raise ValueError("-j/--jobs can only be used with --multirun")
+
+    if launcher_args.multirun:
+        from pydra.multirun import run_multirun
+
+        if launcher_args.profile:
+            raise ValueError("--pydra-profile can't be combined with --multirun")
+
+        return run_multirun(
+            fn,
+            config_t,
+            args,
+            jobs=launcher_args.jobs,
+            cache=cache,
+            evaluator=evaluator,
+        )
+
+    if launcher_args.profile:
+        from pydra.profile import Profiler
+
+        profiler = Profiler(stats_path=launcher_args.profile_path)
+        try:
+            with profiler:
+                return _call_with_overrides(fn, config_t, args, cache, evaluator)
+        finally:
+            print(profiler.report(), file=sys.stderr)
 
-    if show:
-        print(yaml.dump(config.to_dict(), sort_keys=True))
+    return _call_with_overrides(fn, config_t, args, cache, evaluator)
+
+
+def _call_with_overrides(
+    fn: Callable[[T], U],
+    config_t: Type[T],
+    args: list[str],
+    cache: "ResultCache | None",
+    evaluator: "Evaluator | None",
+):
+    with phase("construct"):
+        config = config_t()
+
+    stream = pydra.parser.CommandStream(args, evaluator)
+    _apply_commands(config, stream, enforce_required=True, finalize=True)
+
+    if stream.show:
+        show_config(config, stream.show_format)
         return
 
-    return fn(config)
+    # functions decorated with main are passed in as the decorated
+    # function, which (unlike the original) can be pickled for multirun
+    fn = getattr(fn, "__pydra_fn__", fn)
+
+    with phase("call"):
+        if cache is not None:
+            return cache.call(fn, config)
+        return fn(config)
+
+
+def _show_unresolved_lazies(config: Config, data: dict):
+    # to_dict() leaves out Lazy fields that haven't been built (so that
+    # from_dict() leaves them lazy too), but --show should list them
+    for path, node in iter_configs(config):
+        names = unresolved_lazy_fields(node)
+        if not names:
+            continue
 
+        d = plain_at(data, path)
+        for name in names:
+            d[name] = repr(getattr(type(node), name))
+
+
+def show_config(config: Config, show_format: str = "yaml", stream=None):
+    """Prints config (as for --show), streaming it straight to stdout."""
+    if stream is None:
+        stream = sys.stdout
+
+    data = config.to_dict()
+    if pydra.lazy.DECLARED:
+        _show_unresolved_lazies(config, data)
+    if show_format == "json":
+        import json
+
+        json.dump(data, stream, indent=2, sort_keys=True)
+        stream.write("\n")
+    else:
+        dump_yaml(data, stream, sort_keys=True)
+
+
+def main(
+    base: Type[T],
+    cache_dir: str | Path | None = None,
+    cache: "ResultCache | None" = None,
+    evaluator: "Evaluator | None" = None,
+):
+    """
+    Decorates an entry point taking a config of type base, so that calling
+    it builds the config from command line args (or the given args list).
+    With cache_dir (or a configured ResultCache), results are stored on disk
+    keyed by the finalized config, and reruns with the same config return
+    the stored result without calling the function. evaluator controls
+    how parenthesized expressions in args are evaluated (see Evaluator).
+    """
+    cache = _as_cache(cache_dir, cache)
 
-def main(base: Type[T]):
     def decorator(fn: Callable[[T], U]):
+        @functools.wraps(fn)
         def wrapped_fn(args: list[str] | None = None):
-            return _apply_overrides_and_call(fn, base, args)
+            return _apply_overrides_and_call(wrapped_fn, base, args, cache, evaluator)
 
+        wrapped_fn.__pydra_fn__ = fn
         return wrapped_fn
 
     return decorator
 
 
-def run(fn: Callable[[T], U], args: list[str] | None = None):
+def run(
+    fn: Callable[[T], U],
+    args: list[str] | None = None,
+    cache_dir: str | Path | None = None,
+    cache: "ResultCache | None" = None,
+    evaluator: "Evaluator | None" = None,
+):
     signature = inspect.signature(fn)
     params = signature.parameters
 
@@ -138,9 +755,11 @@ def run(fn: Callable[[T], U], args: list[str] | None = None):
     first_arg_type = list(params.values())[0].annotation
 
     # assert arg is instance of Config
-    if not issubclass(first_arg_type, Config):
+    if not _is_config_type(first_arg_type):
         raise ValueError(
-            f"Type annotation of function argument must be a subclass of Config, but got {first_arg_type}"
+            f"Type annotation of function argument must be a subclass of Config (or SlotsConfig), but got {first_arg_type}"
         )
 
-    return _apply_overrides_and_call(fn, first_arg_type, args)
+    return _apply_overrides_and_call(
+        fn, first_arg_type, args, _as_cache(cache_dir, cache), evaluator
+    )
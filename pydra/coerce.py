@@ -0,0 +1,324 @@
+import collections.abc
+from enum import Enum
+from types import NoneType, UnionType
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    ForwardRef,
+    Literal,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydra.arrays import array_caster, is_array
+
+Coercer = Callable[[Any], Any]
+
+
+class CoercionError(ValueError, TypeError):
+    """Raised when a value can't be converted to a field's annotated type."""
+
+
+def type_name(t) -> str:
+    return t.__qualname__ if isinstance(t, type) else str(t)
+
+
+def _fail(value, t, reason: str | None = None):
+    message = f"can't convert {value!r} to {type_name(t)}"
+    raise CoercionError(f"{message}: {reason}" if reason else message)
+
+
+# annotations, mapped to their compiled coercers (or None, for annotations
+# whose values are stored as they are)
+_COERCERS: dict[Any, Coercer | None] = {}
+
+
+def compile_coercer(annotation) -> Coercer | None:
+    """
+    Compiles annotation into a function converting values to it, raising
+    CoercionError for values that can't be converted. Returns None if
+    values should be stored as they are (e.g. for Any). Compiled once per
+    annotation, then shared between every field annotated with it.
+    """
+    try:
+        return _COERCERS[annotation]
+    except KeyError:
+        coercer = _COERCERS[annotation] = _compile(annotation)
+        return coercer
+    except TypeError:
+        # unhashable annotations, e.g. Literal[] of an unhashable value
+        return _compile(annotation)
+
+
+def _compile(t) -> Coercer | None:
+    if t is Any or t is object or isinstance(t, (TypeVar, str, ForwardRef)):
+        return None
+    if t is None or t is NoneType:
+        return _coerce_none
+
+    origin = get_origin(t)
+    args = get_args(t)
+    if origin is Annotated:
+        return compile_coercer(args[0])
+    elif origin is Union or origin is UnionType:
+        return _union_coercer(t, args)
+    elif origin is Literal:
+        return _literal_coercer(t, args)
+    elif origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return _sequence_coercer(t, tuple, args[0])
+        return _fixed_tuple_coercer(t, args)
+    elif origin in _SEQUENCE_BUILDERS:
+        return _sequence_coercer(t, _SEQUENCE_BUILDERS[origin], args[0])
+    elif origin in _MAPPING_ORIGINS:
+        return _mapping_coercer(t, args[0], args[1])
+    elif origin is not None:
+        # e.g. DataclassWrapper[MyDataclass] or type[X]
+        return compile_coercer(origin) if isinstance(origin, type) else None
+
+    if t is bool:
+        return _coerce_bool
+    elif t is int or t is float or t is complex:
+        return _exact_or_call(t)
+
+    caster = array_caster(t)
+    if caster is not None:
+        return caster
+    elif isinstance(t, type):
+        if issubclass(t, Enum):
+            return _enum_coercer(t)
+        elif t in _SEQUENCE_BUILDERS:
+            return _sequence_coercer(t, _SEQUENCE_BUILDERS[t], None)
+        return _instance_or_call(t)
+    elif callable(t):
+        # e.g. a NewType
+        return _call(t)
+    return None
+
+
+def _coerce_none(value):
+    if value is not None:
+        _fail(value, None)
+    return None
+
+
+_BOOL_STRINGS = {
+    "T": True,
+    "F": False,
+    "True": True,
+    "False": False,
+    "true": True,
+    "false": False,
+}
+
+
+def _coerce_bool(value):
+    if type(value) is bool:
+        return value
+    elif type(value) is int and value in (0, 1):
+        return bool(value)
+    elif type(value) is str and value in _BOOL_STRINGS:
+        return _BOOL_STRINGS[value]
+    _fail(value, bool, "expected a bool, 0/1 or one of T, F, True, False")
+
+
+def _exact_or_call(t: type) -> Coercer:
+    # ints, floats and complexes are converted from anything that isn't
+    # exactly of their type (so True becomes 1 for an int field, as before)
+    def coerce(value):
+        if type(value) is t:
+            return value
+        try:
+            return t(value)
+        except (ValueError, TypeError, OverflowError) as e:
+            _fail(value, t, str(e))
+
+    return coerce
+
+
+def _instance_or_call(t: type) -> Coercer:
+    def coerce(value):
+        if isinstance(value, t):
+            return value
+        try:
+            return t(value)
+        except CoercionError:
+            raise
+        except (ValueError, TypeError) as e:
+            _fail(value, t, str(e))
+
+    return coerce
+
+
+def _call(t: Callable) -> Coercer:
+    def coerce(value):
+        try:
+            return t(value)
+        except (ValueError, TypeError) as e:
+            _fail(value, t, str(e))
+
+    return coerce
+
+
+def _enum_coercer(t: type[Enum]) -> Coercer:
+    members = t.__members__
+
+    def coerce(value):
+        if isinstance(value, t):
+            return value
+        try:
+            # by value
+            return t(value)
+        except (ValueError, TypeError):
+            pass
+        if type(value) is str:
+            # by name, or as to_dict() writes members ("Color.RED")
+            name = value.rpartition(".")[2]
+            if name in members:
+                return members[name]
+        _fail(value, t, f"expected one of {list(members)}, or one of their values")
+
+    return coerce
+
+
+def _literal_coercer(t, choices: tuple) -> Coercer:
+    # keyed by type too, so that True doesn't match Literal[1]
+    lookup = {(type(c), c): c for c in choices}
+
+    def coerce(value):
+        try:
+            return lookup[(type(value), value)]
+        except (KeyError, TypeError):
+            _fail(value, t, f"expected one of {list(choices)}")
+
+    return coerce
+
+
+def _union_coercer(t, members: tuple) -> Coercer:
+    # values that are already exactly one of the (plain class) members are
+    # kept as they are, otherwise each member is tried left to right
+    exact_types = frozenset(
+        NoneType if m is None else m
+        for m in members
+        if m is None or isinstance(m, type)
+    )
+    coercers = [compile_coercer(m) for m in members]
+    if any(c is None for c in coercers):
+        # e.g. Any | int
+        return None
+
+    def coerce(value):
+        if type(value) in exact_types:
+            return value
+        errors = []
+        for coercer in coercers:
+            try:
+                return coercer(value)
+            except CoercionError as e:
+                errors.append(str(e))
+        _fail(value, t, "; ".join(errors))
+
+    return coerce
+
+
+# generic origins (and bare classes) of sequences, mapped to the type they
+# are built as
+_SEQUENCE_BUILDERS = {
+    list: list,
+    set: set,
+    frozenset: frozenset,
+    collections.abc.Sequence: list,
+    collections.abc.MutableSequence: list,
+    collections.abc.Set: frozenset,
+    collections.abc.MutableSet: set,
+    collections.abc.Iterable: list,
+    collections.abc.Collection: list,
+}
+
+_MAPPING_ORIGINS = {dict, collections.abc.Mapping, collections.abc.MutableMapping}
+
+_ITEM_FAST_PATHS = (int, float, str, bool)
+
+
+def _items_of(value, t):
+    if type(value) in (list, tuple, set, frozenset):
+        return value
+    elif is_array(value):
+        return value.tolist()
+    elif isinstance(value, (str, bytes, collections.abc.Mapping)) or not isinstance(
+        value, collections.abc.Iterable
+    ):
+        _fail(value, t, "expected a list")
+    return list(value)
+
+
+def _sequence_coercer(t, build: type, item_type) -> Coercer:
+    item = compile_coercer(item_type) if item_type is not None else None
+    # homogeneous lists of these are copied in one go, without calling
+    # the item coercer on every element
+    fast_type = item_type if item_type in _ITEM_FAST_PATHS else None
+
+    def coerce(value):
+        items = _items_of(value, t)
+        if item is None:
+            return build(items)
+        if fast_type is not None and all(type(x) is fast_type for x in items):
+            return build(items)
+
+        out = []
+        for i, x in enumerate(items):
+            try:
+                out.append(item(x))
+            except CoercionError as e:
+                _fail(value, t, f"at index {i}, {e}")
+        return build(out)
+
+    return coerce
+
+
+def _fixed_tuple_coercer(t, item_types: tuple) -> Coercer:
+    if item_types == ((),):
+        # tuple[()]
+        item_types = ()
+    items = [compile_coercer(x) for x in item_types]
+
+    def coerce(value):
+        values = _items_of(value, t)
+        if len(values) != len(items):
+            _fail(value, t, f"expected {len(items)} items, got {len(values)}")
+
+        out = []
+        for i, (item, x) in enumerate(zip(items, values)):
+            try:
+                out.append(x if item is None else item(x))
+            except CoercionError as e:
+                _fail(value, t, f"at index {i}, {e}")
+        return tuple(out)
+
+    return coerce
+
+
+def _mapping_coercer(t, key_type, value_type) -> Coercer:
+    coerce_key = compile_coercer(key_type)
+    coerce_value = compile_coercer(value_type)
+
+    def coerce(value):
+        if not isinstance(value, collections.abc.Mapping):
+            _fail(value, t, "expected a dict")
+        if coerce_key is None and coerce_value is None:
+            return dict(value)
+
+        out = {}
+        for k, v in value.items():
+            try:
+                if coerce_key is not None:
+                    k = coerce_key(k)
+                out[k] = v if coerce_value is None else coerce_value(v)
+            except CoercionError as e:
+                _fail(value, t, f"at key {k!r}, {e}")
+        return out
+
+    return coerce
@@ -1,9 +1,35 @@
+import contextlib
 import inspect
-from pathlib import Path
-from types import NoneType, UnionType
+import sys
+from copy import copy, deepcopy
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path, PurePath
+from types import MemberDescriptorType, NoneType, UnionType
 from typing import Any, Union, get_args, get_origin
 
-from pydra.utils import REQUIRED, DataclassWrapper, save_dill, save_pickle, save_yaml
+import pydra.lazy
+from pydra.arrays import is_array, restore_array
+from pydra.coerce import CoercionError, compile_coercer, type_name
+from pydra.interpolation import Ref, is_reference, referenced_paths
+from pydra.lazy import Lazy, lazy_fields
+from pydra.utils import (
+    REQUIRED,
+    _FINGERPRINTS,
+    _SYMBOLIC,
+    _copy_symbolic,
+    BaseWrapper,
+    DataclassWrapper,
+    WeakIdentityMap,
+    build_many,
+    forget_resolved,
+    invalidate_fingerprint,
+    load_yaml,
+    load_yaml_all,
+    save_dill,
+    save_pickle,
+    save_yaml,
+)
 
 
 def get_annotations(cls: type) -> dict:
@@ -17,89 +43,193 @@ def get_annotations(cls: type) -> dict:
 
 
 ANNOTATIONS_INITIALIZED = "_annotations_initialized"
+SCHEMA_ATTR = "_pydra_schema"
+
+
+@dataclass
+class ConfigSchema:
+    """
+    Everything pydra needs to know about a Config class' annotated fields,
+    computed once per class instead of on every instantiation/assignment.
+    """
+
+    annotations: dict[str, Any]
+    defaults: dict[str, Any]
+    # Optional[T] / T | None fields, mapped to T
+    optional_inner: dict[str, Any]
+    # the compiled coercers (see pydra.coerce) converting values assigned to
+    # each annotated field, for fields whose values need converting
+    casters: dict[str, Any]
+    nested_config_fields: frozenset[str]
+    token: tuple
+
+    def is_current(self, cls: type) -> bool:
+        return self.token == _schema_token(cls, self.annotations)
+
+
+def _schema_token(cls: type, annotations: dict) -> tuple:
+    # Cheap fingerprint of everything the schema was derived from: the MRO,
+    # how many annotations each class in it declares, and the identity of
+    # each default. If any of these change, the schema is rebuilt.
+    return (
+        cls.__mro__,
+        tuple(len(c.__dict__.get("__annotations__", ())) for c in cls.__mro__),
+        tuple(id(getattr(cls, name, REQUIRED)) for name in annotations),
+    )
+
+
+def _is_config_type(t) -> bool:
+    return isinstance(t, type) and issubclass(t, _ConfigBase)
+
+
+def build_schema(cls: type) -> ConfigSchema:
+    annotations = get_annotations(cls)
+    defaults = {}
+    optional_inner = {}
+    casters = {}
+    nested_config_fields = set()
+
+    for name, ann_type in annotations.items():
+        default = getattr(cls, name, REQUIRED)
+        if type(default) is MemberDescriptorType:
+            # a SlotsConfig field, whose default was moved off the class
+            default = _slot_default(cls, name)
+        if not isinstance(default, Lazy):
+            # Lazy fields are left unset, so that reading them builds them
+            defaults[name] = default
+
+        field_type = ann_type
+        if get_origin(ann_type) in [Union, UnionType]:
+            type_args = get_args(ann_type)
+            if len(type_args) == 2 and type_args[1] == NoneType:
+                optional_inner[name] = field_type = type_args[0]
+
+        caster = compile_coercer(ann_type)
+        if caster is not None:
+            casters[name] = caster
+
+        if _is_config_type(field_type):
+            nested_config_fields.add(name)
+
+    return ConfigSchema(
+        annotations=annotations,
+        defaults=defaults,
+        optional_inner=optional_inner,
+        casters=casters,
+        nested_config_fields=frozenset(nested_config_fields),
+        token=_schema_token(cls, annotations),
+    )
+
+
+def get_schema(cls: type) -> ConfigSchema:
+    """
+    Returns the (cached) schema for a Config class, rebuilding it if the
+    class has changed since the schema was compiled.
+    """
+    # look in the class' own __dict__ so subclasses never pick up a parent's schema
+    schema = cls.__dict__.get(SCHEMA_ATTR)
+    if schema is None or not schema.is_current(cls):
+        schema = build_schema(cls)
+        setattr(cls, SCHEMA_ATTR, schema)
+    return schema
+
+
+def _cached_schema(cls: type) -> ConfigSchema:
+    # Hot-path variant of get_schema that skips revalidation. Validation
+    # happens whenever an instance is created, which is the only way to get
+    # hold of a config to assign into.
+    schema = cls.__dict__.get(SCHEMA_ATTR)
+    if schema is None:
+        schema = get_schema(cls)
+    return schema
+
+
+def cast_field(cls: type, key: str, value):
+    """
+    The value that assigning value to field key of a cls instance would
+    store, after casting it to the field's annotated type (if any).
+    """
+    caster = _cached_schema(cls).casters.get(key)
+    return value if caster is None else caster(value)
+
+
+class _ConfigBase:
+    # everything Config and SlotsConfig share. Its __slots__ are empty so
+    # that SlotsConfig can do without a __dict__, while Config (like any
+    # subclass that doesn't declare __slots__) gets one
+    __slots__ = ()
 
-class Config:
     def __init__(self):
         self._init_annotations()
         setattr(self, ANNOTATIONS_INITIALIZED, True)
 
+    def __setattr__(self, name: str, value):
+        object.__setattr__(self, name, value)
+        # forget any memoized fingerprint (see pydra.hashing)
+        if len(_FINGERPRINTS) > 0:
+            invalidate_fingerprint(self)
+        # and any reference that was resolved into the field, which has now
+        # been overwritten
+        if len(_SYMBOLIC) > 0:
+            forget_resolved(self, [name])
+
+    def __delattr__(self, name: str):
+        object.__delattr__(self, name)
+        if len(_FINGERPRINTS) > 0:
+            invalidate_fingerprint(self)
+        if len(_SYMBOLIC) > 0:
+            forget_resolved(self, [name])
+
     def _init_annotations(self):
-        cls = self.__class__
-        # get the class' type annotations
-        annotations = get_annotations(cls)
+        schema = get_schema(self.__class__)
 
-        for name, _ in annotations.items():
-            init_value = getattr(cls, name, REQUIRED)
+        for name, init_value in schema.defaults.items():
             setattr(self, name, init_value)
 
     def _assign_maybe_cast(self, key: str, value):
-        annotations = get_annotations(self.__class__)
+        schema = _cached_schema(self.__class__)
 
-        if len(annotations) > 0 and not getattr(self, ANNOTATIONS_INITIALIZED, False):
+        if len(schema.annotations) > 0 and not getattr(
+            self, ANNOTATIONS_INITIALIZED, False
+        ):
             raise ValueError(
                 "Config.__init__() must be called (e.g. with super().__init__()) when config has type annotations"
             )
 
-        if ann_type := annotations.get(key):
-            # handling for the optionals of the form Optional[T] or T | None
-            if get_origin(ann_type) in [Union, UnionType]:
-                type_args = get_args(ann_type)
-                if len(type_args) != 2 or type_args[1] != NoneType:
-                    raise ValueError(
-                        f"Can only support union types of the form Optional[T] or T | None, but got '{ann_type}'"
-                    )
-
-                inner_type = type_args[0]
-
-                if value is None:
-                    pass
-                else:
-                    value = inner_type(value)
-
-            else:
-                value = ann_type(value)
+        caster = schema.casters.get(key)
+        if caster is not None:
+            try:
+                value = caster(value)
+            except CoercionError as e:
+                if is_reference(value):
+                    # cast once it's resolved, when the tree is finalized
+                    setattr(self, key, value)
+                    return
+                raise CoercionError(
+                    f"Can't assign to '{key}' (annotated as {type_name(schema.annotations[key])}): {e}"
+                ) from None
 
         setattr(self, key, value)
 
     def _recursive_finalize(self):
-        for k, v in self.__dict__.items():
-            if isinstance(v, Config):
-                v._recursive_finalize()
-            elif isinstance(v, (list, tuple)):
-                for x in v:
-                    if isinstance(x, Config):
-                        x._recursive_finalize()
-            elif isinstance(v, dict):
-                for k2, v2 in v.items():
-                    if isinstance(v2, Config):
-                        v2._recursive_finalize()
-
-        self.finalize()
+        finalize_tree(self, enforce_required=False)
 
     def finalize(self):
         pass
 
-    def to_dict(self):
+    def to_dict(self, symbolic: bool = False):
+        """
+        Converts this config to plain lists, dicts and primitives. With
+        symbolic, values that finalizing resolved from references (see
+        pydra.Ref) are given as those references instead, e.g. "${model.dim}".
+        """
         data = {}
+        for k, v in config_items(self):
+            data[k] = v if type(v) in _PLAIN_FIELD_TYPES else _field_to_plain(v)
+        if symbolic and len(_SYMBOLIC) > 0:
+            from pydra.references import _restore_references
 
-        for k, v in self.__dict__.items():
-            if isinstance(v, DataclassWrapper):
-                v = v.d
-
-            if isinstance(v, Config):
-                data[k] = v.to_dict()
-            elif isinstance(v, (list, tuple)):
-                data[k] = [x.to_dict() if isinstance(x, Config) else x for x in v]
-            elif isinstance(v, dict):
-                data[k] = {
-                    k: v.to_dict() if isinstance(v, Config) else v for k, v in v.items()
-                }
-            elif isinstance(v, (int, float, str, bool)):
-                data[k] = v
-            else:
-                data[k] = str(v)
-
-        data.pop(ANNOTATIONS_INITIALIZED, None)
+            _restore_references(self, data)
         return data
 
     def save_yaml(self, path: Path):
@@ -112,17 +242,927 @@ class Config:
     def save_pickle(self, path: Path):
         save_pickle(self, path)
 
+    def fingerprint(self) -> str:
+        """
+        Returns a deterministic, type-aware digest of this config's contents,
+        including nested configs, containers and wrappers, e.g. for keying
+        caches. The fingerprints of nested configs and wrappers are memoized
+        and forgotten when they're assigned to, so re-fingerprinting after an
+        override only re-hashes the path that changed. Modifying a list or
+        dict in place (other than through overrides) isn't tracked, so
+        reassign the field instead.
+        """
+        from pydra.hashing import fingerprint
+
+        return fingerprint(self)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Rebuilds a config from the output of to_dict() (or a loaded YAML
+        file saved by save_yaml). A fresh instance provides the classes of
+        nested configs and wrappers, and the types of tuples, paths and
+        enums, while annotated fields are cast to their annotated types.
+        Fields missing from data keep their defaults, and finalize() isn't
+        called again.
+        """
+        return _restore_config(cls(), data)
+
+    @classmethod
+    def load_yaml(cls, path: Path):
+        return cls.from_dict(load_yaml(path))
+
+    @classmethod
+    def load_yaml_all(cls, path: Path) -> list:
+        """Restores one config per document in a multi-document YAML file."""
+        return [cls.from_dict(data) for data in load_yaml_all(path)]
+
     def _enforce_required(self):
-        for k, v in self.__dict__.items():
-            if v is REQUIRED:
-                raise ValueError(f"Missing required config value: {k}")
-            elif isinstance(v, Config):
-                v._enforce_required()
-            elif isinstance(v, (list, tuple)):
-                for x in v:
-                    if isinstance(x, Config):
-                        x._enforce_required()
-            elif isinstance(v, dict):
-                for k2, v2 in v.items():
-                    if isinstance(v2, Config):
-                        v2._enforce_required()
+        finalize_tree(self, enforce_required=True, finalize=False)
+
+    def freeze(self):
+        """
+        Makes this config and everything beneath it immutable, in place:
+        configs and wrappers can no longer be assigned to, and lists and
+        dicts are replaced by FrozenLists and FrozenDicts. Frozen configs
+        are hashable, comparing equal when their fingerprints match, so
+        they can be shared between threads and used as cache keys (configs
+        holding values that can't be fingerprinted, e.g. a tokenizer, are
+        hashed and compared by identity instead). Leaves (e.g. arrays)
+        aren't copied, although numpy arrays are made read-only. Returns
+        self.
+        """
+        owned = _COPY_ON_WRITE_ROOTS.get(self)
+        if owned is not None:
+            # don't freeze subtrees that are shared with another config
+            _own_children(self, CONFIG, owned)
+            _COPY_ON_WRITE_ROOTS.pop(self)
+
+        if pydra.lazy.DECLARED:
+            _resolve_lazy_fields(self, CONFIG)
+        from pydra.frozen import _apply_frozen, _freeze, _frozen_digest
+
+        pending = []
+        _freeze(self, {}, pending)
+        _apply_frozen(pending)
+
+        # compute the fingerprint up front, so hashing is just a lookup
+        _frozen_digest(self)
+        return self
+
+    def clone(self, copy_on_write: bool = False):
+        """
+        Returns a copy of this config. Nested configs, wrappers, lists and
+        dicts are copied structurally (without calling __init__), while
+        immutable leaves are shared.
+
+        With copy_on_write, nothing is copied up front: the clone shares
+        its subtrees with this config, and a subtree is only copied when
+        it is written to through the override machinery (apply_overrides,
+        override plans, finalize). From then on, overrides applied to
+        either config are isolated from the other, but assigning to nested
+        fields directly in Python code is not tracked and will be visible
+        in both.
+        """
+        if not copy_on_write:
+            return _clone(self, {})
+
+        new = _shallow_copy(self, CONFIG)
+        # both configs now share everything beneath them, so both need to
+        # copy before writing
+        _COPY_ON_WRITE_ROOTS[self] = {id(self): None}
+        _COPY_ON_WRITE_ROOTS[new] = {id(new): None}
+        return new
+
+
+class Config(_ConfigBase):
+    pass
+
+
+SLOT_FIELDS_ATTR = "_pydra_slot_fields"
+SLOT_DEFAULTS_ATTR = "_pydra_slot_defaults"
+
+
+class _SlotsConfigMeta(type):
+    """
+    Turns each annotated field of a SlotsConfig subclass into a slot. Class
+    level defaults can't coexist with slots of the same name, so they're
+    moved into SLOT_DEFAULTS_ATTR (which build_schema reads them from).
+    """
+
+    def __new__(mcls, name, bases, namespace, **kwargs):
+        inherited_fields = ()
+        inherited_defaults = {}
+        for base in bases:
+            inherited_fields += getattr(base, SLOT_FIELDS_ATTR, ())
+            inherited_defaults.update(getattr(base, SLOT_DEFAULTS_ATTR, {}))
+
+        own_fields = tuple(
+            field
+            for field in namespace.get("__annotations__", {})
+            if field not in inherited_fields
+        )
+        defaults = {
+            field: namespace.pop(field) for field in own_fields if field in namespace
+        }
+        for field, default in defaults.items():
+            if isinstance(default, Lazy):
+                raise TypeError(
+                    f"SlotsConfig fields can't be Lazy (got one for '{field}')"
+                )
+
+        namespace["__slots__"] = tuple(namespace.get("__slots__", ())) + own_fields
+        namespace[SLOT_FIELDS_ATTR] = inherited_fields + own_fields
+        namespace[SLOT_DEFAULTS_ATTR] = {**inherited_defaults, **defaults}
+        return super().__new__(mcls, name, bases, namespace, **kwargs)
+
+
+class SlotsConfig(_ConfigBase, metaclass=_SlotsConfigMeta):
+    """
+    A config whose fields are stored in __slots__ instead of a per-instance
+    __dict__, for programs that keep many thousands of small configs. Every
+    field must be annotated (assigning to an unannotated name raises
+    AttributeError), and a class may only inherit fields from one chain of
+    SlotsConfigs. It behaves like a Config, but isn't a subclass of one,
+    since Config instances have a __dict__.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    def __init__(self):
+        # no per-instance marker: the class-level one below always applies
+        self._init_annotations()
+
+
+# set outside the class body, since a class attribute can't be a slot
+setattr(SlotsConfig, ANNOTATIONS_INITIALIZED, True)
+
+
+def _slot_default(cls: type, name: str):
+    return getattr(cls, SLOT_DEFAULTS_ATTR, {}).get(name, REQUIRED)
+
+
+def _fields(config: Config) -> dict:
+    """
+    A config's fields, as its __dict__ (which includes the marker attribute
+    set by Config.__init__), or a snapshot of the set slots of a SlotsConfig.
+    """
+    try:
+        return config.__dict__
+    except AttributeError:
+        fields = {}
+        for name in getattr(type(config), SLOT_FIELDS_ATTR, ()):
+            try:
+                fields[name] = object.__getattribute__(config, name)
+            except AttributeError:
+                pass
+        return fields
+
+
+def _set_fields(config: Config, items) -> None:
+    # writes fields directly, skipping casting and fingerprint tracking
+    try:
+        d = config.__dict__
+    except AttributeError:
+        for k, v in items:
+            object.__setattr__(config, k, v)
+    else:
+        d.update(items)
+
+
+# The kinds of node that a config tree is made of. Everything that isn't
+# one of the containers below is a leaf. Kinds >= CONFIG can hold configs.
+LEAF = 0
+WRAPPER = 1
+CONFIG = 2
+SEQUENCE = 3
+MAPPING = 4
+
+_NODE_KINDS: dict[type, int] = {}
+
+
+def node_kind(t: type) -> int:
+    """Classifies a type once, so walks avoid repeated isinstance ladders."""
+    kind = _NODE_KINDS.get(t)
+    if kind is None:
+        if issubclass(t, _ConfigBase):
+            kind = CONFIG
+        elif issubclass(t, BaseWrapper):
+            kind = WRAPPER
+        elif issubclass(t, (list, tuple)):
+            kind = SEQUENCE
+        elif issubclass(t, dict):
+            kind = MAPPING
+        else:
+            kind = LEAF
+        _NODE_KINDS[t] = kind
+    return kind
+
+
+def config_items(config: Config):
+    """The (name, value) pairs of a config's fields."""
+    d = _fields(config)
+    if ANNOTATIONS_INITIALIZED in d:
+        return [(k, v) for k, v in d.items() if k != ANNOTATIONS_INITIALIZED]
+    return d.items()
+
+
+def _children(value, kind: int):
+    if kind == CONFIG:
+        return config_items(value)
+    elif kind == WRAPPER:
+        return value.d.items()
+    elif kind == SEQUENCE:
+        return enumerate(value)
+    else:
+        return value.items()
+
+
+def _child_path(path: str, key) -> str:
+    return f"{path}.{key}" if path else str(key)
+
+
+def _format_path(path) -> str:
+    # paths are built during walks as cheap (parent, key) pairs, and only
+    # formatted into dotted strings when needed
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(str(key))
+    return ".".join(reversed(keys))
+
+
+def _collect_configs(
+    node, kind: int, path, out: list, check_required: bool, sites: list | None = None
+):
+    # the marker attribute set by Config.__init__ is a plain bool, so it's
+    # fine to walk raw field items here. If sites is given, the (path,
+    # value) of every reference (see pydra.Ref) is added to it
+    is_config = kind == CONFIG
+    items = _fields(node).items() if is_config else _children(node, kind)
+    check_here = check_required and is_config
+    get_kind = _NODE_KINDS.get
+    # bound locally, since this is checked for every leaf
+    scan = sites is not None
+    ref_type = Ref
+    wrapper = WRAPPER
+
+    for k, v in items:
+        if check_here and v is REQUIRED:
+            _raise_missing(node, _format_path((path, k)), k)
+
+        t = type(v)
+        child_kind = get_kind(t)
+        if child_kind is None:
+            child_kind = node_kind(t)
+        if child_kind >= CONFIG:
+            _collect_configs(v, child_kind, (path, k), out, check_required, sites)
+        elif scan and (
+            (t is str and "${" in v) or t is ref_type or child_kind == wrapper
+        ):
+            _collect_references(v, t, child_kind, (path, k), sites)
+
+    if is_config:
+        out.append((path, node))
+
+
+def _collect_references(value, t: type, kind: int, path, sites: list):
+    if kind == WRAPPER:
+        for k, v in value.d.items():
+            vt = type(v)
+            if (vt is str and "${" in v) or vt is Ref:
+                # (templates of only escapes don't refer to anything, but
+                # still need unescaping)
+                if referenced_paths(v) is not None:
+                    sites.append(((path, k), v))
+    elif referenced_paths(value) is not None:
+        sites.append((path, value))
+
+
+def iter_configs(root: Config, check_required: bool = False):
+    """
+    Lists (path, config) for every Config in the tree rooted at root
+    (including root itself, whose path is ""), children before parents.
+    Configs nested in lists, tuples and dicts are included; wrappers are
+    not descended into. If check_required is set, raises ValueError on the
+    first config field that is still REQUIRED.
+    """
+    out = []
+    _collect_configs(root, CONFIG, None, out, check_required)
+    return [(_format_path(path), node) for path, node in out]
+
+
+def _raise_missing(config: Config, path: str, key: str):
+    annotations = _cached_schema(config.__class__).annotations
+    if key in annotations:
+        raise ValueError(
+            f"Missing required config value: {path} (annotated as {annotations[key]})"
+        )
+    raise ValueError(f"Missing required config value: {path}")
+
+
+def iter_leaves(root: Config):
+    """
+    Yields (path, value) for every leaf in the tree rooted at root, in
+    field order. Configs, wrappers, lists, tuples and dicts are descended
+    into (empty ones are yielded as leaves); paths use dots, with list
+    indices as path segments, e.g. "model.layers.0.dim".
+    """
+    stack = [("", iter(_children(root, CONFIG)))]
+
+    while stack:
+        path, children = stack[-1]
+
+        for k, v in children:
+            child_path = _child_path(path, k)
+            kind = node_kind(type(v))
+            if kind == LEAF or ((kind == SEQUENCE or kind == MAPPING) and not v):
+                yield child_path, v
+            else:
+                stack.append((child_path, iter(_children(v, kind))))
+                break
+        else:
+            stack.pop()
+
+
+def _collect_wrappers(node, kind: int, path: str, out: list):
+    for k, v in _children(node, kind):
+        child_kind = node_kind(type(v))
+        if child_kind == WRAPPER:
+            out.append((_child_path(path, k), v))
+        elif child_kind >= CONFIG:
+            _collect_wrappers(v, child_kind, _child_path(path, k), out)
+
+
+def build_all(root: Config, validate: bool = True) -> dict[str, Any]:
+    """
+    Builds every wrapper in the tree rooted at root in one batch (see
+    build_many), returning the built objects keyed by their dotted paths.
+    """
+    found = []
+    _collect_wrappers(root, CONFIG, "", found)
+    built = build_many([wrapper for _, wrapper in found], validate)
+    return {path: obj for (path, _), obj in zip(found, built)}
+
+
+# Profiling, observers and parallel finalizing can only be in use once their
+# modules are imported (which importing pydra doesn't do), so until then
+# they're looked up in sys.modules rather than imported
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+def active_profiler():
+    profile = sys.modules.get("pydra.profile")
+    return None if profile is None else profile.ACTIVE
+
+
+def active_observers() -> tuple:
+    hooks = sys.modules.get("pydra.hooks")
+    return () if hooks is None else hooks.OBSERVERS
+
+
+def active_parallel():
+    parallel = sys.modules.get("pydra.parallel")
+    return None if parallel is None else parallel.ACTIVE
+
+
+def phase(name: str):
+    """Like pydra.profile.phase, without importing pydra.profile."""
+    profile = sys.modules.get("pydra.profile")
+    return _NO_PHASE if profile is None else profile.phase(name)
+
+
+def finalize_tree(
+    root: Config,
+    enforce_required: bool = True,
+    finalize: bool = True,
+    resolve_lazy: bool = True,
+):
+    """
+    Checks for missing required values and finalizes every config in the
+    tree, children before parents, using a single walk. Required values are
+    all checked before any finalize() is called. Unless resolve_lazy is
+    unset, finalizing first builds any Lazy fields that are still unbuilt,
+    then every reference (see pydra.Ref) is resolved.
+    """
+    if finalize and len(_COPY_ON_WRITE_ROOTS) > 0:
+        owned = _COPY_ON_WRITE_ROOTS.get(root)
+        if owned is not None:
+            _own_for_finalize(root, CONFIG, owned)
+
+    if finalize and resolve_lazy and pydra.lazy.DECLARED:
+        # building lazy defaults counts as part of finalizing
+        with phase("finalize"):
+            _resolve_lazy_fields(root, CONFIG)
+
+    profiler = active_profiler()
+    observers = active_observers()
+    parallel = active_parallel()
+    if profiler is not None or observers or parallel is not None:
+        _finalize_tree_instrumented(
+            root, enforce_required, finalize, profiler, observers, parallel
+        )
+        return
+
+    nodes = []
+    # references can be assigned in too many ways to track (e.g. appended
+    # to a list, or set by a method), so the tree is always looked through
+    sites = [] if finalize else None
+    _collect_configs(root, CONFIG, None, nodes, enforce_required, sites)
+
+    if finalize:
+        if sites or len(_SYMBOLIC) > 0:
+            from pydra.references import resolve_references
+
+            resolve_references(root, nodes, sites)
+        for _, node in nodes:
+            node.finalize()
+
+        if len(_FINGERPRINTS) > 0:
+            _invalidate_finalized(nodes)
+
+
+def unresolved_lazy_fields(config: Config) -> list[str]:
+    """The names of config's Lazy fields that haven't been built (or assigned) yet."""
+    names = lazy_fields(type(config))
+    if not names:
+        return []
+    fields = _fields(config)
+    return [name for name in names if name not in fields]
+
+
+def _resolve_lazy_fields(node, kind: int):
+    # builds every unresolved Lazy field in the tree, walking into what
+    # they build too
+    if kind == CONFIG:
+        for name in unresolved_lazy_fields(node):
+            getattr(node, name)
+
+    for _, v in _children(node, kind):
+        child_kind = node_kind(type(v))
+        if child_kind >= CONFIG:
+            _resolve_lazy_fields(v, child_kind)
+
+
+def plain_at(data, path: str):
+    """The part of a to_dict() result that the config at path (see iter_configs) became."""
+    for part in path.split(".") if path else ():
+        if isinstance(data, list):
+            data = data[int(part)]
+        else:
+            data = data[part] if part in data else data[int(part)]
+    return data
+
+
+def _invalidate_finalized(nodes: list):
+    # finalize() can modify its config in place (e.g. appending to a list),
+    # which assignment tracking doesn't see
+    for _, node in nodes:
+        if type(node).finalize is not Config.finalize:
+            invalidate_fingerprint(node)
+
+
+def _finalize_tree_instrumented(
+    root: Config,
+    enforce_required: bool,
+    finalize: bool,
+    profiler,
+    observers: tuple,
+    parallel=None,
+):
+    # like finalize_tree, but timing the required check and each finalize(),
+    # and emitting events for them (or finalizing on parallel's thread pool)
+    from pydra.hooks import emit
+
+    nodes = []
+    sites = [] if finalize else None
+    with phase("enforce_required" if enforce_required else "collect"):
+        _collect_configs(root, CONFIG, None, nodes, enforce_required, sites)
+    if enforce_required:
+        emit(observers, "enforce_required", "", root)
+
+    if finalize:
+        with phase("finalize"):
+            if sites or len(_SYMBOLIC) > 0:
+                from pydra.references import resolve_references
+
+                resolve_references(root, nodes, sites)
+            if parallel is not None:
+                tasks, parents = _finalize_graph(nodes)
+                parallel.finalize(tasks, parents, profiler, observers)
+            else:
+                for path, node in nodes:
+                    path = _format_path(path)
+                    emit(observers, "before_finalize", path, node)
+                    if profiler is not None:
+                        with profiler.node(path, "finalize"):
+                            node.finalize()
+                    else:
+                        node.finalize()
+                    emit(observers, "after_finalize", path, node)
+
+        if len(_FINGERPRINTS) > 0:
+            _invalidate_finalized(nodes)
+
+
+def _finalize_graph(nodes: list) -> tuple[list, list]:
+    """
+    From the (path, config) pairs that _collect_configs found, lists each
+    distinct config once as (dotted path, config), along with the indices
+    of the configs directly above each one, which have to be finalized
+    after it.
+    """
+    tasks = []
+    parents = []
+    # id(config) -> its index in tasks
+    index = {}
+    # id(path) -> the index of the config found there (paths are kept
+    # alive by nodes, so their ids can't be reused)
+    at_path = {}
+    for path, node in nodes:
+        i = index.get(id(node))
+        if i is None:
+            i = index[id(node)] = len(tasks)
+            tasks.append((_format_path(path), node))
+            parents.append([])
+        at_path[id(path)] = i
+
+    for path, node in nodes:
+        if path is None:
+            continue
+        # the nearest config above, skipping lists and dicts
+        above = path[0]
+        while above is not None and id(above) not in at_path:
+            above = above[0]
+        parent = at_path[id(above)]
+        child = index[id(node)]
+        if parent not in parents[child]:
+            parents[child].append(parent)
+
+    return tasks, parents
+
+
+_PRIMITIVE_TYPES = frozenset([int, float, str, bool, NoneType])
+
+
+# the types of field values that to_dict() keeps as they are (None isn't one)
+_PLAIN_FIELD_TYPES = frozenset([int, float, str, bool])
+
+
+def _field_to_plain(value):
+    # like _to_plain, but as to_dict() has always done for a config's own
+    # fields, None and wrappers other than DataclassWrappers become strings
+    if value is None or (
+        node_kind(type(value)) == WRAPPER and not isinstance(value, DataclassWrapper)
+    ):
+        return str(value)
+    return _to_plain(value)
+
+
+def _to_plain(value):
+    if type(value) in _PRIMITIVE_TYPES:
+        return value
+
+    kind = node_kind(type(value))
+    if kind == CONFIG:
+        return value.to_dict()
+    elif kind == SEQUENCE:
+        return [x if type(x) in _PRIMITIVE_TYPES else _to_plain(x) for x in value]
+    elif kind == MAPPING or kind == WRAPPER:
+        items = value.items() if kind == MAPPING else value.d.items()
+        return {k: v if type(v) in _PRIMITIVE_TYPES else _to_plain(v) for k, v in items}
+    elif isinstance(value, (int, float, str, bool)):
+        return value
+    elif is_array(value):
+        return value.tolist()
+    else:
+        return str(value)
+
+
+def _restore(template, data):
+    """
+    Rebuilds a value from its to_dict() form, using template (the value a
+    freshly constructed config holds in the same place) to recover the
+    types that to_dict() flattened away.
+    """
+    t = type(template)
+    primitives = _PRIMITIVE_TYPES
+    if t in primitives and type(data) in primitives:
+        return data
+
+    kind = node_kind(t)
+    if kind == CONFIG:
+        if type(data) is dict:
+            return _restore_config(template, data)
+    elif kind == WRAPPER:
+        if type(data) is dict:
+            d = template.d
+            for k, v in data.items():
+                d[k] = _restore(d.get(k), v)
+            return template
+    elif kind == SEQUENCE:
+        if type(data) is list:
+            n = len(template)
+            restored = [
+                (
+                    v
+                    if i >= n
+                    or (type(v) in primitives and type(template[i]) in primitives)
+                    else _restore(template[i], v)
+                )
+                for i, v in enumerate(data)
+            ]
+            if t is list:
+                return restored
+            elif t is tuple:
+                return tuple(restored)
+            elif hasattr(t, "_make"):
+                return t._make(restored)
+            return t(restored)
+    elif kind == MAPPING:
+        if type(data) is dict:
+            return {k: _restore(template.get(k), v) for k, v in data.items()}
+    elif type(data) is list and is_array(template):
+        return restore_array(template, data)
+    elif type(data) is str:
+        # leaves that to_dict() turned into strings
+        if template is REQUIRED:
+            if data == "REQUIRED":
+                return REQUIRED
+        elif isinstance(template, PurePath):
+            return t(data)
+        elif isinstance(template, Enum):
+            name = data.rpartition(".")[2]
+            if name in t.__members__:
+                return t[name]
+
+    return data
+
+
+def _restore_config(config: Config, data: dict):
+    schema = _cached_schema(config.__class__)
+    fields = _fields(config)
+
+    primitives = _PRIMITIVE_TYPES
+    annotations = schema.annotations
+
+    for k, v in data.items():
+        template = fields.get(k)
+        if template is None and v == "None":
+            # to_dict() gives fields that are None as "None"
+            v = None
+        if (
+            type(v) in primitives
+            and type(template) in primitives
+            and k not in annotations
+        ):
+            setattr(config, k, v)
+            continue
+
+        if (
+            k in schema.nested_config_fields
+            and type(v) is dict
+            and node_kind(type(template)) != CONFIG
+        ):
+            # e.g. a REQUIRED nested config, which we can build from its
+            # annotation
+            template = schema.optional_inner.get(k, annotations[k])()
+
+        value = _restore(template, v)
+        if k in annotations:
+            # e.g. the items of a list[Path] field, which an empty default
+            # list can't provide the type of
+            config._assign_maybe_cast(k, value)
+        else:
+            setattr(config, k, value)
+
+    return config
+
+
+# leaves that can be shared between a config and its clones
+_IMMUTABLE_TYPES = _PRIMITIVE_TYPES | {complex, bytes, type(Path()), type(REQUIRED)}
+
+
+def _clone(value, memo: dict):
+    t = type(value)
+    if t in _IMMUTABLE_TYPES:
+        return value
+
+    if id(value) in memo:
+        return memo[id(value)]
+
+    kind = _NODE_KINDS.get(t)
+    if kind is None:
+        kind = node_kind(t)
+
+    if kind == CONFIG and getattr(t, "__deepcopy__", None) is None:
+        new = t.__new__(t)
+        memo[id(value)] = new
+        _set_fields(new, [(k, _clone(v, memo)) for k, v in _fields(value).items()])
+        if len(_SYMBOLIC) > 0:
+            _copy_symbolic(value, new)
+    elif kind == WRAPPER:
+        new = object.__new__(t)
+        memo[id(value)] = new
+        new.__dict__.update(value.__dict__)
+        new.__dict__["d"] = {k: _clone(v, memo) for k, v in value.d.items()}
+    elif t is list:
+        new = []
+        memo[id(value)] = new
+        new.extend(_clone(x, memo) for x in value)
+    elif t is dict:
+        new = {}
+        memo[id(value)] = new
+        for k, v in value.items():
+            new[k] = _clone(v, memo)
+    elif t is tuple:
+        items = [_clone(x, memo) for x in value]
+        if all(a is b for a, b in zip(items, value)):
+            new = value
+        else:
+            new = tuple(items)
+        memo[id(value)] = new
+    else:
+        new = deepcopy(value, memo)
+
+    return new
+
+
+# Copy-on-write clones, mapped to the {id: node} of the nodes in their tree
+# that they own (i.e. that aren't shared with another config). Nodes are
+# kept alive by the map, so their ids can't be reused while it exists. The
+# clone itself is only listed by id (mapped to None), since referencing it
+# from its own entry would keep it alive forever; its id can't be reused
+# while it's alive, and the entry goes away with it.
+_COPY_ON_WRITE_ROOTS = WeakIdentityMap()
+
+
+def _shallow_copy(value, kind: int):
+    t = type(value)
+    if kind == CONFIG:
+        new = t.__new__(t)
+        _set_fields(new, _fields(value).items())
+        if len(_SYMBOLIC) > 0:
+            _copy_symbolic(value, new)
+    elif kind == WRAPPER:
+        new = object.__new__(t)
+        new.__dict__.update(value.__dict__)
+        new.__dict__["d"] = dict(value.d)
+    elif t is tuple:
+        # can't be modified in place, so is rebuilt by whoever changes it
+        new = value
+    else:
+        new = copy(value)
+    return new
+
+
+def _set_child(node, kind: int, key, value):
+    if len(_FINGERPRINTS) > 0:
+        # memoized fingerprints beneath the replaced value point at their
+        # parents, but the replacement's don't, so later writes to it
+        # couldn't be propagated; forget them (and the parents) instead
+        invalidate_fingerprint(node)
+        invalidate_fingerprints_in(_get_child(node, kind, key))
+
+    if kind == CONFIG:
+        _set_fields(node, [(key, value)])
+    elif kind == WRAPPER:
+        node.d[key] = value
+    elif kind == SEQUENCE or kind == MAPPING:
+        node[key] = value
+    else:
+        setattr(node, key, value)
+
+
+def _get_child(node, kind: int, key):
+    if kind == CONFIG:
+        return _fields(node).get(key)
+    elif kind == WRAPPER:
+        return node.d.get(key)
+    elif kind == SEQUENCE or kind == MAPPING:
+        return node[key]
+    else:
+        return getattr(node, key, None)
+
+
+def invalidate_fingerprints_in(value) -> None:
+    """
+    Forgets the memoized fingerprints of value and every config and wrapper
+    beneath it (along with their parents).
+    """
+    kind = node_kind(type(value))
+    if kind == CONFIG or kind == WRAPPER:
+        invalidate_fingerprint(value)
+    if kind != LEAF:
+        for _, v in _children(value, kind):
+            invalidate_fingerprints_in(v)
+
+
+def invalidate_fingerprint_path(root: Config, hops, subtree: bool = False) -> None:
+    """
+    Forgets the memoized fingerprints of root and every object along hops
+    (see copy_on_write_path), after something along them was written to.
+    With subtree, everything beneath the last object is forgotten too.
+    """
+    node = root
+    invalidate_fingerprint(node)
+    for _, name, is_dict in hops:
+        node = node[name] if is_dict else getattr(node, name)
+        invalidate_fingerprint(node)
+
+    if subtree:
+        invalidate_fingerprints_in(node)
+
+
+def _own(node, owned: dict):
+    owned[id(node)] = node
+    return node
+
+
+def copy_on_write_path(root: Config, hops) -> None:
+    """
+    If root is a copy-on-write clone, makes sure every object along hops
+    (a sequence of (type, name, is_dict) steps from root) is owned by root
+    rather than shared, so it can be written to safely.
+    """
+    owned = _COPY_ON_WRITE_ROOTS.get(root)
+    if owned is None:
+        return
+
+    node = root
+    kind = CONFIG
+    for _, name, is_dict in hops:
+        child = node[name] if is_dict else getattr(node, name)
+        child_kind = node_kind(type(child))
+        if id(child) not in owned:
+            child = _own(_shallow_copy(child, child_kind), owned)
+            _set_child(node, MAPPING if is_dict else kind, name, child)
+        node = child
+        kind = child_kind
+
+
+def copy_on_write_subtree(root: Config, hops) -> None:
+    """
+    Like copy_on_write_path, but also takes ownership of everything beneath
+    the object that hops lead to (e.g. before calling a method on it, which
+    could modify anything it holds).
+    """
+    owned = _COPY_ON_WRITE_ROOTS.get(root)
+    if owned is None:
+        return
+
+    copy_on_write_path(root, hops)
+
+    node = root
+    for _, name, is_dict in hops:
+        node = node[name] if is_dict else getattr(node, name)
+    _own_children(node, node_kind(type(node)), owned)
+
+
+def _own_children(node, kind: int, owned: dict):
+    if kind == LEAF:
+        return
+
+    memo = {}
+    for k, v in list(_children(node, kind)):
+        if node_kind(type(v)) != LEAF:
+            _set_child(node, kind, k, _clone(v, memo))
+
+    for new in memo.values():
+        _own(new, owned)
+
+
+def _own_for_finalize(node, kind: int, owned: dict):
+    """
+    Takes ownership of every subtree that finalize() could modify, i.e.
+    every config that overrides finalize along with everything beneath it.
+    Returns the node to use in place of the given one.
+    """
+    if kind == CONFIG and type(node).finalize is not Config.finalize:
+        if id(node) not in owned:
+            memo = {}
+            node = _clone(node, memo)
+            for new in memo.values():
+                _own(new, owned)
+        else:
+            _own_children(node, kind, owned)
+        return node
+
+    replaced = {}
+    for k, v in _children(node, kind):
+        child_kind = node_kind(type(v))
+        if child_kind >= CONFIG:
+            new_v = _own_for_finalize(v, child_kind, owned)
+            if new_v is not v:
+                replaced[k] = new_v
+
+    if replaced:
+        if type(node) is tuple:
+            return tuple(replaced.get(i, x) for i, x in enumerate(node))
+        if id(node) not in owned:
+            node = _own(_shallow_copy(node, kind), owned)
+        for k, new_v in replaced.items():
+            _set_child(node, kind, k, new_v)
+
+    return node
@@ -0,0 +1,413 @@
+import array
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import PurePath
+
+from pydra.arrays import LIST_DTYPES, is_ndarray_type
+from pydra.cli import Alias, apply_overrides
+from pydra.config import (
+    CONFIG,
+    MAPPING,
+    SEQUENCE,
+    WRAPPER,
+    Config,
+    cast_field,
+    config_items,
+    node_kind,
+)
+from pydra.frozen import FROZEN_ATTR, FrozenDict, FrozenList
+from pydra.hashing import _digest, _encode
+from pydra.interpolation import ESCAPE, compile_template
+from pydra.lazy import lazy_fields
+from pydra.parser import (
+    ARG_FILE_PREFIX,
+    CommandStream,
+    parse_typed_list,
+    parse_value,
+)
+
+
+@dataclass
+class UnsupportedChange:
+    key: str
+    reason: str
+
+
+@dataclass
+class ConfigDiff:
+    """
+    The result of diff(base, other): args turns (a copy of) base into
+    other when passed to apply_overrides, except for the changes listed in
+    unsupported, which no override can make.
+    """
+
+    args: list[str] = field(default_factory=list)
+    unsupported: list[UnsupportedChange] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return not self.unsupported
+
+
+# array typecodes, mapped back to the --list:<dtype> that produces them
+_TYPECODE_DTYPES = {
+    typecode: dtype
+    for dtype, typecode in reversed(LIST_DTYPES.items())
+    if dtype not in ("int", "float")
+}
+
+# leaves that can be compared with ==, without hashing them
+_EQ_TYPES = frozenset([int, str, bool, type(None)])
+
+
+def diff(base: Config, other: Config, finalize: bool = False) -> ConfigDiff:
+    """
+    Finds the overrides that turn base into other, e.g. the shortest argv
+    that reproduces a finalized config from MyConfig(). Subtrees (configs
+    and wrappers) with equal fingerprints are skipped without being
+    walked, so only the paths that changed cost anything.
+
+    Fields that only exist in one of the configs, nested configs replaced
+    by a different type, and values with no literal form that parses back
+    to an equal value are reported in the result's unsupported list
+    instead. Lazy fields that base hasn't built yet can still be assigned,
+    so they're treated as differing from other's values. With finalize,
+    the overrides are replayed on a clone of base (followed by
+    finalize()), and only the changes that still differ are reported, so
+    fields that finalize() derives aren't.
+    """
+    result = _diff(base, other)
+    if not finalize:
+        return result
+
+    replayed = base.clone()
+    apply_overrides(replayed, result.args, enforce_required=False)
+    remaining = _diff(replayed, other)
+    result.unsupported = remaining.unsupported
+    for command in CommandStream(remaining.args):
+        result.unsupported.append(
+            UnsupportedChange(
+                command.kv_pair.key, "finalize() doesn't reproduce this value"
+            )
+        )
+    return result
+
+
+def _diff(base: Config, other: Config) -> ConfigDiff:
+    result = ConfigDiff()
+    if _plain_type(type(base)) is not _plain_type(type(other)):
+        result.unsupported.append(
+            UnsupportedChange(
+                "",
+                f"can't turn a {type(base).__qualname__} into a {type(other).__qualname__}",
+            )
+        )
+    elif not _same_fingerprint(base, other):
+        _diff_fields(base, other, CONFIG, "", result, False)
+    return result
+
+
+def _same_fingerprint(a, b) -> bool:
+    try:
+        return _digest(a, None, set()) == _digest(b, None, set())
+    except TypeError:
+        # something beneath them can't be fingerprinted, so walk them instead
+        return False
+
+
+def _plain_type(t: type) -> type:
+    # frozen configs are instances of a subclass of their original class
+    return t.__bases__[0] if getattr(t, FROZEN_ATTR, False) else t
+
+
+def _items(node, kind: int) -> dict:
+    if kind == CONFIG:
+        return dict(config_items(node))
+    elif kind == WRAPPER:
+        return node.d
+    return node
+
+
+def _is_addressable(key) -> bool:
+    # whether key can be one component of a dotted override key
+    return (
+        type(key) is str
+        and key != ""
+        and "." not in key
+        and "=" not in key
+        and not key.startswith("-")
+    )
+
+
+def _diff_fields(
+    base, other, kind: int, path: str, result: ConfigDiff, in_wrapper: bool
+):
+    # in_wrapper is set beneath wrappers, whose fields finalizing only
+    # looks at the top level of for references
+    in_wrapper = in_wrapper or kind == WRAPPER
+    base_items = _items(base, kind)
+    other_items = _items(other, kind)
+    # Lazy fields that haven't been built yet are missing from the items
+    base_lazy = lazy_fields(type(base)) if kind == CONFIG else ()
+    other_lazy = lazy_fields(type(other)) if kind == CONFIG else ()
+
+    for k, other_value in other_items.items():
+        key = f"{path}.{k}" if path else str(k)
+        if k not in base_items:
+            if k in base_lazy:
+                # assigning it means it's never built, so whatever it would
+                # build doesn't matter
+                scan = _scan_depth(kind, in_wrapper)
+                _add_override(base, kind, k, other_value, key, result, scan)
+            else:
+                result.unsupported.append(
+                    UnsupportedChange(key, "only exists in other, so can't be assigned")
+                )
+            continue
+
+        base_value = base_items[k]
+        if base_value is other_value:
+            continue
+        if not _is_addressable(k):
+            if not _same(base_value, other_value):
+                result.unsupported.append(
+                    UnsupportedChange(key, "can't be written as part of a dotted key")
+                )
+            continue
+
+        scan = _scan_depth(kind, in_wrapper)
+        _diff_value(base, kind, k, base_value, other_value, key, result, scan)
+
+    for k in base_items:
+        if k not in other_items:
+            key = f"{path}.{k}" if path else str(k)
+            if k in other_lazy:
+                reason = "hasn't been built in other, so can't be reproduced"
+            else:
+                reason = "only exists in base, so can't be deleted"
+            result.unsupported.append(UnsupportedChange(key, reason))
+
+
+# how far into an assigned value finalizing looks for references
+_SCAN_NONE = 0
+_SCAN_TOP = 1
+_SCAN_NESTED = 2
+
+
+def _scan_depth(parent_kind: int, in_wrapper: bool) -> int:
+    if not in_wrapper:
+        return _SCAN_NESTED
+    return _SCAN_TOP if parent_kind == WRAPPER else _SCAN_NONE
+
+
+def _diff_value(parent, parent_kind, k, base_value, other_value, key, result, scan):
+    base_type = type(base_value)
+    other_type = type(other_value)
+    if base_type is other_type and base_type in _EQ_TYPES:
+        if base_value != other_value:
+            _add_override(parent, parent_kind, k, other_value, key, result, scan)
+        return
+
+    if isinstance(base_value, Alias):
+        if not _same(base_value, other_value):
+            result.unsupported.append(
+                UnsupportedChange(key, "is an alias in base, so can't be assigned")
+            )
+        return
+
+    base_kind = node_kind(base_type)
+    other_kind = node_kind(other_type)
+    if base_kind in (CONFIG, WRAPPER) or other_kind in (CONFIG, WRAPPER):
+        if base_kind != other_kind or _plain_type(base_type) is not _plain_type(
+            other_type
+        ):
+            result.unsupported.append(
+                UnsupportedChange(
+                    key,
+                    f"can't replace a {base_type.__qualname__} with a {other_type.__qualname__}",
+                )
+            )
+        elif base_kind == WRAPPER and base_value.wrapped_type is not (
+            other_value.wrapped_type
+        ):
+            result.unsupported.append(
+                UnsupportedChange(key, "wraps a different type in other")
+            )
+        elif not _same_fingerprint(base_value, other_value):
+            in_wrapper = scan != _SCAN_NESTED
+            _diff_fields(base_value, other_value, base_kind, key, result, in_wrapper)
+        return
+
+    if _same(base_value, other_value):
+        return
+
+    if (
+        base_kind == MAPPING
+        and other_kind == MAPPING
+        and base_value.keys() == other_value.keys()
+        and all(_is_addressable(x) for x in other_value)
+    ):
+        # override just the entries that changed
+        in_wrapper = scan != _SCAN_NESTED
+        _diff_fields(base_value, other_value, MAPPING, key, result, in_wrapper)
+        return
+
+    _add_override(parent, parent_kind, k, other_value, key, result, scan)
+
+
+def _add_override(parent, parent_kind, k, value, key, result: ConfigDiff, scan: int):
+    for text in _candidates(value):
+        if _roundtrips(parent, parent_kind, k, parse_value, text, value, scan):
+            result.args.append(_escape(f"{key}={text}"))
+            return
+
+    block = _typed_list(parent, parent_kind, k, value, scan)
+    if block is not None:
+        result.args.append(f"--list:{block[0]}")
+        result.args.append(_escape(key))
+        result.args.extend(block[1])
+        result.args.append("list--")
+        return
+
+    result.unsupported.append(
+        UnsupportedChange(
+            key, f"{type(value).__qualname__} value has no literal form for overrides"
+        )
+    )
+
+
+def _escape(arg: str) -> str:
+    # so that it isn't read as an argument file
+    return ARG_FILE_PREFIX + arg if arg.startswith(ARG_FILE_PREFIX) else arg
+
+
+def _thaw(value):
+    # frozen containers, as the plain containers their reprs should show,
+    # with "${" escaped in strings so that they aren't read as references
+    t = type(value)
+    if t is FrozenList or t is list:
+        return [_thaw(x) for x in value]
+    elif t is FrozenDict or t is dict:
+        return {k: _thaw(v) for k, v in value.items()}
+    elif t is tuple:
+        return tuple(_thaw(x) for x in value)
+    elif t is str:
+        return _escape_references(value)
+    return value
+
+
+def _escape_references(text: str) -> str:
+    return text.replace("${", ESCAPE)
+
+
+def _candidates(value):
+    """Override texts for value, shortest first, which may or may not parse back to it."""
+    t = type(value)
+    if t is bool:
+        yield "T" if value else "F"
+        return
+    if t is str:
+        value = _escape_references(value)
+        yield value
+        yield repr(value)
+        return
+
+    if isinstance(value, PurePath):
+        # which fields annotated with a path type cast from strings
+        yield str(value)
+    elif isinstance(value, Enum):
+        # which fields annotated with the enum cast from values
+        yield str(value.value)
+        yield repr(value.value)
+
+    text = repr(_thaw(value))
+    yield text
+    # e.g. inf and nan, which expressions can evaluate
+    yield f"({text})"
+
+
+def _stored(parent, parent_kind: int, k, value):
+    # what assigning value to k of parent would store
+    if parent_kind == CONFIG:
+        return cast_field(type(parent), k, value)
+    return value
+
+
+def _finalized(value, scan: int, in_tuple: bool = False):
+    """
+    What finalizing makes of an assigned value: escapes in templates are
+    replaced, while references (which a literal can't reproduce, since
+    they're resolved) and templates in tuples (which aren't supported)
+    raise ValueError.
+    """
+    t = type(value)
+    if t is str:
+        template = compile_template(value) if "${" in value else None
+        if template is None:
+            return value
+        if template.paths or in_tuple:
+            raise ValueError(f"{value!r} would be resolved when finalizing")
+        return template.parts[0]
+
+    if scan != _SCAN_NESTED:
+        return value
+    kind = node_kind(t)
+    if kind == SEQUENCE:
+        # only the tuple's own items can't be replaced
+        items = [_finalized(x, scan, isinstance(value, tuple)) for x in value]
+        return items if t is list else value
+    elif kind == MAPPING:
+        return {k: _finalized(v, scan) for k, v in value.items()}
+    return value
+
+
+def _roundtrips(parent, parent_kind, k, parse, text, value, scan: int) -> bool:
+    try:
+        stored = _stored(parent, parent_kind, k, parse(text))
+        if scan != _SCAN_NONE:
+            stored = _finalized(stored, scan)
+        return _same(stored, value)
+    except Exception:
+        return False
+
+
+def _typed_list(parent, parent_kind, k, value, scan) -> tuple[str, list[str]] | None:
+    """The dtype and tokens of a --list:<dtype> block for a 1-d array, if one fits."""
+    if isinstance(value, array.array):
+        dtype = _TYPECODE_DTYPES.get(value.typecode)
+    elif is_ndarray_type(type(value)) and value.ndim == 1:
+        dtype = f"{value.dtype.kind}{value.dtype.itemsize * 8}"
+    else:
+        return None
+    if dtype not in LIST_DTYPES:
+        return None
+
+    tokens = [str(x) for x in value.tolist()]
+    if not _roundtrips(
+        parent,
+        parent_kind,
+        k,
+        lambda t: parse_typed_list(t, dtype),
+        tokens,
+        value,
+        scan,
+    ):
+        return None
+    return dtype, tokens
+
+
+def _encoded(value) -> bytes:
+    out = []
+    _encode(value, out, None, set())
+    return b"".join(out)
+
+
+def _same(a, b) -> bool:
+    """Whether a and b are equal and of the same types, as fingerprints see them."""
+    if a is b:
+        return True
+    try:
+        return _encoded(a) == _encoded(b)
+    except TypeError:
+        # values that can't be fingerprinted
+        return type(a) is type(b) and a == b
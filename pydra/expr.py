@@ -0,0 +1,373 @@
+import ast
+import builtins
+import functools
+import math
+import operator
+from typing import Any, Callable
+
+# Guards against expressions that would take forever or exhaust memory,
+# e.g. "(10 ** 10 ** 10)" or "([0] * 10 ** 12)".
+MAX_INT_BITS = 100_000
+MAX_SEQUENCE_LENGTH = 10_000_000
+
+MAX_CACHED_EXPRESSIONS = 1024
+
+
+class UnsafeExpressionError(ValueError):
+    """Raised for expressions that the safe evaluator refuses to run."""
+
+
+def _check_int_bits(bits: int):
+    if bits > MAX_INT_BITS:
+        raise ValueError(
+            f"Result of expression would be too large (~{bits} bits, max {MAX_INT_BITS})"
+        )
+
+
+def _pow(base, exponent, mod=None):
+    if mod is None and isinstance(base, int) and isinstance(exponent, int):
+        if exponent > 0 and abs(base) > 1:
+            _check_int_bits(base.bit_length() * exponent)
+    return pow(base, exponent, mod)
+
+
+def _mul(left, right):
+    for seq, n in ((left, right), (right, left)):
+        if isinstance(seq, (str, bytes, list, tuple)) and isinstance(n, int):
+            if len(seq) * n > MAX_SEQUENCE_LENGTH:
+                raise ValueError(
+                    f"Result of expression would be too long (max {MAX_SEQUENCE_LENGTH})"
+                )
+    return left * right
+
+
+def _lshift(left, right):
+    if isinstance(left, int) and isinstance(right, int) and left != 0:
+        _check_int_bits(left.bit_length() + right)
+    return left << right
+
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _pow,
+    ast.LShift: _lshift,
+    ast.RShift: operator.rshift,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+    ast.BitAnd: operator.and_,
+}
+
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+    ast.Not: operator.not_,
+    ast.Invert: operator.invert,
+}
+
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+_MATH_NAMES = [
+    "sqrt",
+    "exp",
+    "expm1",
+    "log",
+    "log1p",
+    "log2",
+    "log10",
+    "sin",
+    "cos",
+    "tan",
+    "asin",
+    "acos",
+    "atan",
+    "atan2",
+    "sinh",
+    "cosh",
+    "tanh",
+    "floor",
+    "ceil",
+    "trunc",
+    "fabs",
+    "hypot",
+    "copysign",
+    "radians",
+    "degrees",
+    "isclose",
+    "isfinite",
+    "isinf",
+    "isnan",
+    "gcd",
+    "pi",
+    "e",
+    "tau",
+    "inf",
+    "nan",
+]
+
+# the names available to every expression
+SAFE_NAMESPACE = {name: getattr(math, name) for name in _MATH_NAMES}
+SAFE_NAMESPACE.update(
+    abs=abs,
+    min=min,
+    max=max,
+    round=round,
+    int=int,
+    float=float,
+    bool=bool,
+    str=str,
+    len=len,
+    sum=sum,
+    divmod=divmod,
+    pow=_pow,
+)
+
+# results that are safe to compute once and share between evaluations
+_IMMUTABLE_TYPES = (int, float, complex, str, bytes, bool, type(None))
+
+
+def _is_immutable(value) -> bool:
+    if isinstance(value, tuple):
+        return all(_is_immutable(x) for x in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
+
+
+class _Compiler:
+    """
+    Compiles an expression's AST into nested closures taking the namespace.
+    Each method returns (is_constant, value), where value is either the
+    constant itself or a function of the namespace.
+    """
+
+    def compile(self, node: ast.AST):
+        method = getattr(self, f"compile_{type(node).__name__}", None)
+        if method is None:
+            raise UnsafeExpressionError(
+                f"{type(node).__name__} isn't allowed in expressions"
+            )
+        return method(node)
+
+    def compile_fn(self, node: ast.AST) -> Callable:
+        is_constant, value = self.compile(node)
+        if is_constant:
+            return lambda ns: value
+        return value
+
+    def fold(self, fn: Callable, nodes: list[ast.AST]):
+        """Compiles fn(*nodes), computing it up front if all nodes are constant."""
+        compiled = [self.compile(n) for n in nodes]
+
+        if all(is_constant for is_constant, _ in compiled):
+            try:
+                value = fn(*[v for _, v in compiled])
+            except Exception:
+                # e.g. 1 / 0, which should only raise when evaluated
+                pass
+            else:
+                if _is_immutable(value):
+                    return True, value
+
+        fns = [v if not c else (lambda ns, v=v: v) for c, v in compiled]
+        if len(fns) == 1:
+            (a,) = fns
+            return False, lambda ns: fn(a(ns))
+        a, b = fns
+        return False, lambda ns: fn(a(ns), b(ns))
+
+    def compile_Expression(self, node: ast.Expression):
+        return self.compile(node.body)
+
+    def compile_Constant(self, node: ast.Constant):
+        return True, node.value
+
+    def compile_Name(self, node: ast.Name):
+        name = node.id
+
+        def lookup(ns):
+            try:
+                return ns[name]
+            except KeyError:
+                raise ValueError(f"Unknown name '{name}' in expression")
+
+        return False, lookup
+
+    def compile_Tuple(self, node: ast.Tuple):
+        elements = [self.compile(e) for e in node.elts]
+        if all(is_constant for is_constant, _ in elements):
+            return True, tuple(v for _, v in elements)
+        fns = [self.compile_fn(e) for e in node.elts]
+        return False, lambda ns: tuple([f(ns) for f in fns])
+
+    def compile_List(self, node: ast.List):
+        fns = [self.compile_fn(e) for e in node.elts]
+        return False, lambda ns: [f(ns) for f in fns]
+
+    def compile_Set(self, node: ast.Set):
+        fns = [self.compile_fn(e) for e in node.elts]
+        return False, lambda ns: {f(ns) for f in fns}
+
+    def compile_Dict(self, node: ast.Dict):
+        if any(k is None for k in node.keys):
+            raise UnsafeExpressionError("** unpacking isn't allowed in expressions")
+        pairs = [
+            (self.compile_fn(k), self.compile_fn(v))
+            for k, v in zip(node.keys, node.values)
+        ]
+        return False, lambda ns: {k(ns): v(ns) for k, v in pairs}
+
+    def compile_BinOp(self, node: ast.BinOp):
+        op = _BINARY_OPS.get(type(node.op))
+        if op is None:
+            raise UnsafeExpressionError(
+                f"{type(node.op).__name__} isn't allowed in expressions"
+            )
+        return self.fold(op, [node.left, node.right])
+
+    def compile_UnaryOp(self, node: ast.UnaryOp):
+        return self.fold(_UNARY_OPS[type(node.op)], [node.operand])
+
+    def compile_BoolOp(self, node: ast.BoolOp):
+        fns = [self.compile_fn(v) for v in node.values]
+        is_and = isinstance(node.op, ast.And)
+
+        def evaluate(ns):
+            for f in fns:
+                value = f(ns)
+                if bool(value) != is_and:
+                    return value
+            return value
+
+        return False, evaluate
+
+    def compile_Compare(self, node: ast.Compare):
+        ops = [_COMPARE_OPS[type(op)] for op in node.ops]
+        left = self.compile_fn(node.left)
+        comparators = [self.compile_fn(c) for c in node.comparators]
+
+        def evaluate(ns):
+            a = left(ns)
+            for op, comparator in zip(ops, comparators):
+                b = comparator(ns)
+                if not op(a, b):
+                    return False
+                a = b
+            return True
+
+        return False, evaluate
+
+    def compile_IfExp(self, node: ast.IfExp):
+        test = self.compile_fn(node.test)
+        body = self.compile_fn(node.body)
+        orelse = self.compile_fn(node.orelse)
+        return False, lambda ns: body(ns) if test(ns) else orelse(ns)
+
+    def compile_Call(self, node: ast.Call):
+        # only functions from the namespace can be called, never methods
+        if not isinstance(node.func, ast.Name):
+            raise UnsafeExpressionError(
+                "Only functions in the namespace can be called in expressions"
+            )
+        if any(isinstance(a, ast.Starred) for a in node.args) or any(
+            k.arg is None for k in node.keywords
+        ):
+            raise UnsafeExpressionError(
+                "* and ** unpacking aren't allowed in expressions"
+            )
+
+        func = self.compile_fn(node.func)
+        args = [self.compile_fn(a) for a in node.args]
+        kwargs = [(k.arg, self.compile_fn(k.value)) for k in node.keywords]
+
+        def evaluate(ns):
+            return func(ns)(*[a(ns) for a in args], **{k: v(ns) for k, v in kwargs})
+
+        return False, evaluate
+
+    def compile_Subscript(self, node: ast.Subscript):
+        return self.fold(operator.getitem, [node.value, node.slice])
+
+    def compile_Slice(self, node: ast.Slice):
+        parts = [
+            self.compile_fn(p) if p is not None else (lambda ns: None)
+            for p in (node.lower, node.upper, node.step)
+        ]
+        return False, lambda ns: slice(*[p(ns) for p in parts])
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_EXPRESSIONS)
+def _compile_safe(text: str):
+    # returns (fn, None), or (None, error) so that refusals are cached too
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        return None, ValueError(f"Couldn't parse expression '{text}': {e.msg}")
+
+    try:
+        return _Compiler().compile_fn(tree), None
+    except UnsafeExpressionError as e:
+        return None, e
+
+
+def compile_expression(text: str) -> Callable[[dict], Any]:
+    """
+    Compiles text into a function of a namespace, raising
+    UnsafeExpressionError if it uses anything the safe evaluator doesn't
+    support. Compiled expressions are cached by their text.
+    """
+    fn, error = _compile_safe(text)
+    if error is not None:
+        raise error
+    return fn
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_EXPRESSIONS)
+def _compile_unsafe(text: str):
+    return compile(text.strip(), "<pydra expression>", "eval")
+
+
+class Evaluator:
+    """
+    Evaluates the expressions in parenthesized override values, e.g.
+    "lr=(3e-4 * 2 ** -3)". Expressions may use literals, arithmetic,
+    comparisons, the math functions and constants in SAFE_NAMESPACE, and
+    any names passed in namespace. Attribute access, comprehensions and
+    the like are refused, unless unsafe is set, in which case such
+    expressions are passed to eval() instead.
+    """
+
+    def __init__(self, namespace: dict[str, Any] | None = None, unsafe: bool = False):
+        self.namespace = {**SAFE_NAMESPACE, **(namespace or {})}
+        self.unsafe = unsafe
+
+    def __repr__(self) -> str:
+        return f"Evaluator(unsafe={self.unsafe})"
+
+    def evaluate(self, text: str):
+        try:
+            compiled = compile_expression(text)
+        except UnsafeExpressionError:
+            if not self.unsafe:
+                raise
+            return eval(
+                _compile_unsafe(text), {"__builtins__": builtins, **self.namespace}
+            )
+
+        return compiled(self.namespace)
+
+
+DEFAULT_EVALUATOR = Evaluator()
@@ -0,0 +1,227 @@
+from pydra.arrays import is_array
+from pydra.config import (
+    _IMMUTABLE_TYPES,
+    _NODE_KINDS,
+    CONFIG,
+    MAPPING,
+    SEQUENCE,
+    WRAPPER,
+    Config,
+    _fields,
+    _set_fields,
+    node_kind,
+)
+from pydra.utils import WeakIdentityMap
+
+
+class FrozenConfigError(AttributeError, TypeError):
+    """Raised when modifying a frozen config, or a list, dict or wrapper in one."""
+
+
+def _raise_frozen(self, *args, **kwargs):
+    raise FrozenConfigError(f"Can't modify a {type(self).__name__}")
+
+
+class FrozenList(list):
+    """
+    A list that can't be modified, which frozen configs hold in place of
+    their lists. Unlike a tuple, it still compares equal to a list.
+    """
+
+    __slots__ = ()
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _raise_frozen
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _raise_frozen
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list.__repr__(self)})"
+
+
+class FrozenDict(dict):
+    """A dict that can't be modified, which frozen configs hold in place of their dicts."""
+
+    __slots__ = ()
+
+    pop = popitem = clear = update = setdefault = _raise_frozen
+    __setitem__ = __delitem__ = __ior__ = _raise_frozen
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+FROZEN_ATTR = "_pydra_frozen"
+
+# Config classes, mapped to the subclasses their instances become when frozen
+_FROZEN_CLASSES: dict[type, type] = {}
+
+# frozen configs that hold something that can't be fingerprinted (e.g. a
+# lambda), which are hashed and compared by identity instead
+_HASHED_BY_IDENTITY = WeakIdentityMap()
+
+
+def _frozen_digest(config) -> bytes | None:
+    """The fingerprint of a frozen config, or None if it can't have one."""
+    if _HASHED_BY_IDENTITY.get(config, False):
+        return None
+
+    from pydra.hashing import _digest
+
+    try:
+        return _digest(config, None, set())
+    except (TypeError, ValueError):
+        # frozen configs can't change, so this is only found out once
+        _HASHED_BY_IDENTITY[config] = True
+        return None
+
+
+def _frozen_setattr(self, name: str, value):
+    raise FrozenConfigError(
+        f"Can't assign to '{name}' of a frozen {type(self).__qualname__}"
+    )
+
+
+def _frozen_delattr(self, name: str):
+    raise FrozenConfigError(
+        f"Can't delete '{name}' of a frozen {type(self).__qualname__}"
+    )
+
+
+def _frozen_hash(self) -> int:
+    digest = _frozen_digest(self)
+    return object.__hash__(self) if digest is None else hash(digest)
+
+
+def _frozen_eq(self, other) -> bool:
+    if self is other:
+        return True
+    if type(other) is not type(self):
+        return NotImplemented
+
+    digest = _frozen_digest(self)
+    return digest is not None and digest == _frozen_digest(other)
+
+
+def _frozen_reduce_ex(self, protocol):
+    # the frozen class isn't importable, so pickle the original class and
+    # freeze on the way back in
+    return _new_frozen, (type(self).__bases__[0],), dict(_fields(self))
+
+
+def _frozen_setstate(self, state: dict):
+    _set_fields(self, state.items())
+
+
+def _new_frozen(cls: type):
+    frozen_cls = _frozen_class(cls)
+    return frozen_cls.__new__(frozen_cls)
+
+
+def _frozen_class(cls: type) -> type:
+    frozen_cls = _FROZEN_CLASSES.get(cls)
+    if frozen_cls is None:
+        # same name as cls, so that freezing doesn't change fingerprints,
+        # and no new slots, so that instances of cls can switch to it
+        frozen_cls = type(cls)(
+            cls.__name__,
+            (cls,),
+            {
+                "__slots__": (),
+                "__module__": cls.__module__,
+                "__qualname__": cls.__qualname__,
+                "__setattr__": _frozen_setattr,
+                "__delattr__": _frozen_delattr,
+                "__hash__": _frozen_hash,
+                "__eq__": _frozen_eq,
+                "__reduce_ex__": _frozen_reduce_ex,
+                "__setstate__": _frozen_setstate,
+                FROZEN_ATTR: True,
+            },
+        )
+        _FROZEN_CLASSES[cls] = frozen_cls
+    return frozen_cls
+
+
+def is_frozen(config: Config) -> bool:
+    return getattr(type(config), FROZEN_ATTR, False)
+
+
+def _freeze(value, memo: dict, pending: list):
+    # works out the frozen form of value without modifying anything, adding
+    # the changes that freezing makes in place to pending, so that nothing
+    # is frozen if anything can't be (see _apply_frozen)
+    t = type(value)
+    if t in _IMMUTABLE_TYPES:
+        return value
+
+    if id(value) in memo:
+        return memo[id(value)]
+
+    kind = _NODE_KINDS.get(t)
+    if kind is None:
+        kind = node_kind(t)
+
+    if kind == CONFIG:
+        memo[id(value)] = value
+        if not getattr(t, FROZEN_ATTR, False):
+            changed = []
+            for k, v in _fields(value).items():
+                frozen = _freeze(v, memo, pending)
+                if frozen is not v:
+                    changed.append((k, frozen))
+            pending.append((value, kind, (changed, _frozen_class(t))))
+        return value
+    elif kind == WRAPPER:
+        memo[id(value)] = value
+        if type(value.d) is not FrozenDict:
+            frozen = FrozenDict(
+                (k, _freeze(v, memo, pending)) for k, v in value.d.items()
+            )
+            pending.append((value, kind, frozen))
+        return value
+    elif kind == SEQUENCE:
+        items = [_freeze(x, memo, pending) for x in value]
+        unchanged = all(a is b for a, b in zip(items, value))
+        if unchanged and (t is FrozenList or not isinstance(value, list)):
+            new = value
+        elif isinstance(value, list):
+            new = FrozenList(items)
+        elif t is tuple:
+            new = tuple(items)
+        elif hasattr(t, "_make"):
+            new = t._make(items)
+        else:
+            new = t(items)
+    elif kind == MAPPING:
+        new = FrozenDict((k, _freeze(v, memo, pending)) for k, v in value.items())
+    else:
+        if is_array(value) and hasattr(value, "flags"):
+            pending.append((value, kind, None))
+        new = value
+
+    memo[id(value)] = new
+    return new
+
+
+def _apply_frozen(pending: list):
+    for node, kind, change in pending:
+        if kind == CONFIG:
+            changed, frozen_cls = change
+            _set_fields(node, changed)
+            node.__class__ = frozen_cls
+        elif kind == WRAPPER:
+            node.__dict__["d"] = change
+        else:
+            # numpy arrays
+            node.flags.writeable = False
@@ -0,0 +1,288 @@
+import dataclasses
+import hashlib
+import math
+import struct
+import sys
+import weakref
+from enum import Enum
+from operator import itemgetter
+from pathlib import PurePath
+from types import MethodType
+
+from pydra.config import (
+    CONFIG,
+    MAPPING,
+    SEQUENCE,
+    WRAPPER,
+    config_items,
+    node_kind,
+)
+from pydra.frozen import FrozenDict, FrozenList
+from pydra.utils import _FINGERPRINTS, REQUIRED, BaseWrapper
+
+DIGEST_SIZE = 16
+
+
+class FingerprintError(TypeError):
+    """Raised for a value that can't be fingerprinted, naming the field it's in."""
+
+    def __init__(self, reason: str, path: str = ""):
+        self.reason = reason
+        self.path = path
+        super().__init__(f"{path}: {reason}" if path else reason)
+
+
+_pack_len = struct.Struct("<Q").pack
+_pack_float = struct.Struct("<d").pack
+_CANONICAL_NAN = _pack_float(math.nan)
+
+_TYPE_NAMES: dict[type, bytes] = {}
+
+
+def _type_name(t: type) -> bytes:
+    name = _TYPE_NAMES.get(t)
+    if name is None:
+        name = f"{t.__module__}.{t.__qualname__}".encode()
+        name = _TYPE_NAMES[t] = _pack_len(len(name)) + name
+    return name
+
+
+def _encode_text(tag: bytes, value: str, out: list):
+    data = value.encode("utf-8", "surrogatepass")
+    out.append(tag)
+    out.append(_pack_len(len(data)))
+    out.append(data)
+
+
+def _encode_str(value: str, out: list):
+    _encode_text(b"s", value, out)
+
+
+def _encode_int(value: int, out: list):
+    _encode_text(b"i", str(value), out)
+
+
+def _encode_float(value: float, out: list):
+    out.append(b"f")
+    out.append(_CANONICAL_NAN if value != value else _pack_float(value))
+
+
+def _encode_bytes(value: bytes, out: list):
+    out.append(b"y")
+    out.append(_pack_len(len(value)))
+    out.append(bytes(value))
+
+
+# encoders for the exact types that make up most leaves, looked up before
+# anything else
+_LEAF_ENCODERS = {
+    str: _encode_str,
+    int: _encode_int,
+    float: _encode_float,
+    bool: lambda value, out: out.append(b"T" if value else b"F"),
+    type(None): lambda value, out: out.append(b"n"),
+    type(REQUIRED): lambda value, out: out.append(b"R"),
+    bytes: _encode_bytes,
+    bytearray: _encode_bytes,
+}
+
+
+def _encode_mapping(items, out: list, parent, active: set):
+    # entries are sorted by their encoded keys, so the order keys were
+    # inserted in doesn't matter
+    entries = []
+    for k, v in items:
+        key_out = []
+        _encode(k, key_out, parent, active)
+        value_out = []
+        _encode(v, value_out, parent, active)
+        entries.append((b"".join(key_out), value_out))
+    entries.sort(key=lambda entry: entry[0])
+
+    out.append(_pack_len(len(entries)))
+    for key, value_out in entries:
+        out.append(key)
+        out.extend(value_out)
+
+
+def _encode_fields(items, out: list, node, active: set):
+    # field names are unique strings, so can be sorted directly
+    items = sorted(items, key=itemgetter(0))
+    out.append(_pack_len(len(items)))
+    for k, v in items:
+        _encode_str(k, out)
+        try:
+            _encode(v, out, node, active)
+        except FingerprintError as e:
+            path = f"{k}.{e.path}" if e.path else k
+            raise FingerprintError(e.reason, path) from None
+
+
+def _importable_name(fn) -> str:
+    """
+    The module.qualname that fn can be imported by, which identifies it.
+    Raises TypeError for functions that can't be looked up by name (e.g.
+    lambdas and closures), since functions with the same name could then
+    differ.
+    """
+    module_name = getattr(fn, "__module__", None)
+    module = sys.modules.get(module_name) if module_name else None
+    obj = module
+    if obj is not None and "<" not in fn.__qualname__:
+        for part in fn.__qualname__.split("."):
+            obj = getattr(obj, part, None)
+    if obj is not fn:
+        raise FingerprintError(
+            f"Can't fingerprint {fn!r}, since it can't be imported by name "
+            "(e.g. it's a lambda or a closure)"
+        )
+    return f"{module_name}.{fn.__qualname__}"
+
+
+def _encode_other(value, t: type, out: list, parent, active: set):
+    if isinstance(value, Enum):
+        out.append(b"e")
+        out.append(_type_name(t))
+        _encode_str(value.name, out)
+    elif isinstance(value, (bool, int, float, str, bytes)):
+        # subclasses of the primitive types
+        out.append(b"v")
+        out.append(_type_name(t))
+        for base in (bool, int, float, str, bytes):
+            if isinstance(value, base):
+                _LEAF_ENCODERS[base](base(value), out)
+                break
+    elif isinstance(value, complex):
+        out.append(b"j")
+        _encode_float(value.real, out)
+        _encode_float(value.imag, out)
+    elif isinstance(value, PurePath):
+        out.append(b"p")
+        out.append(_type_name(t))
+        _encode_str(str(value), out)
+    elif isinstance(value, (set, frozenset)):
+        out.append(b"S")
+        out.append(_type_name(t))
+        elements = []
+        for x in value:
+            element_out = []
+            _encode(x, element_out, parent, active)
+            elements.append(b"".join(element_out))
+        elements.sort()
+        out.append(_pack_len(len(elements)))
+        out.extend(elements)
+    elif isinstance(value, type):
+        # classes and functions are identified by where they're defined
+        out.append(b"c")
+        out.append(_type_name(value))
+    elif isinstance(value, MethodType):
+        # bound methods are identified by their function and what it's bound
+        # to (e.g. a config, or a class for classmethods)
+        out.append(b"B")
+        _encode(value.__self__, out, parent, active)
+        _encode(value.__func__, out, parent, active)
+    elif callable(value) and hasattr(value, "__qualname__"):
+        _encode_text(b"F", _importable_name(value), out)
+    elif dataclasses.is_dataclass(value):
+        out.append(b"D")
+        out.append(_type_name(t))
+        _encode_mapping(
+            ((f.name, getattr(value, f.name)) for f in dataclasses.fields(value)),
+            out,
+            parent,
+            active,
+        )
+    elif hasattr(value, "model_dump"):
+        # pydantic models
+        out.append(b"M")
+        out.append(_type_name(t))
+        _encode_mapping(value.model_dump().items(), out, parent, active)
+    elif hasattr(value, "tobytes"):
+        # numpy arrays, array.array and friends, whose reprs are lossy
+        out.append(b"A")
+        out.append(_type_name(t))
+        dtype = getattr(value, "dtype", getattr(value, "typecode", ""))
+        _encode_str(str(dtype), out)
+        _encode_str(str(getattr(value, "shape", "")), out)
+        _encode_bytes(value.tobytes(), out)
+    else:
+        raise FingerprintError(
+            f"Can't fingerprint value of type {t.__qualname__}: {value!r}"
+        )
+
+
+def _encode(value, out: list, parent, active: set):
+    t = type(value)
+    encoder = _LEAF_ENCODERS.get(t)
+    if encoder is not None:
+        encoder(value, out)
+        return
+
+    kind = node_kind(t)
+    if kind == CONFIG or kind == WRAPPER:
+        out.append(b"N")
+        out.append(_digest(value, parent, active))
+    elif kind == SEQUENCE:
+        # frozen containers hash like what they were frozen from, so that
+        # freezing a config doesn't change its fingerprint
+        if t is FrozenList:
+            t = list
+        out.append(b"L" if t is list else b"U" if t is tuple else b"Q")
+        if t is not list and t is not tuple:
+            out.append(_type_name(t))
+        out.append(_pack_len(len(value)))
+        for x in value:
+            _encode(x, out, parent, active)
+    elif kind == MAPPING:
+        if t is FrozenDict:
+            t = dict
+        out.append(b"d" if t is dict else b"m")
+        if t is not dict:
+            out.append(_type_name(t))
+        _encode_mapping(value.items(), out, parent, active)
+    else:
+        _encode_other(value, t, out, parent, active)
+
+
+def _digest(node, parent, active: set) -> bytes:
+    memo = _FINGERPRINTS.get(node)
+
+    if memo is None:
+        if id(node) in active:
+            raise ValueError(
+                f"Can't fingerprint a config tree containing a cycle (through {type(node).__qualname__})"
+            )
+        active.add(id(node))
+
+        out = []
+        if isinstance(node, BaseWrapper):
+            out.append(b"W")
+            out.append(_type_name(type(node)))
+            out.append(_type_name(node.wrapped_type))
+            items = node.d.items()
+        else:
+            out.append(b"C")
+            out.append(_type_name(type(node)))
+            items = config_items(node)
+        _encode_fields(items, out, node, active)
+
+        active.discard(id(node))
+        digest = hashlib.blake2b(b"".join(out), digest_size=DIGEST_SIZE).digest()
+        memo = [digest, {}]
+        _FINGERPRINTS[node] = memo
+
+    if parent is not None:
+        # so that invalidating this node also invalidates the parent
+        memo[1][id(parent)] = weakref.ref(parent)
+
+    return memo[0]
+
+
+def digest(node) -> bytes:
+    """The raw fingerprint of a Config or wrapper, as bytes."""
+    return _digest(node, None, set())
+
+
+def fingerprint(node) -> str:
+    """The fingerprint of a Config or wrapper, as a hex string."""
+    return digest(node).hex()
@@ -0,0 +1,117 @@
+import contextlib
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# The kinds of events observers receive, and what key/value/old_value hold:
+#   before_assign / after_assign: the override key, the new value (after any
+#       casting, for after_assign) and the value it replaces
+#   coerce: the override key, the value after and (as old_value) before the
+#       config's annotation cast it
+#   before_method_call / after_method_call: the method's key and (args, kwargs)
+#   enforce_required: "" and the root config, once its required values pass
+#   before_finalize / after_finalize: the config's path and the config
+EVENT_KINDS = (
+    "before_assign",
+    "after_assign",
+    "coerce",
+    "before_method_call",
+    "after_method_call",
+    "enforce_required",
+    "before_finalize",
+    "after_finalize",
+)
+
+
+@dataclass
+class Event:
+    kind: str
+    key: str
+    value: Any = None
+    old_value: Any = None
+
+
+Observer = Callable[[Event], None]
+
+# A tuple (replaced rather than mutated) so that pydra can check it once
+# per apply/finalize and keep using that snapshot, instead of checking
+# before every event.
+OBSERVERS: tuple[Observer, ...] = ()
+
+
+def add_observer(observer: Observer):
+    global OBSERVERS
+    OBSERVERS = OBSERVERS + (observer,)
+
+
+def remove_observer(observer: Observer):
+    global OBSERVERS
+    observers = list(OBSERVERS)
+    observers.remove(observer)
+    OBSERVERS = tuple(observers)
+
+
+@contextlib.contextmanager
+def observe(*observers: Observer):
+    """
+    Registers observers for the duration of the block, flushing any that
+    buffer events (like BatchingSink) at the end.
+    """
+    for observer in observers:
+        add_observer(observer)
+    try:
+        yield
+    finally:
+        for observer in observers:
+            remove_observer(observer)
+            flush = getattr(observer, "flush", None)
+            if flush is not None:
+                flush()
+
+
+def emit(
+    observers: tuple[Observer, ...], kind: str, key: str, value=None, old_value=None
+):
+    if not observers:
+        return
+    event = Event(kind, key, value, old_value)
+    for observer in observers:
+        observer(event)
+
+
+class BatchingSink:
+    """
+    An observer that buffers events and delivers them to sink as lists of
+    up to batch_size events, e.g. to send them to a telemetry service in
+    bulk. Only events whose kind is in kinds are kept, if it's given. Call
+    flush() to deliver a partial batch (observe() does so automatically).
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[list[Event]], None],
+        batch_size: int = 100,
+        kinds: list[str] | None = None,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, but got {batch_size}")
+        if kinds is not None:
+            unknown = set(kinds) - set(EVENT_KINDS)
+            if unknown:
+                raise ValueError(f"Unknown event kinds: {sorted(unknown)}")
+
+        self.sink = sink
+        self.batch_size = batch_size
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self._buffer: list[Event] = []
+
+    def __call__(self, event: Event):
+        if self.kinds is not None and event.kind not in self.kinds:
+            return
+        self._buffer.append(event)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self.sink(batch)
@@ -0,0 +1,166 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+class InterpolationError(ValueError):
+    """Raised when a reference can't be resolved, or references form a cycle."""
+
+
+@dataclass(frozen=True)
+class Ref:
+    """
+    A reference to another value in the config tree, by its dotted path
+    from the root config (e.g. Ref("model.dim")), which is replaced by that
+    value when the tree is finalized, i.e. after overrides are applied.
+    Strings containing "${model.dim}"-style references work the same way
+    ("$${" is a literal "${").
+    """
+
+    path: str
+
+    def __str__(self) -> str:
+        return "${" + self.path + "}"
+
+
+@dataclass(frozen=True)
+class Template:
+    # the text around each reference (so one more than there are paths,
+    # with escapes replaced), or None for strings that are exactly one
+    # reference, which resolve to the referenced value itself rather than
+    # to a string
+    parts: tuple[str, ...] | None
+    paths: tuple[str, ...]
+
+
+ESCAPE = "$${"
+# either an escaped "${" or a reference
+_TOKEN = re.compile(r"\$\$\{|\$\{([\w.]+)\}")
+
+# template strings, mapped to their compiled templates (or None, for
+# strings without any references)
+_TEMPLATES: dict[str, Template | None] = {}
+_MAX_CACHED_TEMPLATES = 4096
+
+
+def compile_template(text: str) -> Template | None:
+    """
+    Finds the ${path} references in text, returning None if there aren't
+    any (or escapes, which templates without paths unescape). Compiled
+    once per string, since the same templates are resolved again for every
+    config they're defaults of.
+    """
+    try:
+        return _TEMPLATES[text]
+    except KeyError:
+        pass
+
+    parts = []
+    paths = []
+    text_start = 0
+    piece = ""
+    for match in _TOKEN.finditer(text):
+        piece += text[text_start : match.start()]
+        text_start = match.end()
+        if match.group(1) is None:
+            piece += "${"
+        else:
+            parts.append(piece)
+            paths.append(match.group(1))
+            piece = ""
+    parts.append(piece + text[text_start:])
+
+    if text_start == 0:
+        template = None
+    elif parts == ["", ""]:
+        template = Template(None, tuple(paths))
+    else:
+        template = Template(tuple(parts), tuple(paths))
+
+    if len(_TEMPLATES) >= _MAX_CACHED_TEMPLATES:
+        _TEMPLATES.clear()
+    _TEMPLATES[text] = template
+    return template
+
+
+def referenced_paths(value) -> tuple[str, ...] | None:
+    """The paths that value refers to, or None if it isn't a Ref or template."""
+    t = type(value)
+    if t is Ref:
+        return (value.path,)
+    elif t is str and "${" in value:
+        template = compile_template(value)
+        if template is not None:
+            return template.paths
+    return None
+
+
+def is_reference(value) -> bool:
+    return referenced_paths(value) is not None
+
+
+def evaluate(value, lookup: Callable[[str], Any]):
+    """Resolves a Ref or template, using lookup to get the values of paths."""
+    if type(value) is Ref:
+        return lookup(value.path)
+
+    template = compile_template(value)
+    if template.parts is None:
+        return lookup(template.paths[0])
+
+    pieces = [template.parts[0]]
+    for path, text in zip(template.paths, template.parts[1:]):
+        pieces.append(str(lookup(path)))
+        pieces.append(text)
+    return "".join(pieces)
+
+
+def resolution_order(sites: dict[str, tuple[str, ...]]) -> list[str]:
+    """
+    Sorts the paths of references (mapped to the paths they refer to) so
+    that each comes after every reference it depends on: one at a path it
+    refers to, beneath it (since the referenced value contains it) or
+    above it (since the path is reached through it). Raises
+    InterpolationError if references depend on each other in a cycle.
+    """
+    # every path that references are beneath, mapped to those references
+    beneath: dict[str, list[str]] = {}
+    for site in sites:
+        prefix, _, _ = site.rpartition(".")
+        while prefix:
+            beneath.setdefault(prefix, []).append(site)
+            prefix, _, _ = prefix.rpartition(".")
+
+    def dependencies(site: str):
+        for path in sites[site]:
+            yield from beneath.get(path, ())
+            while path:
+                if path in sites:
+                    yield path
+                path, _, _ = path.rpartition(".")
+
+    order = []
+    done = set()
+    # the references currently being visited, in the order they were reached
+    visiting: dict[str, None] = {}
+
+    def visit(site: str):
+        visiting[site] = None
+        for dependency in dependencies(site):
+            if dependency in done:
+                continue
+            if dependency in visiting:
+                cycle = list(visiting)
+                cycle = cycle[cycle.index(dependency) :] + [dependency]
+                raise InterpolationError(
+                    f"References form a cycle: {' -> '.join(cycle)}"
+                )
+            visit(dependency)
+        del visiting[site]
+        done.add(site)
+        order.append(site)
+
+    for site in sites:
+        if site not in done:
+            visit(site)
+    return order
@@ -0,0 +1,91 @@
+import inspect
+from typing import Any, Callable
+
+# whether any class has declared a Lazy field, so that finalizing can skip
+# looking for unresolved ones until then
+DECLARED = False
+
+
+class Lazy:
+    """
+    Declares a config field (in the class body) whose default is built by
+    factory the first time the field is read, or when the config is
+    finalized, whichever comes first. If an override assigns the field
+    before then, factory never runs. factory is called with the config if
+    it takes an argument, and with nothing otherwise.
+    """
+
+    __slots__ = ("factory", "name", "takes_config")
+
+    def __init__(self, factory: Callable[..., Any]):
+        self.factory = factory
+        self.name = None
+        self.takes_config = _takes_argument(factory)
+
+    def __set_name__(self, owner: type, name: str):
+        global DECLARED
+        DECLARED = True
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        value = self.factory(instance) if self.takes_config else self.factory()
+        # stored on the instance, which (since this isn't a data descriptor)
+        # shadows this descriptor from then on
+        setattr(instance, self.name, value)
+        return value
+
+    def __repr__(self) -> str:
+        name = getattr(self.factory, "__qualname__", repr(self.factory))
+        return f"Lazy({name})"
+
+
+def _takes_argument(factory: Callable) -> bool:
+    try:
+        parameters = inspect.signature(factory).parameters.values()
+    except (TypeError, ValueError):
+        # e.g. some builtins
+        return False
+    return any(
+        p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) and p.default is p.empty
+        for p in parameters
+    )
+
+
+_LAZY_FIELDS: dict[type, tuple[str, ...]] = {}
+
+
+def lazy_fields(cls: type) -> tuple[str, ...]:
+    """The names of the Lazy fields declared by cls (or inherited from its bases)."""
+    names = _LAZY_FIELDS.get(cls)
+    if names is None:
+        found = {}
+        for c in reversed(cls.__mro__):
+            for k, v in c.__dict__.items():
+                if isinstance(v, Lazy):
+                    found[k] = None
+                else:
+                    # overridden by a subclass
+                    found.pop(k, None)
+        names = _LAZY_FIELDS[cls] = tuple(found)
+    return names
+
+
+def has_attr(obj, name: str) -> bool:
+    """hasattr(obj, name), without running the factory of an unresolved Lazy field."""
+    return isinstance(getattr(type(obj), name, None), Lazy) or hasattr(obj, name)
+
+
+def peek_attr(obj, name: str, default=None):
+    """
+    getattr(obj, name, default), except that an unresolved Lazy field
+    returns its Lazy instead of running its factory.
+    """
+    lazy = getattr(type(obj), name, None)
+    if isinstance(lazy, Lazy):
+        d = getattr(obj, "__dict__", None)
+        if d is None or name not in d:
+            return lazy
+    return getattr(obj, name, default)
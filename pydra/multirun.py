@@ -0,0 +1,195 @@
+import itertools
+import os
+import pickle
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from pydra.parser import (
+    ARG_FILE_PREFIX,
+    expand_arg_files,
+    is_list_start,
+    split_top_level,
+)
+
+
+@dataclass
+class MultirunResult:
+    index: int
+    args: list[str]
+    result: Any = None
+    error: BaseException | None = None
+    traceback: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class MultirunError(Exception):
+    """
+    Raised once every run in a sweep has finished, if any of them failed.
+    All results (successful or not) are available on .results.
+    """
+
+    def __init__(self, results: list[MultirunResult]):
+        self.results = results
+        self.failures = [r for r in results if not r.ok]
+
+        lines = [f"{len(self.failures)} of {len(results)} runs failed:"]
+        for r in self.failures:
+            lines.append(
+                f"  [{r.index}] {' '.join(r.args)}: {type(r.error).__name__}: {r.error}"
+            )
+        super().__init__("\n".join(lines))
+
+
+def sweep_choices(args: list[str]) -> list[list[str]]:
+    """
+    For each arg, the list of alternatives it contributes to the sweep.
+    Assignments like "x=1,2,3" expand to ["x=1", "x=2", "x=3"]; every
+    other arg (flags, method calls, --list/--in blocks) is kept as-is.
+    """
+    choices = []
+    in_list = False
+
+    for arg in args:
+        if is_list_start(arg):
+            in_list = True
+        elif arg == "list--":
+            in_list = False
+
+        if in_list or arg.startswith((".", "-")) or "=" not in arg:
+            choices.append([arg])
+            continue
+
+        key, value = arg.split("=", 1)
+        choices.append([f"{key}={v}" for v in split_top_level(value)])
+
+    return choices
+
+
+def expand_sweep(args: list[str]) -> Iterator[list[str]]:
+    """
+    Lazily yields the args for each point in the sweep's Cartesian product.
+    Argument files are expanded up front, since they may contain sweeps.
+    """
+    # args that start with "@" after expansion were escaped, so keep them
+    # escaped for the run that parses them again (other than list values,
+    # which are never expanded)
+    expanded = []
+    in_list = False
+    for arg in expand_arg_files(args):
+        if in_list:
+            in_list = arg != "list--"
+        elif is_list_start(arg):
+            in_list = True
+        elif arg.startswith(ARG_FILE_PREFIX):
+            arg = ARG_FILE_PREFIX + arg
+        expanded.append(arg)
+    args = expanded
+    for point in itertools.product(*sweep_choices(args)):
+        yield list(point)
+
+
+def _run_point_safely(
+    fn: Callable, config_t: type, args: list[str], cache=None, evaluator=None
+):
+    from pydra.cli import _apply_overrides_and_call
+
+    try:
+        result = _apply_overrides_and_call(fn, config_t, args, cache, evaluator)
+        return True, result, None
+    except Exception as e:
+        tb = traceback.format_exc()
+        try:
+            pickle.dumps(e)
+        except Exception:
+            e = RuntimeError(f"{type(e).__name__}: {e}")
+        return False, e, tb
+
+
+def run_multirun(
+    fn: Callable,
+    config_t: type,
+    args: list[str],
+    jobs: int | None = None,
+    cache=None,
+    evaluator=None,
+) -> list[MultirunResult]:
+    """
+    Runs fn once per point in the sweep described by args, using a pool
+    of `jobs` processes (defaulting to the number of CPUs). Results are
+    returned in sweep order. Failed runs don't stop the others; if any
+    failed, a MultirunError holding every result is raised at the end.
+    With a ResultCache, points whose config was already computed are
+    returned from the cache.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    results = []
+    points = enumerate(expand_sweep(args))
+
+    def record(index, point_args, outcome):
+        ok, value, tb = outcome
+        if ok:
+            results.append(MultirunResult(index=index, args=point_args, result=value))
+        else:
+            results.append(
+                MultirunResult(index=index, args=point_args, error=value, traceback=tb)
+            )
+
+    if jobs == 1:
+        for index, point_args in points:
+            record(
+                index,
+                point_args,
+                _run_point_safely(fn, config_t, point_args, cache, evaluator),
+            )
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        # only keep a bounded number of points in flight, so huge sweeps
+        # are never fully materialized
+        max_in_flight = jobs * 2
+        in_flight = deque()
+
+        def collect_oldest():
+            index, point_args, future = in_flight.popleft()
+            try:
+                outcome = future.result()
+            except Exception as e:
+                # e.g. the worker process died or the result couldn't be pickled
+                outcome = (False, e, traceback.format_exc())
+            record(index, point_args, outcome)
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for index, point_args in points:
+                try:
+                    future = executor.submit(
+                        _run_point_safely, fn, config_t, point_args, cache, evaluator
+                    )
+                except BrokenProcessPool as e:
+                    # a worker died, so nothing more can be submitted: the
+                    # points in flight fail with it, and so do the rest
+                    while in_flight:
+                        collect_oldest()
+                    tb = traceback.format_exc()
+                    record(index, point_args, (False, e, tb))
+                    for index, point_args in points:
+                        record(index, point_args, (False, e, tb))
+                    break
+                in_flight.append((index, point_args, future))
+                if len(in_flight) >= max_in_flight:
+                    collect_oldest()
+
+            while in_flight:
+                collect_oldest()
+
+    if any(not r.ok for r in results):
+        raise MultirunError(results)
+
+    return results
@@ -0,0 +1,130 @@
+import time
+from typing import Any
+
+import pydra.hooks
+from pydra.profile import NodeTiming
+
+# the ParallelFinalize that finalizing currently uses, if any
+ACTIVE: "ParallelFinalize | None" = None
+
+
+class FinalizeError(Exception):
+    """
+    Raised by a parallel finalize once every config that could be finalized
+    has been, if any finalize() raised. .errors lists the (path, exception)
+    of each failure, and .skipped the paths of the configs above them,
+    which weren't finalized.
+    """
+
+    def __init__(self, errors: list[tuple[str, BaseException]], skipped: list[str]):
+        self.errors = errors
+        self.skipped = skipped
+
+        lines = [f"{len(errors)} finalize() calls failed:"]
+        for path, error in errors:
+            lines.append(f"  {path or '<root>'}: {type(error).__name__}: {error}")
+        if skipped:
+            lines.append(
+                f"  (so {', '.join(p or '<root>' for p in skipped)} weren't finalized)"
+            )
+        super().__init__("\n".join(lines))
+
+
+class ParallelFinalize:
+    """
+    Finalizes configs on a pool of max_workers threads while in this block
+    (e.g. around pydra.run or apply_overrides), so that sibling configs
+    whose finalize()s load files or wait on I/O do so concurrently. Every
+    config is still finalized after all of the configs beneath it. The
+    time each finalize() took is recorded in .timings (and by an active
+    Profiler). If any raise, the rest are still finalized (other than the
+    configs above them), and then a FinalizeError is raised.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, but got {max_workers}")
+        self.max_workers = max_workers
+        self.timings: list[NodeTiming] = []
+        self._previous = None
+        self._executor = None
+
+    def __enter__(self) -> "ParallelFinalize":
+        global ACTIVE
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix="pydra-finalize"
+        )
+        self._previous, ACTIVE = ACTIVE, self
+        return self
+
+    def __exit__(self, *exc):
+        global ACTIVE
+        ACTIVE = self._previous
+        self._executor.shutdown()
+        self._executor = None
+
+    def finalize(
+        self,
+        tasks: list[tuple[str, Any]],
+        parents: list[list[int]],
+        profiler,
+        observers: tuple,
+    ):
+        """
+        Finalizes each (path, config) in tasks, once every task listing it
+        in parents (by index) has been finalized.
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        emit = pydra.hooks.emit
+        waiting_on = [0] * len(tasks)
+        for above in parents:
+            for i in above:
+                waiting_on[i] += 1
+
+        running = {}
+
+        def submit(i: int):
+            path, node = tasks[i]
+            # events are emitted from this thread, so observers needn't be
+            # thread safe
+            emit(observers, "before_finalize", path, node)
+            running[self._executor.submit(_timed_finalize, node)] = i
+
+        for i, count in enumerate(waiting_on):
+            if count == 0:
+                submit(i)
+
+        errors = []
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i = running.pop(future)
+                path, node = tasks[i]
+                error = future.exception()
+                if error is not None:
+                    errors.append((path, error))
+                    continue
+
+                timing = NodeTiming(path, "finalize", future.result())
+                self.timings.append(timing)
+                if profiler is not None:
+                    profiler.nodes.append(timing)
+                emit(observers, "after_finalize", path, node)
+
+                for above in parents[i]:
+                    waiting_on[above] -= 1
+                    if waiting_on[above] == 0:
+                        submit(above)
+
+        if errors:
+            skipped = [path for (path, _), count in zip(tasks, waiting_on) if count > 0]
+            raise FinalizeError(errors, skipped) from errors[0][1]
+
+
+def _timed_finalize(node) -> float:
+    start = time.perf_counter()
+    node.finalize()
+    return time.perf_counter() - start
@@ -1,6 +1,15 @@
+import array
 import ast
+import mmap
+import os
 from dataclasses import dataclass, field
-from typing import Any, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Union
+
+from pydra.arrays import LIST_DTYPES
+
+if TYPE_CHECKING:
+    from pydra.expr import Evaluator
 
 
 @dataclass
@@ -21,26 +30,35 @@ class Assignment:
     kv_pair: KeyValuePair
 
 
+SHOW_FORMATS = ("yaml", "json")
+
+
 @dataclass
 class ParseResult:
     show: bool
     commands: list[Union[Assignment, MethodCall]]
+    show_format: str = "yaml"
 
 
 def is_surrounded_by(value: str, left: str, right: str):
     return value.startswith(left) and value.endswith(right)
 
 
-def parse_value(value: str):
+def parse_value(value: str, evaluator: "Evaluator | None" = None):
     # Handle boolean shortcuts
     if value == "T":
         return True
     elif value == "F":
         return False
 
-    # Handle expressions in parentheses using eval.
+    # Handle expressions in parentheses (see pydra.expr).
     elif is_surrounded_by(value, "(", ")"):
-        return eval(value[1:-1])
+        if evaluator is None:
+            # imported on first use, to keep importing pydra fast
+            from pydra.expr import DEFAULT_EVALUATOR
+
+            evaluator = DEFAULT_EVALUATOR
+        return evaluator.evaluate(value[1:-1])
     else:
         try:
             return ast.literal_eval(value)
@@ -56,13 +74,92 @@ def parse_value(value: str):
             return value
 
 
+def split_top_level(value: str, sep: str = ",") -> list[str]:
+    """
+    Splits value on sep, ignoring separators that are nested inside
+    brackets or quotes, e.g. "1,[2,3],'a,b'" -> ["1", "[2,3]", "'a,b'"].
+    """
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+
+    for i, ch in enumerate(value):
+        if quote is not None:
+            if ch == quote and value[i - 1] != "\\":
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(value[start:i])
+            start = i + 1
+
+    parts.append(value[start:])
+    return parts
+
+
+@dataclass
+class LauncherArgs:
+    multirun: bool = False
+    jobs: int | None = None
+    profile: bool = False
+    # where to dump cProfile stats, from --pydra-profile=path
+    profile_path: str | None = None
+
+
+def extract_launcher_args(args: list[str]) -> tuple[LauncherArgs, list[str]]:
+    """
+    Pulls out the flags that control how the entry point is launched
+    (--multirun, -j/--jobs N, --pydra-profile[=path]), which aren't
+    overrides themselves.
+    """
+    launcher_args = LauncherArgs()
+    remaining = []
+    index = 0
+
+    while index < len(args):
+        arg = args[index]
+        if arg == "--multirun":
+            launcher_args.multirun = True
+        elif arg == "--pydra-profile":
+            launcher_args.profile = True
+        elif arg.startswith("--pydra-profile="):
+            launcher_args.profile = True
+            launcher_args.profile_path = arg[len("--pydra-profile=") :]
+        elif arg in ("-j", "--jobs"):
+            if index + 1 >= len(args):
+                raise ValueError(f"Expected a number of jobs after '{arg}'")
+            try:
+                launcher_args.jobs = int(args[index + 1])
+            except ValueError:
+                raise ValueError(
+                    f"Expected a number of jobs after '{arg}', but got '{args[index + 1]}'"
+                )
+            if launcher_args.jobs < 1:
+                raise ValueError(
+                    f"Number of jobs must be at least 1, but got {launcher_args.jobs}"
+                )
+            index += 1
+        else:
+            remaining.append(arg)
+        index += 1
+
+    return launcher_args, remaining
+
+
 def scope_key(scope: list[str], key: str):
     if len(scope) == 0:
         return key
     return ".".join(scope + [key])
 
 
-def parse_kv_pair(kv_pair_arg: str, scope: list[str]) -> KeyValuePair:
+def parse_kv_pair(
+    kv_pair_arg: str, scope: list[str], evaluator: "Evaluator | None" = None
+) -> KeyValuePair:
     """Parse a string of the form 'key=value'"""
     try:
         equals_pos = kv_pair_arg.index("=")
@@ -70,74 +167,199 @@ def parse_kv_pair(kv_pair_arg: str, scope: list[str]) -> KeyValuePair:
         value = kv_pair_arg[equals_pos + 1 :]
     except ValueError:
         raise ValueError(f"Couldn't parse into key-value pair: '{kv_pair_arg}")
-    return KeyValuePair(scope_key(scope=scope, key=key), value=parse_value(value))
+    return KeyValuePair(
+        scope_key(scope=scope, key=key), value=parse_value(value, evaluator)
+    )
 
 
-def parse(args) -> ParseResult:
-    current_scope = []
-    show = False
-    index = 0
+def parse_typed_list(
+    tokens: list[str], dtype: str, evaluator: "Evaluator | None" = None
+) -> array.array:
+    """
+    Parses the values of a "--list:<dtype>" block into an array.array,
+    converting all of them in one pass when they're plain numbers.
+    """
+    typecode = LIST_DTYPES[dtype]
+    convert = float if typecode in "fd" else int
 
-    commands = []
+    try:
+        return array.array(typecode, map(convert, tokens))
+    except (ValueError, OverflowError):
+        pass
 
-    while index < len(args):
-        arg = args[index]
-        if arg == "--show":
-            show = True
-        elif arg == "--list":
-            assert args[index + 1] != "list--"
+    # mixed tokens, e.g. "1e3", "T" or "(2 ** 10)"
+    values = [parse_value(t, evaluator) for t in tokens]
+    try:
+        return array.array(typecode, values)
+    except (TypeError, OverflowError) as e:
+        raise ValueError(f"Couldn't store --list:{dtype} values as {dtype}: {e}")
 
-            key = args[index + 1]
-            index += 2
 
-            list_args = []
-            while args[index] != "list--":
-                list_args.append(parse_value(args[index]))
-                index += 1
+ARG_FILE_PREFIX = "@"
 
-            commands.append(Assignment(kv_pair=KeyValuePair(key=key, value=list_args)))
 
-        elif arg == "--in":
-            current_scope.append(args[index + 1])
-            index += 1
-        elif arg == "in--":
-            current_scope.pop()
-        elif arg.startswith("."):
-            if "(" not in arg:
-                commands.append(MethodCall(method_name=arg[1:]))
-            else:
-                pos_left_paren = arg.index("(")
-                pos_right_paren = arg.index(")")
-                method_name = arg[1:pos_left_paren]
-                method_contents_string = arg[pos_left_paren + 1 : pos_right_paren]
-                method_contents = method_contents_string.split(",")
-
-                method_args = []
-                method_kwargs = {}
-
-                for cont in method_contents:
-                    if "=" in cont:
-                        kv_pair_parsed = parse_kv_pair(cont, scope=[])
-                        method_kwargs[kv_pair_parsed.key] = kv_pair_parsed.value
-                    else:
-                        if len(method_kwargs) > 0:
-                            raise ValueError(
-                                f"Positional argument {cont} after keyword arguments (for method {method_name}, args {method_contents_string})"
-                            )
-                        method_args.append(parse_value(cont))
-
-                commands.append(
-                    MethodCall(
-                        method_name=method_name, args=method_args, kwargs=method_kwargs
+def _read_arg_file(path: Path) -> Iterator[str]:
+    """
+    Yields the args in an argument file (one per line, ignoring blank
+    lines), memory-mapping it rather than reading it all in at once. Only
+    line endings are stripped, so whitespace within values is kept.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                arg = line.decode("utf-8").rstrip("\r\n")
+                if arg and not arg.isspace():
+                    yield arg
+
+
+def is_list_start(arg: str) -> bool:
+    return arg == "--list" or arg.startswith("--list:")
+
+
+def expand_arg_files(
+    args: Iterable[str],
+    _including: tuple[Path, ...] = (),
+    _in_list: list[bool] | None = None,
+) -> Iterator[str]:
+    """
+    Lazily replaces each "@path" arg with the args in that file. Files can
+    include other files, with relative paths resolved against the including
+    file's directory. Use "@@" for an arg that starts with a literal "@".
+    Args inside --list blocks are list values, so they're kept as they are.
+    """
+    if _in_list is None:
+        # shared with included files, since blocks can span files
+        _in_list = [False]
+
+    for arg in args:
+        if _in_list[0]:
+            if arg == "list--":
+                _in_list[0] = False
+            yield arg
+        elif not arg.startswith(ARG_FILE_PREFIX) or len(arg) == 1:
+            if is_list_start(arg):
+                _in_list[0] = True
+            yield arg
+        elif arg.startswith(ARG_FILE_PREFIX * 2):
+            yield arg[1:]
+        else:
+            path = Path(arg[1:])
+            if _including:
+                path = _including[-1].parent / path
+            path = path.resolve()
+
+            if path in _including:
+                raise ValueError(f"Argument file '{path}' includes itself")
+
+            yield from expand_arg_files(
+                _read_arg_file(path), _including + (path,), _in_list
+            )
+
+
+class CommandStream:
+    """
+    Parses args (expanding argument files) into commands lazily, as it's
+    iterated over, so huge override sets never need to be held in memory
+    at once. show and show_format are set once they've been seen.
+    """
+
+    def __init__(self, args: Iterable[str], evaluator: "Evaluator | None" = None):
+        self.args = args
+        self.evaluator = evaluator
+        self.show = False
+        self.show_format = "yaml"
+
+    def __iter__(self) -> Iterator[Union[Assignment, MethodCall]]:
+        evaluator = self.evaluator
+        args = expand_arg_files(self.args)
+        current_scope = []
+
+        for arg in args:
+            if arg == "--show":
+                self.show = True
+            elif arg.startswith("--show="):
+                self.show = True
+                self.show_format = arg[len("--show=") :]
+                if self.show_format not in SHOW_FORMATS:
+                    raise ValueError(
+                        f"Unknown --show format '{self.show_format}', expected one of {list(SHOW_FORMATS)}"
                     )
+            elif is_list_start(arg):
+                dtype = arg[len("--list:") :] if arg != "--list" else None
+                if dtype is not None and dtype not in LIST_DTYPES:
+                    raise ValueError(
+                        f"Unknown --list dtype '{dtype}', expected one of {list(LIST_DTYPES)}"
+                    )
+
+                key = next(args, "list--")
+                if key == "list--":
+                    raise ValueError(f"Expected a key after '{arg}'")
+
+                list_args = []
+                for list_arg in args:
+                    if list_arg == "list--":
+                        break
+                    list_args.append(list_arg)
+                else:
+                    raise ValueError(f"Missing 'list--' after '{arg} {key}'")
+
+                if dtype is None:
+                    value = [parse_value(a, evaluator) for a in list_args]
+                else:
+                    value = parse_typed_list(list_args, dtype, evaluator)
+
+                yield Assignment(kv_pair=KeyValuePair(key=key, value=value))
+
+            elif arg == "--in":
+                scope = next(args, None)
+                if scope is None:
+                    raise ValueError("Expected a key after '--in'")
+                current_scope.append(scope)
+            elif arg == "in--":
+                current_scope.pop()
+            elif arg.startswith("."):
+                yield parse_method_call(arg, evaluator)
+            else:
+                yield Assignment(
+                    kv_pair=parse_kv_pair(arg, current_scope, evaluator),
                 )
 
+
+def parse_method_call(arg: str, evaluator: "Evaluator | None" = None) -> MethodCall:
+    if "(" not in arg:
+        return MethodCall(method_name=arg[1:])
+
+    pos_left_paren = arg.index("(")
+    pos_right_paren = arg.index(")")
+    method_name = arg[1:pos_left_paren]
+    method_contents_string = arg[pos_left_paren + 1 : pos_right_paren]
+    method_contents = method_contents_string.split(",")
+
+    method_args = []
+    method_kwargs = {}
+
+    for cont in method_contents:
+        if "=" in cont:
+            kv_pair_parsed = parse_kv_pair(cont, scope=[], evaluator=evaluator)
+            method_kwargs[kv_pair_parsed.key] = kv_pair_parsed.value
         else:
-            commands.append(
-                Assignment(
-                    kv_pair=parse_kv_pair(arg, current_scope),
+            if len(method_kwargs) > 0:
+                raise ValueError(
+                    f"Positional argument {cont} after keyword arguments (for method {method_name}, args {method_contents_string})"
                 )
-            )
+            method_args.append(parse_value(cont, evaluator))
 
-        index += 1
-    return ParseResult(show=show, commands=commands)
+    return MethodCall(method_name=method_name, args=method_args, kwargs=method_kwargs)
+
+
+def parse(args, evaluator: "Evaluator | None" = None) -> ParseResult:
+    stream = CommandStream(args, evaluator)
+    commands = list(stream)
+    return ParseResult(
+        show=stream.show,
+        commands=commands,
+        show_format=stream.show_format,
+    )
@@ -0,0 +1,101 @@
+import contextlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+# the profiler that pydra is currently reporting to, if any
+ACTIVE: "Profiler | None" = None
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+@dataclass
+class NodeTiming:
+    # e.g. "model.encoder" (or "" for the root config)
+    path: str
+    # "finalize" or "method" (a method call override)
+    kind: str
+    seconds: float
+
+
+class Profiler:
+    """
+    Times each phase of parsing and applying overrides (and calling the
+    entry point), along with every finalize() and method call override.
+    Use as a context manager around pydra.run/apply_overrides etc. If
+    stats_path is given, the whole block is also run under cProfile, and
+    its stats are dumped there (e.g. for snakeviz or pstats).
+    """
+
+    def __init__(self, stats_path: str | Path | None = None):
+        self.phases: dict[str, float] = {}
+        self.nodes: list[NodeTiming] = []
+        self.stats_path = stats_path
+        self._previous = None
+        self._cprofile = None
+
+    def __enter__(self) -> "Profiler":
+        global ACTIVE
+        self._previous, ACTIVE = ACTIVE, self
+
+        if self.stats_path is not None:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        global ACTIVE
+        ACTIVE = self._previous
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.stats_path)
+            self._cprofile = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Adds the time spent in the block to the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    @contextlib.contextmanager
+    def node(self, path: str, kind: str):
+        """Records the time spent in the block against a config path."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.nodes.append(NodeTiming(path, kind, time.perf_counter() - start))
+
+    def slowest(self, n: int = 10) -> list[NodeTiming]:
+        return sorted(self.nodes, key=lambda t: t.seconds, reverse=True)[:n]
+
+    def report(self, top: int = 10) -> str:
+        lines = ["pydra profile:", "  phases:"]
+        for name, seconds in self.phases.items():
+            lines.append(f"    {name:<20} {seconds * 1000:10.3f} ms")
+
+        slowest = self.slowest(top)
+        if slowest:
+            lines.append(f"  slowest nodes (of {len(self.nodes)}):")
+            for t in slowest:
+                label = f"{t.path or '<root>'} ({t.kind})"
+                lines.append(f"    {label:<40} {t.seconds * 1000:10.3f} ms")
+
+        if self.stats_path is not None:
+            lines.append(f"  cProfile stats written to {self.stats_path}")
+
+        return "\n".join(lines)
+
+
+def phase(name: str):
+    """Times a block as the named phase of the active profiler, if there is one."""
+    if ACTIVE is None:
+        return _NO_PHASE
+    return ACTIVE.phase(name)
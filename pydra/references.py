@@ -0,0 +1,184 @@
+from pydra.config import (
+    _COPY_ON_WRITE_ROOTS,
+    CONFIG,
+    MAPPING,
+    SEQUENCE,
+    WRAPPER,
+    Config,
+    _format_path,
+    _get_child,
+    _set_child,
+    copy_on_write_path,
+    iter_configs,
+    node_kind,
+    plain_at,
+)
+from pydra.interpolation import (
+    InterpolationError,
+    evaluate,
+    referenced_paths,
+    resolution_order,
+)
+from pydra.utils import (
+    _FINGERPRINTS,
+    _SYMBOLIC,
+    forget_resolved,
+    invalidate_fingerprint,
+)
+
+
+def forget_resolved_path(root: Config, hops) -> None:
+    """
+    Like forget_resolved, for the value that hops (see copy_on_write_path)
+    lead to from root, e.g. a dict entry that an override assigned.
+    """
+    owner, keys = root, []
+    node = root
+    last = len(hops) - 1
+    for i, (_, name, is_dict) in enumerate(hops):
+        if node_kind(type(node)) == CONFIG:
+            owner, keys = node, []
+        keys.append(name)
+        if i < last:
+            node = node[name] if is_dict else getattr(node, name)
+    forget_resolved(owner, keys)
+
+
+def _collect_resolved(nodes: list, sites: list):
+    # references that an earlier finalize resolved are resolved again from
+    # the references themselves, as what they refer to may have changed.
+    # These come after the sites found by scanning, so take precedence over
+    # resolved values that look like references (e.g. from "$${" escapes)
+    for path, node in nodes:
+        symbolic = _SYMBOLIC.get(node)
+        if not symbolic:
+            continue
+        for keys, reference in symbolic.values():
+            if _exists(node, keys):
+                site = path
+                for key in keys:
+                    site = (site, key)
+                sites.append((site, reference))
+
+
+def _exists(node, keys: list) -> bool:
+    # whether a resolved value is still there (e.g. a list hasn't shrunk)
+    try:
+        for key in keys:
+            node = _get_child(node, node_kind(type(node)), key)
+    except LookupError:
+        return False
+    return True
+
+
+def _path_keys(path) -> list:
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+    keys.reverse()
+    return keys
+
+
+def resolve_references(root: Config, nodes: list, sites: list):
+    """
+    Replaces each reference found in the tree rooted at root (as (path,
+    value) pairs, see _collect_configs) by the value it refers to, along
+    with those that an earlier finalize resolved in the configs in nodes.
+    Each reference is evaluated once, after any references it depends on.
+    """
+    if len(_SYMBOLIC) > 0:
+        _collect_resolved(nodes, sites)
+    keys = {}
+    for path, value in sites:
+        keys[_format_path(path)] = (_path_keys(path), value)
+
+    order = resolution_order({p: referenced_paths(v) for p, (_, v) in keys.items()})
+    for site in order:
+        site_keys, reference = keys[site]
+        try:
+            value = evaluate(reference, lambda path: _lookup(root, path))
+        except InterpolationError as e:
+            raise InterpolationError(f"Can't resolve {site}={reference}: {e}") from None
+        _store_resolved(root, site_keys, reference, value)
+
+
+def _lookup(root: Config, path: str):
+    node = root
+    for key in path.split("."):
+        kind = node_kind(type(node))
+        try:
+            if kind == CONFIG:
+                node = getattr(node, key)
+            elif kind == WRAPPER:
+                node = node.d[key]
+            elif kind == SEQUENCE:
+                node = node[int(key)]
+            elif kind == MAPPING:
+                node = node[key]
+            else:
+                raise KeyError(key)
+        except (AttributeError, KeyError, IndexError, ValueError):
+            raise InterpolationError(f"there's no value at '{path}'") from None
+    return node
+
+
+def _store_resolved(root: Config, keys: list, reference, value):
+    if len(_COPY_ON_WRITE_ROOTS) > 0 and _COPY_ON_WRITE_ROOTS.get(root) is not None:
+        hops = []
+        node = root
+        for key in keys[:-1]:
+            kind = node_kind(type(node))
+            hops.append((type(node), key, kind >= SEQUENCE))
+            node = _get_child(node, kind, key)
+        copy_on_write_path(root, hops)
+
+    # the nearest config above the reference, which records it
+    owner, owner_keys = root, []
+    node = root
+    for key in keys[:-1]:
+        node = _get_child(node, node_kind(type(node)), key)
+        if node_kind(type(node)) == CONFIG:
+            owner, owner_keys = node, []
+        else:
+            owner_keys.append(key)
+
+    key = keys[-1]
+    kind = node_kind(type(node))
+    if kind == CONFIG:
+        node._assign_maybe_cast(key, value)
+    elif type(node) is tuple:
+        raise InterpolationError(
+            f"Can't resolve {_format_keys(keys)}={reference}: references inside tuples aren't supported"
+        )
+    else:
+        _set_child(node, kind, key, value)
+    if len(_FINGERPRINTS) > 0:
+        invalidate_fingerprint(owner)
+
+    owner_keys.append(key)
+    symbolic = _SYMBOLIC.get(owner)
+    if symbolic is None:
+        symbolic = _SYMBOLIC[owner] = {}
+    symbolic[_format_keys(owner_keys)] = (owner_keys, reference)
+
+
+def _format_keys(keys: list) -> str:
+    return ".".join(str(k) for k in keys)
+
+
+def _restore_references(config: Config, data: dict):
+    for path, node in iter_configs(config):
+        symbolic = _SYMBOLIC.get(node)
+        if not symbolic:
+            continue
+
+        d = plain_at(data, path)
+        for keys, reference in symbolic.values():
+            if not _exists(node, keys):
+                continue
+
+            target = d
+            for key in keys[:-1]:
+                target = target[key]
+            target[keys[-1]] = str(reference)
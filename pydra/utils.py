@@ -1,23 +1,110 @@
+import functools
 import pickle
+import weakref
 from copy import deepcopy
 from dataclasses import MISSING, fields
 from pathlib import Path
-from typing import TYPE_CHECKING, Generic, TypeVar
-
-import dill
-import yaml
-from pydantic import BaseModel
+from typing import TYPE_CHECKING, Any, Generic, Iterable, TypeVar
 
+# dill, PyYAML and pydantic are comparatively expensive to import, and most
+# entry points never touch them. They are imported on first use instead of
+# at module load so that `import pydra` stays cheap.
 if TYPE_CHECKING:
     from _typeshed import DataclassInstance
+    from pydantic import BaseModel
 
 
 class _Required:
-    pass
+    def __reduce__(self):
+        # keep REQUIRED a singleton through pickling and (deep)copying,
+        # so `value is REQUIRED` checks keep working
+        return "REQUIRED"
+
+    def __repr__(self) -> str:
+        return "REQUIRED"
 
 
 REQUIRED = _Required()
 
+
+class WeakIdentityMap:
+    """
+    A mapping from objects to values that compares keys by identity (never
+    calling __hash__/__eq__) and doesn't keep its keys alive.
+    """
+
+    def __init__(self):
+        self._data = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, obj, default=None):
+        entry = self._data.get(id(obj))
+        if entry is not None and entry[0]() is obj:
+            return entry[1]
+        return default
+
+    def __setitem__(self, obj, value):
+        key = id(obj)
+        data = self._data
+
+        def remove(ref):
+            entry = data.get(key)
+            if entry is not None and entry[0] is ref:
+                del data[key]
+
+        data[key] = (weakref.ref(obj, remove), value)
+
+    def pop(self, obj, default=None):
+        entry = self._data.get(id(obj))
+        if entry is not None and entry[0]() is obj:
+            del self._data[id(obj)]
+            return entry[1]
+        return default
+
+
+# Memoized fingerprints (see pydra.hashing) of configs and wrappers, each
+# mapped to [digest, {id(parent): weakref(parent)}], where the parents are
+# the nodes whose own fingerprints were computed from this one.
+_FINGERPRINTS = WeakIdentityMap()
+
+
+def invalidate_fingerprint(node) -> None:
+    """Forgets node's memoized fingerprint, along with those of its parents."""
+    memo = _FINGERPRINTS.pop(node)
+    if memo is not None:
+        for ref in memo[1].values():
+            parent = ref()
+            if parent is not None:
+                invalidate_fingerprint(parent)
+
+
+# Configs that held references before finalizing resolved them (see
+# pydra.references), mapped to {relative path: (keys, reference)}. Each is
+# forgotten once the value it resolved to is assigned to.
+_SYMBOLIC = WeakIdentityMap()
+
+
+def forget_resolved(config, keys: list) -> None:
+    """
+    Forgets the references that were resolved into the value at keys (a
+    path relative to config) or anything beneath it, after it's assigned to.
+    """
+    symbolic = _SYMBOLIC.get(config)
+    if symbolic:
+        n = len(keys)
+        for rel, (rel_keys, _) in list(symbolic.items()):
+            if rel_keys[:n] == keys:
+                del symbolic[rel]
+
+
+def _copy_symbolic(value, new):
+    symbolic = _SYMBOLIC.get(value)
+    if symbolic:
+        _SYMBOLIC[new] = dict(symbolic)
+
+
 # https://stackoverflow.com/questions/6432605/any-yaml-libraries-in-python-that-support-dumping-of-long-strings-as-block-liter
 
 
@@ -29,7 +116,42 @@ def literal_unicode_representer(dumper, data):
     return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
 
 
-yaml.add_representer(literal_unicode, literal_unicode_representer)
+@functools.cache
+def _import_yaml():
+    import yaml
+
+    yaml.add_representer(literal_unicode, literal_unicode_representer)
+    return yaml
+
+
+def _str_representer(dumper, data):
+    # multiline strings (e.g. prompts) are much more readable as block literals
+    style = "|" if "\n" in data else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", data, style=style)
+
+
+@functools.cache
+def _yaml_dumper(literals: bool = True):
+    """
+    The dumper to use for writing YAML: libyaml's CDumper when PyYAML was
+    built with it, which emits far faster than the pure-Python Dumper.
+    """
+    yaml = _import_yaml()
+    base = getattr(yaml, "CDumper", yaml.Dumper)
+
+    class PydraDumper(base):
+        pass
+
+    PydraDumper.add_representer(literal_unicode, literal_unicode_representer)
+    if literals:
+        PydraDumper.add_representer(str, _str_representer)
+
+    return PydraDumper
+
+
+def _yaml_loader():
+    yaml = _import_yaml()
+    return getattr(yaml, "CLoader", yaml.Loader)
 
 
 def transform_into_literals(data):
@@ -48,25 +170,39 @@ def transform_into_literals(data):
 
 
 def load_yaml(path: Path):
+    yaml = _import_yaml()
+
     with open(path, "r") as f:
-        data = yaml.load(f, Loader=yaml.CLoader)
+        data = yaml.load(f, Loader=_yaml_loader())
 
     return data
 
 
-def save_yaml(data, path: Path, sort_keys=True, transform=True):
-    if transform:
-        data = transform_into_literals(data)
+def load_yaml_all(path: Path):
+    """Lazily yields each document in a multi-document YAML file."""
+    yaml = _import_yaml()
+
+    with open(path, "r") as f:
+        yield from yaml.load_all(f, Loader=_yaml_loader())
+
+
+def dump_yaml(data, stream, sort_keys=True, transform=True):
+    """
+    Writes data as YAML straight to stream. With transform, multiline
+    strings are written as block literals.
+    """
+    yaml = _import_yaml()
+    yaml.dump(data, stream, Dumper=_yaml_dumper(transform), sort_keys=sort_keys)
 
+
+def save_yaml(data, path: Path, sort_keys=True, transform=True):
     with open(path, "w") as f:
-        yaml.dump(
-            data,
-            f,
-            sort_keys=sort_keys,
-        )
+        dump_yaml(data, f, sort_keys=sort_keys, transform=transform)
 
 
 def load_dill(path: Path):
+    import dill
+
     with open(path, "rb") as f:
         data = dill.load(f)
 
@@ -74,6 +210,8 @@ def load_dill(path: Path):
 
 
 def save_dill(data, path: Path):
+    import dill
+
     with open(path, "wb") as f:
         dill.dump(data, f)
 
@@ -102,22 +240,66 @@ def load_binary(path: Path):
 T = TypeVar("T")
 
 
+# (wrapper class, wrapped type), mapped to the wrapped type's field table
+# (see BaseWrapper.field_table)
+_FIELD_TABLES: dict[tuple[type, type], tuple[dict, tuple]] = {}
+
+
 class BaseWrapper(Generic[T]):
     d: dict
     wrapped_type: type[T]
 
     def __init__(self, wrapped_type: type[T]):
+        table = _FIELD_TABLES.get((type(self), wrapped_type))
+        if table is None:
+            table = _FIELD_TABLES[(type(self), wrapped_type)] = self.field_table(
+                wrapped_type
+            )
+        defaults, factories = table
+
+        param_dict = defaults.copy()
+        for name, factory in factories:
+            param_dict[name] = factory()
+
+        self.__dict__["d"] = param_dict
+        self.__dict__["wrapped_type"] = wrapped_type
+
+    @classmethod
+    def field_table(cls, wrapped_type: type[T]) -> tuple[dict, tuple]:
+        """
+        Introspects wrapped_type's fields, returning their defaults (with
+        REQUIRED for fields without one) and the (name, default_factory)
+        pairs of fields whose defaults are made per instance. Computed once
+        per wrapped type.
+        """
         raise NotImplementedError
 
-    def build(self):
+    @classmethod
+    def construct_many(
+        cls, wrapped_type: type[T], kwargs_list: list[dict], validate: bool = True
+    ) -> list[T]:
+        """Instantiates wrapped_type once for each dict of keyword arguments."""
+        return [wrapped_type(**kwargs) for kwargs in kwargs_list]
+
+    def _check_required(self):
         for k, v in self.d.items():
-            if v == REQUIRED:
+            # identity, so that values with expensive (or elementwise,
+            # like arrays) __eq__s are never compared
+            if v is REQUIRED:
                 raise ValueError(
                     f"Missing required key '{k}' when instantiating wrapped type {self.wrapped_type}"
                 )
 
-        config = self.wrapped_type(**self.d)
-        return config
+    def build(self, validate: bool = True) -> T:
+        """
+        Instantiates the wrapped type with this wrapper's values. Without
+        validate, wrappers that support it (PydanticWrapper) skip validating
+        values that are known to be valid already.
+        """
+        self._check_required()
+        if validate:
+            return self.wrapped_type(**self.d)
+        return self.construct_many(self.wrapped_type, [self.d], validate)[0]
 
     def spoof(self) -> T:
         """
@@ -128,7 +310,9 @@ class BaseWrapper(Generic[T]):
         return self  # type: ignore
 
     def __deepcopy__(self, memodict={}):
-        new_copy = type(self)(self.wrapped_type)
+        # skip __init__, which would needlessly re-introspect the wrapped type
+        new_copy = object.__new__(type(self))
+        new_copy.__dict__.update(self.__dict__)
         new_copy.__dict__["d"] = deepcopy(self.d, memodict)
         return new_copy
 
@@ -157,11 +341,15 @@ class BaseWrapper(Generic[T]):
 
     def __setitem__(self, key, value):
         self.d[key] = value
+        if len(_FINGERPRINTS) > 0:
+            invalidate_fingerprint(self)
 
     def __setattr__(self, key, value):
         if key not in self.d:
             raise ValueError(f"Trying to assign key that doesn't exist: '{key}'")
         self.d[key] = value
+        if len(_FINGERPRINTS) > 0:
+            invalidate_fingerprint(self)
 
 
 if TYPE_CHECKING:
@@ -171,33 +359,86 @@ else:
 
 
 class DataclassWrapper(BaseWrapper[DataclassInstanceT]):
-    def __init__(self, wrapped_type: type["DataclassInstanceT"]):
-        param_dict = {}
+    @classmethod
+    def field_table(cls, wrapped_type: type["DataclassInstanceT"]):
+        defaults = {}
+        factories = []
         for field in fields(wrapped_type):
             if field.default is not MISSING:
-                param_dict[field.name] = field.default
+                defaults[field.name] = field.default
             elif field.default_factory is not MISSING:
-                param_dict[field.name] = field.default_factory()
+                defaults[field.name] = REQUIRED
+                factories.append((field.name, field.default_factory))
             else:
-                param_dict[field.name] = REQUIRED
+                defaults[field.name] = REQUIRED
+        return defaults, tuple(factories)
 
-        self.__dict__["d"] = param_dict
-        self.__dict__["wrapped_type"] = wrapped_type
+
+BaseModelT = TypeVar("BaseModelT", bound="BaseModel")
 
 
-BaseModelT = TypeVar("BaseModelT", bound=BaseModel)
+# how many models of one type PydanticWrapper.construct_many needs to
+# validate before a (cached) TypeAdapter for lists of them pays off
+_MIN_ADAPTER_BATCH = 64
+
+_LIST_ADAPTERS: dict[type, Any] = {}
 
 
 class PydanticWrapper(BaseWrapper[BaseModelT]):
-    def __init__(self, wrapped_type: type[BaseModelT]):
-        param_dict = {}
+    @classmethod
+    def field_table(cls, wrapped_type: type[BaseModelT]):
+        defaults = {}
+        factories = []
         for field_name, field_info in wrapped_type.model_fields.items():
-            if field_info.default is not None:
-                param_dict[field_name] = field_info.default
+            if field_info.is_required():
+                defaults[field_name] = REQUIRED
             elif field_info.default_factory is not None:
-                param_dict[field_name] = field_info.default_factory()
+                defaults[field_name] = REQUIRED
+                factories.append((field_name, field_info.default_factory))
             else:
-                param_dict[field_name] = REQUIRED
-
-        self.__dict__["d"] = param_dict
-        self.__dict__["wrapped_type"] = wrapped_type
+                defaults[field_name] = field_info.default
+        return defaults, tuple(factories)
+
+    @classmethod
+    def construct_many(
+        cls,
+        wrapped_type: type[BaseModelT],
+        kwargs_list: list[dict],
+        validate: bool = True,
+    ) -> list[BaseModelT]:
+        if not validate:
+            return [wrapped_type.model_construct(**kwargs) for kwargs in kwargs_list]
+        if len(kwargs_list) < _MIN_ADAPTER_BATCH:
+            return [wrapped_type(**kwargs) for kwargs in kwargs_list]
+
+        # validates the whole batch in one call into pydantic-core
+        adapter = _LIST_ADAPTERS.get(wrapped_type)
+        if adapter is None:
+            from pydantic import TypeAdapter
+
+            adapter = _LIST_ADAPTERS[wrapped_type] = TypeAdapter(list[wrapped_type])
+        return adapter.validate_python(kwargs_list)
+
+
+def build_many(wrappers: Iterable[BaseWrapper], validate: bool = True) -> list:
+    """
+    Builds every wrapper, returning the built objects in the same order.
+    Wrappers are grouped by wrapped type, so each type is constructed in a
+    single batch (which for pydantic models is validated in one call).
+    Without validate, pydantic models are built with model_construct.
+    """
+    wrappers = list(wrappers)
+    groups: dict[tuple[type, type], list[int]] = {}
+    for i, wrapper in enumerate(wrappers):
+        wrapper._check_required()
+        groups.setdefault((type(wrapper), wrapper.wrapped_type), []).append(i)
+
+    built = [None] * len(wrappers)
+    for (wrapper_type, wrapped_type), indices in groups.items():
+        kwargs_list = [wrappers[i].d for i in indices]
+        for i, obj in zip(
+            indices,
+            wrapper_type.construct_many(wrapped_type, kwargs_list, validate),
+        ):
+            built[i] = obj
+    return built
@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import Optional
 
 import pydra
+from pydra.config import get_schema
 
 
 class DoubleInt:
@@ -71,3 +72,52 @@ class TestAnnotations(unittest.TestCase):
         pydra.apply_overrides(config, ["b=2"])
         self.assertEqual(config.a, 5)
         self.assertEqual(config.b, 2)
+
+
+class TestSchemaCache(unittest.TestCase):
+    def test_schema_built_once(self):
+        ConfigWithAnnotations()
+        schema = get_schema(ConfigWithAnnotations)
+        ConfigWithAnnotations()
+        self.assertIs(get_schema(ConfigWithAnnotations), schema)
+        self.assertEqual(schema.nested_config_fields, frozenset())
+
+    def test_subclass_has_own_schema(self):
+        base = get_schema(ConfigWithOptional)
+        derived = get_schema(DerivedConfigWithOptional)
+        self.assertIsNot(base, derived)
+        self.assertEqual(list(base.annotations), ["opt1"])
+        self.assertEqual(list(derived.annotations), ["opt1", "opt2"])
+        self.assertEqual(derived.optional_inner, {"opt1": Path, "opt2": Path})
+
+    def test_schema_invalidated_on_class_change(self):
+        class Inner(pydra.Config):
+            x: int = 1
+
+        class Changing(pydra.Config):
+            a: int = 1
+
+        self.assertEqual(Changing().a, 1)
+
+        Changing.a = 2
+        self.assertEqual(Changing().a, 2)
+
+        Changing.__annotations__["inner"] = Inner
+        Changing.inner = None
+        config = Changing()
+        self.assertIsNone(config.inner)
+        self.assertEqual(get_schema(Changing).nested_config_fields, {"inner"})
+
+    def test_union(self):
+        class ConfigWithUnion(pydra.Config):
+            x: int | str = 1
+            y: int | None = None
+
+        config = ConfigWithUnion()
+        pydra.apply_overrides(config, ["x=2", "y=3"])
+        self.assertEqual((config.x, config.y), (2, 3))
+        pydra.apply_overrides(config, ["x=abc", "y=4.0"])
+        self.assertEqual((config.x, config.y), ("abc", 4))
+
+        with self.assertRaises(ValueError):
+            pydra.apply_overrides(config, ["y=abc"])
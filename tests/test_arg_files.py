@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from pydra import Config, apply_overrides, run
+from pydra.parser import CommandStream, expand_arg_files, parse
+
+
+class ArgFileConfig(Config):
+    def __init__(self):
+        self.x = 1
+        self.name = "a"
+        self.dims = []
+        self.values = {"k": 0}
+
+
+def arg_file_fn(config: ArgFileConfig):
+    return config.x
+
+
+def list_fn(config: ArgFileConfig):
+    return config.dims
+
+
+class TestArgFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name: str, *lines: str) -> Path:
+        path = self.dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    def test_expand(self):
+        path = self.write("args.txt", "x=2", "", "   ", "name=b  ", "--show")
+        self.assertEqual(
+            list(expand_arg_files(["y=0", f"@{path}", "@@literal"])),
+            ["y=0", "x=2", "name=b  ", "--show", "@literal"],
+        )
+
+        empty = self.write("empty.txt")
+        empty.write_text("")
+        self.assertEqual(list(expand_arg_files([f"@{empty}"])), [])
+
+    def test_nested_relative_paths(self):
+        self.write("sub/inner.txt", "name=inner", "@deeper/leaf.txt")
+        self.write("sub/deeper/leaf.txt", "x=3")
+        outer = self.write("outer.txt", "@sub/inner.txt", "x=2")
+
+        config = ArgFileConfig()
+        apply_overrides(config, [f"@{outer}"])
+        self.assertEqual(config.name, "inner")
+        self.assertEqual(config.x, 2)
+
+        # top-level paths are relative to the working directory
+        cwd = os.getcwd()
+        os.chdir(self.dir)
+        try:
+            config = ArgFileConfig()
+            apply_overrides(config, ["@sub/deeper/leaf.txt"])
+            self.assertEqual(config.x, 3)
+        finally:
+            os.chdir(cwd)
+
+    def test_cycle(self):
+        self.write("a.txt", "x=2", "@b.txt")
+        self.write("b.txt", "@a.txt")
+        with self.assertRaises(ValueError):
+            parse([f"@{self.dir / 'a.txt'}"])
+
+        with self.assertRaises(FileNotFoundError):
+            parse([f"@{self.dir / 'missing.txt'}"])
+
+    def test_blocks_span_files(self):
+        path = self.write("list.txt", "--list", "dims", "1", "2", "(1 + 2)")
+        config = ArgFileConfig()
+        apply_overrides(config, [f"@{path}", "list--", "--in", "values", "k=1", "in--"])
+        self.assertEqual(config.dims, [1, 2, 3])
+        self.assertEqual(config.values, {"k": 1})
+
+    def test_lists_are_not_expanded(self):
+        path = self.write("list.txt", "--list", "dims", "@home", "@@x")
+        self.assertEqual(
+            list(expand_arg_files([f"@{path}", "@@y", "list--", "@@z"])),
+            ["--list", "dims", "@home", "@@x", "@@y", "list--", "@z"],
+        )
+
+        config = ArgFileConfig()
+        apply_overrides(config, [f"@{path}", "list--"])
+        self.assertEqual(config.dims, ["@home", "@@x"])
+
+        # or in sweeps
+        results = run(
+            list_fn,
+            ["x=1,2", "--list", "dims", "@home", "list--", "--multirun", "-j", "1"],
+        )
+        self.assertEqual([r.result for r in results], [["@home"], ["@home"]])
+
+    def test_unterminated_list(self):
+        for args in [["--list", "dims", "1"], ["--list"], ["--list", "list--"]]:
+            with self.assertRaises(ValueError, msg=args):
+                parse(args)
+
+    def test_stream_is_lazy(self):
+        lines = (f"x={i}" for i in range(100_000))
+        path = self.write("big.txt", *lines, "--show")
+
+        stream = iter(CommandStream([f"@{path}"]))
+        first = next(stream)
+        self.assertEqual((first.kv_pair.key, first.kv_pair.value), ("x", 0))
+
+        config = ArgFileConfig()
+        self.assertTrue(apply_overrides(config, [f"@{path}"]))
+        self.assertEqual(config.x, 99_999)
+
+    def test_run_and_multirun(self):
+        path = self.write("args.txt", "x=4,5")
+        self.assertEqual(run(arg_file_fn, [f"@{self.dir / 'args.txt'}", "x=6"]), 6)
+
+        results = run(arg_file_fn, [f"@{path}", "--multirun", "-j", "1"])
+        self.assertEqual([r.result for r in results], [4, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import array
+import unittest
+from enum import Enum
+from pathlib import Path
+from typing import Any, Literal, Optional, Sequence
+
+import pydra
+from pydra.coerce import CoercionError, compile_coercer
+from pydra.config import get_schema
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Child(pydra.Config):
+    dim: int = 4
+
+
+class Typed(pydra.Config):
+    sizes: list[int] = [1]
+    scales: list[float] = []
+    paths: list[Path] = []
+    weights: dict[str, float] = {}
+    pair: tuple[int, str] = (0, "a")
+    rest: tuple[float, ...] = ()
+    mode: Literal["train", "eval"] = "train"
+    color: Color = Color.RED
+    flag: bool = False
+    maybe: Optional[list[int]] = None
+    either: int | list[int] = 0
+    nested: dict[str, list[Path]] = {}
+    anything: Any = None
+    child: Optional[Child] = None
+
+
+class TestCompiledCoercers(unittest.TestCase):
+    def test_compiled_once(self):
+        self.assertIs(compile_coercer(list[int]), compile_coercer(list[int]))
+        schema = get_schema(Typed)
+        self.assertIs(schema.casters["sizes"], compile_coercer(list[int]))
+        self.assertNotIn("anything", schema.casters)
+
+    def test_containers(self):
+        config = Typed()
+        pydra.apply_overrides(
+            config,
+            [
+                "sizes=(1,2.0)",
+                "scales=[1,2]",
+                "paths=['a','b']",
+                "weights={'a':1}",
+                "pair=[1,2]",
+                "rest=[1,2]",
+                "nested={'x':['a']}",
+            ],
+        )
+        self.assertEqual(config.sizes, [1, 2])
+        self.assertEqual([type(x) for x in config.scales], [float, float])
+        self.assertEqual(config.paths, [Path("a"), Path("b")])
+        self.assertEqual(config.weights, {"a": 1.0})
+        self.assertIs(type(config.weights["a"]), float)
+        self.assertEqual(config.pair, (1, "2"))
+        self.assertEqual(config.rest, (1.0, 2.0))
+        self.assertEqual(config.nested, {"x": [Path("a")]})
+
+    def test_typed_list_into_list_field(self):
+        config = Typed()
+        pydra.apply_overrides(config, ["--list:i32", "scales", "1", "2", "list--"])
+        self.assertEqual(config.scales, [1.0, 2.0])
+        self.assertIs(type(config.scales), list)
+
+    def test_fast_path_copies(self):
+        values = [1, 2, 3]
+        coerced = compile_coercer(list[int])(values)
+        self.assertEqual(coerced, values)
+        self.assertIsNot(coerced, values)
+        self.assertEqual(compile_coercer(Sequence[int])((1, 2)), [1, 2])
+        self.assertEqual(compile_coercer(set[str])(["a", "a"]), {"a"})
+
+    def test_scalars(self):
+        config = Typed()
+        pydra.apply_overrides(
+            config, ["mode=eval", "color=blue", "flag=1", "maybe=[1]", "either=[2]"]
+        )
+        self.assertEqual(config.mode, "eval")
+        self.assertIs(config.color, Color.BLUE)
+        self.assertIs(config.flag, True)
+        self.assertEqual(config.maybe, [1])
+        self.assertEqual(config.either, [2])
+
+        pydra.apply_overrides(config, ["color=RED", "maybe=None", "either=3"])
+        self.assertIs(config.color, Color.RED)
+        self.assertIsNone(config.maybe)
+        self.assertEqual(config.either, 3)
+
+    def test_errors(self):
+        cases = [
+            ("sizes=[1,'x']", "at index 1"),
+            ("mode=test", "expected one of ['train', 'eval']"),
+            ("color=green", "expected one of ['RED', 'BLUE']"),
+            ("flag=yes", "expected a bool"),
+            ("pair=[1]", "expected 2 items, got 1"),
+            ("weights=[1]", "expected a dict"),
+            ("paths=abc", "expected a list"),
+            ("child=1", "can't convert 1 to Child"),
+        ]
+        for arg, message in cases:
+            with self.subTest(arg=arg):
+                with self.assertRaises(CoercionError) as cm:
+                    pydra.apply_overrides(Typed(), [arg])
+                self.assertIn(arg.split("=")[0], str(cm.exception))
+                self.assertIn(message, str(cm.exception))
+
+        # still ValueErrors (and TypeErrors), as before
+        with self.assertRaises(ValueError):
+            pydra.apply_overrides(Typed(), ["sizes=[[1]]"])
+
+    def test_from_dict(self):
+        config = Typed()
+        pydra.apply_overrides(
+            config,
+            ["paths=['a']", "color=blue", "pair=(3,'b')", "child=(None)"],
+        )
+        config.child = Child()
+        restored = Typed.from_dict(config.to_dict())
+        self.assertEqual(restored.paths, [Path("a")])
+        self.assertIs(restored.color, Color.BLUE)
+        self.assertEqual(restored.pair, (3, "b"))
+        self.assertIsInstance(restored.child, Child)
+
+    def test_arrays(self):
+        class WithArray(pydra.Config):
+            values: array.array = array.array("d")
+
+        config = WithArray()
+        pydra.apply_overrides(config, ["values=[1,2]"])
+        self.assertIsInstance(config.values, array.array)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import array
+import unittest
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+from pydra import Alias, Config, DataclassWrapper, Lazy, apply_overrides, diff
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@dataclass
+class Optimizer:
+    lr: float = 0.1
+    name: str = "adam"
+
+
+class Layer(Config):
+    def __init__(self):
+        self.dim = 8
+        self.act = "relu"
+
+
+class Model(Config):
+    path: Path = Path("runs")
+    color: Color = Color.RED
+    weights: array.array = array.array("d", [1.0, 2.0])
+
+    def __init__(self):
+        super().__init__()
+        self.x = 1
+        self.lr = 0.5
+        self.name = "model"
+        self.flag = False
+        self.head = Layer()
+        self.layers = [Layer(), Layer()]
+        self.sizes = [1, 2]
+        self.names = {"a": 1, "b": 2}
+        self.opt = DataclassWrapper(Optimizer)
+        self.shape = (1, 2)
+        self.alias = Alias("x")
+
+    def finalize(self):
+        self.total = self.x + len(self.sizes)
+
+
+def reproduce(args: list[str]) -> Config:
+    config = Model()
+    apply_overrides(config, args)
+    return config
+
+
+class TestDiff(unittest.TestCase):
+    def test_no_changes(self):
+        d = diff(Model(), Model())
+        self.assertEqual(d.args, [])
+        self.assertTrue(d.complete)
+
+    def test_round_trip(self):
+        other = Model()
+        apply_overrides(
+            other,
+            [
+                "x=5",
+                "lr=(inf)",
+                "name='T'",
+                "flag=T",
+                "head.dim=16",
+                "head.act=@gelu",
+                "sizes=[1,'2']",
+                "names.b=3",
+                "opt.lr=0.01",
+                "path=a/b",
+                "color=blue",
+                "shape=(3,)",
+                "--list:f32",
+                "weights",
+                "1.5",
+                "2.25",
+                "list--",
+            ],
+            finalize=False,
+        )
+
+        d = diff(Model(), other)
+        self.assertTrue(d.complete)
+        self.assertIn("x=5", d.args)
+        self.assertIn("name='T'", d.args)
+        self.assertIn("head.dim=16", d.args)
+        self.assertIn("names.b=3", d.args)
+        self.assertIn("--list:f32", d.args)
+
+        reproduced = Model()
+        apply_overrides(reproduced, d.args, finalize=False)
+        self.assertEqual(reproduced.fingerprint(), other.fingerprint())
+        self.assertIs(type(reproduced.weights), array.array)
+        self.assertEqual(reproduced.weights.typecode, "f")
+
+    def test_only_changed_paths(self):
+        other = Model()
+        other.layers[1].dim = 4
+        d = diff(Model(), other)
+        self.assertEqual(d.args, [])
+        self.assertEqual([u.key for u in d.unsupported], ["layers"])
+
+    def test_unsupported(self):
+        base = Model()
+        other = Model()
+        other.names = {"a": 1, "c": object()}
+        other.head = Optimizer()
+        other.extra = 1
+        del other.flag
+        other.alias = Alias("lr")
+
+        keys = {u.key: u.reason for u in diff(base, other).unsupported}
+        self.assertEqual(set(keys), {"names", "head", "extra", "flag", "alias"})
+
+    def test_finalized(self):
+        other = Model()
+        apply_overrides(other, ["x=3"])
+
+        d = diff(Model(), other)
+        self.assertEqual(d.args, ["x=3"])
+        self.assertEqual([u.key for u in d.unsupported], ["total"])
+
+        d = diff(Model(), other, finalize=True)
+        self.assertTrue(d.complete)
+        self.assertEqual(d.args, ["x=3"])
+        self.assertEqual(reproduce(d.args).fingerprint(), other.fingerprint())
+
+    def test_finalize_overwrites(self):
+        other = Model()
+        apply_overrides(other, [])
+        other.total = 10
+        d = diff(Model(), other, finalize=True)
+        self.assertEqual([u.key for u in d.unsupported], ["total"])
+
+    def test_frozen(self):
+        base = Model()
+        apply_overrides(base, [])
+        other = Model()
+        apply_overrides(other, ["sizes=[3]", "opt.name=sgd"], freeze=True)
+
+        # total is recomputed by finalize() anyway, but is part of the diff
+        d = diff(base, other)
+        self.assertEqual(d.args, ["sizes=[3]", "opt.name=sgd", "total=2"])
+
+    def test_references_escaped(self):
+        class Shell(Config):
+            def __init__(self):
+                self.user = "me"
+                self.cmd = "echo"
+                self.args = ["a"]
+                self.env = {"home": "~"}
+                self.shape = (1,)
+                self.opt = DataclassWrapper(Optimizer)
+
+        other = Shell()
+        apply_overrides(
+            other,
+            [
+                "cmd=echo $${HOME} ${user}",
+                "args=['$${x}', '$$${y}']",
+                "env.home=$${HOME}",
+                "opt.name=$${name}",
+            ],
+        )
+        self.assertEqual(other.cmd, "echo ${HOME} me")
+
+        d = diff(Shell(), other)
+        self.assertTrue(d.complete)
+        self.assertIn("cmd=echo $${HOME} me", d.args)
+        self.assertIn("env.home=$${HOME}", d.args)
+        reproduced = Shell()
+        apply_overrides(reproduced, d.args)
+        self.assertEqual(reproduced.to_dict(), other.to_dict())
+
+        # templates in tuples can't be assigned, even escaped
+        other = Shell()
+        other.shape = ("${x}",)
+        self.assertEqual([u.key for u in diff(Shell(), other).unsupported], ["shape"])
+
+    def test_lazy_fields(self):
+        class Vocab(Config):
+            vocab: list[str] = Lazy(lambda: ["a", "b"])
+
+            def __init__(self):
+                super().__init__()
+                self.size = 1
+
+        other = Vocab()
+        apply_overrides(other, ["vocab=['z']"])
+        for finalize in (False, True):
+            d = diff(Vocab(), other, finalize=finalize)
+            self.assertTrue(d.complete)
+            self.assertEqual(d.args, ["vocab=['z']"])
+
+        # other's is unbuilt, so whatever base's was built as can't be undone
+        base = Vocab()
+        base.vocab
+        d = diff(base, Vocab())
+        self.assertEqual([u.key for u in d.unsupported], ["vocab"])
+        self.assertIn("hasn't been built", d.unsupported[0].reason)
+
+    def test_mismatched_roots(self):
+        d = diff(Model(), Layer())
+        self.assertEqual([u.key for u in d.unsupported], [""])
+
+    def test_skips_equal_subtrees(self):
+        class Leaves(Config):
+            def __init__(self):
+                for i in range(100):
+                    setattr(self, f"v{i}", i)
+
+        class Big(Config):
+            def __init__(self):
+                for i in range(100):
+                    setattr(self, f"c{i}", Leaves())
+
+        base = Big()
+        other = Big()
+        apply_overrides(other, ["c42.v7=-1"])
+        self.assertEqual(diff(base, other).args, ["c42.v7=-1"])
+
+        # unchanged subtrees are compared by their memoized fingerprints
+        base.c3.v0 = 5
+        other.c3.v0 = 5
+        self.assertEqual(diff(base, other).args, ["c42.v7=-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
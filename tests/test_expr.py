@@ -0,0 +1,99 @@
+import math
+import unittest
+
+from pydra import Config, Evaluator, apply_overrides, compile_overrides
+from pydra.expr import UnsafeExpressionError, _compile_safe
+from pydra.parser import parse_value
+
+
+class ExprConfig(Config):
+    def __init__(self):
+        self.lr = 0.1
+        self.dims = []
+
+
+class TestSafeEvaluator(unittest.TestCase):
+    def test_arithmetic_and_literals(self):
+        cases = {
+            "(1+3 * (2 ** 3))": 25,
+            "(3e-4 * 2 ** -2)": 7.5e-05,
+            "(7 // 2, 7 % 2, -7 / 2)": (3, 1, -3.5),
+            "([1,2] + [3,4])": [1, 2, 3, 4],
+            "((1,2),(3,4))": ((1, 2), (3, 4)),
+            '({"a": [1], "b": {2}})': {"a": [1], "b": {2}},
+            "([1, 2, 3][1:])": [2, 3],
+            "(1 < 2 <= 2 and not False)": True,
+            "('big' if 3 > 2 else 'small')": "big",
+            "(sqrt(16) + floor(pi))": 7.0,
+            "(max(1, 5, 3) * abs(-2))": 10,
+            "(inf)": math.inf,
+        }
+        for value, expected in cases.items():
+            self.assertEqual(parse_value(value), expected, value)
+
+    def test_mutable_results_are_fresh(self):
+        first = parse_value("([1] * 2)")
+        first.append(3)
+        self.assertEqual(parse_value("([1] * 2)"), [1, 1])
+
+    def test_refused(self):
+        for value in [
+            "(().__class__)",
+            '({"a": 1}.items())',
+            "([x for x in range(3)])",
+            "(lambda: 1)",
+            "(open('f'))",
+            "(__import__('os'))",
+        ]:
+            with self.assertRaises(ValueError, msg=value):
+                parse_value(value)
+
+        with self.assertRaises(UnsafeExpressionError):
+            parse_value("(().__class__)")
+
+    def test_size_guards(self):
+        for value in ["(10 ** 10 ** 10)", "([0] * 10 ** 12)", "(1 << 10 ** 9)"]:
+            with self.assertRaises(ValueError, msg=value):
+                parse_value(value)
+
+        self.assertEqual(parse_value("(2 ** 100)"), 2**100)
+
+    def test_namespace_opt_in(self):
+        evaluator = Evaluator(namespace={"k": 3, "double": lambda x: 2 * x})
+        self.assertEqual(parse_value("(2 ** -k)", evaluator), 0.125)
+        self.assertEqual(parse_value("(double(k))", evaluator), 6)
+
+        with self.assertRaises(ValueError):
+            parse_value("(2 ** -k)")
+
+    def test_unsafe_fallback(self):
+        evaluator = Evaluator(unsafe=True)
+        self.assertEqual(
+            parse_value("([x * 2 for x in range(3)])", evaluator), [0, 2, 4]
+        )
+        # safe expressions still go through the safe evaluator
+        self.assertEqual(parse_value("(1 + 2)", evaluator), 3)
+
+    def test_compiled_expressions_are_cached(self):
+        parse_value("(3e-4 * 2 ** -5)")
+        hits = _compile_safe.cache_info().hits
+        parse_value("(3e-4 * 2 ** -5)")
+        self.assertEqual(_compile_safe.cache_info().hits, hits + 1)
+
+    def test_overrides(self):
+        config = ExprConfig()
+        apply_overrides(
+            config,
+            ["lr=(base_lr / 2)", "dims=([64] * n)"],
+            evaluator=Evaluator(namespace={"base_lr": 0.5, "n": 2}),
+        )
+        self.assertEqual(config.lr, 0.25)
+        self.assertEqual(config.dims, [64, 64])
+
+        plan = compile_overrides(ExprConfig, ["lr=(1e-3 * 2 ** -1)"])
+        plan.apply(config)
+        self.assertEqual(config.lr, 5e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
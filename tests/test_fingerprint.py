@@ -0,0 +1,202 @@
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+from dataclasses import dataclass
+from pathlib import Path
+
+import pydra
+from pydra import Config, DataclassWrapper
+from pydra.utils import _FINGERPRINTS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class MyDataclass:
+    x: int
+    y: str = "y"
+
+
+class Leaf(Config):
+    def __init__(self):
+        self.a = 1
+        self.tags = {"b", "a", "c"}
+
+
+class Appending(Config):
+    def __init__(self):
+        self.items = [1]
+
+    def finalize(self):
+        self.items.append(len(self.items))
+
+
+class Root(Config):
+    def __init__(self):
+        self.left = Leaf()
+        self.right = Leaf()
+        self.mapping = {"k": Leaf(), "plain": [1, 2.0, "3", None]}
+        self.dc = DataclassWrapper(MyDataclass)
+        self.path = Path("/tmp/x")
+
+    def grow(self):
+        self.mapping["plain"].append(4)
+
+
+class OtherRoot(Root):
+    pass
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_deterministic(self):
+        self.assertEqual(Root().fingerprint(), Root().fingerprint())
+        config = Root()
+        self.assertEqual(
+            config.fingerprint(), pickle.loads(pickle.dumps(config)).fingerprint()
+        )
+
+    def test_stable_across_processes(self):
+        # class names are part of the fingerprint, so import Root under the
+        # same module name as this run did
+        code = f"""
+import sys
+sys.path.insert(0, {str(Path(__file__).parent)!r})
+from {Root.__module__} import Root
+print(Root().fingerprint())
+"""
+        outputs = set()
+        for seed in ("1", "2"):
+            outputs.add(
+                subprocess.run(
+                    [sys.executable, "-c", code],
+                    cwd=REPO_ROOT,
+                    env={**os.environ, "PYTHONHASHSEED": seed},
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.strip()
+            )
+        self.assertEqual(outputs, {Root().fingerprint()})
+
+    def test_type_aware(self):
+        fingerprints = set()
+        for value in [1, 1.0, "1", True, [1], (1,), {1}, None]:
+            config = Leaf()
+            config.a = value
+            fingerprints.add(config.fingerprint())
+        self.assertEqual(len(fingerprints), 8)
+
+        self.assertNotEqual(Root().fingerprint(), OtherRoot().fingerprint())
+
+    def test_order_independent(self):
+        a, b = Leaf(), Leaf()
+        a.d = {"x": 1, "y": 2}
+        b.d = {"y": 2, "x": 1}
+        self.assertEqual(a.fingerprint(), b.fingerprint())
+
+    def test_wrapper_contents(self):
+        config = Root()
+        before = config.fingerprint()
+        config.dc.x = 5
+        self.assertNotEqual(config.fingerprint(), before)
+        config.dc.x = pydra.REQUIRED
+        self.assertEqual(config.fingerprint(), before)
+
+    def test_unsupported_type(self):
+        config = Leaf()
+        config.a = object()
+        with self.assertRaises(TypeError):
+            config.fingerprint()
+
+    def test_callables(self):
+        def fingerprint(value):
+            config = Leaf()
+            config.a = value
+            return config.fingerprint()
+
+        self.assertEqual(fingerprint(len), fingerprint(len))
+        self.assertNotEqual(fingerprint(len), fingerprint(sum))
+        self.assertNotEqual(fingerprint(Root.grow), fingerprint(Root.__init__))
+
+        # bound methods depend on what they're bound to
+        left, right = Leaf(), Leaf()
+        right.a = 2
+        self.assertNotEqual(fingerprint(left.__init__), fingerprint(right.__init__))
+        self.assertEqual(fingerprint(left.__init__), fingerprint(Leaf().__init__))
+
+        # lambdas and closures can't be told apart by name
+        def scale(factor):
+            return lambda x: x * factor
+
+        for value in [lambda x: x, lambda x: -x, scale(2), scale]:
+            with self.assertRaises(TypeError, msg=value):
+                fingerprint(value)
+
+
+class TestFingerprintInvalidation(unittest.TestCase):
+    def assert_changes(self, config, change):
+        before = config.fingerprint()
+        change()
+        after = config.fingerprint()
+        self.assertNotEqual(before, after)
+
+        # the memoized result must match a fresh computation
+        self.assertEqual(after, pickle.loads(pickle.dumps(config)).fingerprint())
+
+    def test_override(self):
+        config = Root()
+        self.assert_changes(
+            config, lambda: pydra.apply_overrides(config, ["mapping.k.a=2"])
+        )
+        self.assert_changes(
+            config, lambda: pydra.apply_overrides(config, ["mapping.plain=[]"])
+        )
+
+    def test_plan(self):
+        config = Root()
+        plan = pydra.compile_overrides(Root, ["mapping.k.a=7"])
+        self.assert_changes(config, lambda: plan.apply(config))
+
+    def test_nested_assignment(self):
+        config = Root()
+        self.assert_changes(config, lambda: setattr(config.right, "a", 2))
+        self.assert_changes(config, lambda: delattr(config.right, "a"))
+
+    def test_method_call(self):
+        config = Root()
+        self.assert_changes(config, lambda: pydra.apply_overrides(config, [".grow"]))
+
+    def test_finalize(self):
+        config = Root()
+        config.appending = Appending()
+        self.assert_changes(config, config._recursive_finalize)
+
+    def test_only_changed_path_is_rehashed(self):
+        config = Root()
+        config.fingerprint()
+        pydra.apply_overrides(config, ["left.a=2"])
+
+        self.assertIsNone(_FINGERPRINTS.get(config))
+        self.assertIsNone(_FINGERPRINTS.get(config.left))
+        self.assertIsNotNone(_FINGERPRINTS.get(config.right))
+        self.assertIsNotNone(_FINGERPRINTS.get(config.mapping["k"]))
+
+    def test_copy_on_write_clone(self):
+        source = Root()
+        clone = source.clone(copy_on_write=True)
+        self.assertEqual(source.fingerprint(), clone.fingerprint())
+
+        self.assert_changes(
+            clone, lambda: pydra.apply_overrides(clone, ["mapping.k.a=3"])
+        )
+        self.assertEqual(source.fingerprint(), Root().fingerprint())
+
+        self.assert_changes(
+            clone, lambda: pydra.apply_overrides(clone, ["mapping.k.a=4"])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+import copy
+import functools
+import pickle
+import threading
+import unittest
+from dataclasses import dataclass
+
+import dill
+
+from pydra import (
+    Config,
+    DataclassWrapper,
+    FrozenConfigError,
+    FrozenDict,
+    FrozenList,
+    SlotsConfig,
+    apply_overrides,
+    compile_overrides,
+    is_frozen,
+)
+
+
+@dataclass
+class Optimizer:
+    lr: float = 0.1
+
+
+class Layer(Config):
+    def __init__(self):
+        self.dim = 8
+
+
+class Model(Config):
+    def __init__(self):
+        self.head = Layer()
+        self.layers = [Layer(), Layer()]
+        self.names = {"a": [1, 2]}
+        self.shape = (1, [2])
+        self.opt = DataclassWrapper(Optimizer)
+
+
+class Shard(SlotsConfig):
+    weight: float = 1.0
+
+
+class Tokenizer:
+    pass
+
+
+class Pipeline(Config):
+    def __init__(self):
+        self.model = Model()
+        self.tokenizer = None
+
+    def finalize(self):
+        self.tokenizer = Tokenizer()
+
+
+class TestFreeze(unittest.TestCase):
+    def test_immutable(self):
+        model = Model()
+        fingerprint = model.fingerprint()
+        self.assertIs(model.freeze(), model)
+
+        self.assertTrue(is_frozen(model))
+        self.assertTrue(is_frozen(model.layers[0]))
+        self.assertIsInstance(model, Model)
+        self.assertIsInstance(model.layers, FrozenList)
+        self.assertIsInstance(model.names, FrozenDict)
+        self.assertIsInstance(model.names["a"], FrozenList)
+        self.assertIsInstance(model.shape[1], FrozenList)
+        self.assertEqual(model.layers[1].dim, 8)
+        self.assertEqual(model.names, {"a": [1, 2]})
+
+        # freezing doesn't change what the config is
+        self.assertEqual(model.fingerprint(), fingerprint)
+
+        for mutate in [
+            lambda: setattr(model, "new", 1),
+            lambda: setattr(model.layers[0], "dim", 1),
+            lambda: delattr(model, "shape"),
+            lambda: model.layers.append(Layer()),
+            lambda: model.names.update(b=1),
+            lambda: model.names["a"].__setitem__(0, 5),
+            lambda: setattr(model.opt, "lr", 1.0),
+            lambda: apply_overrides(model, ["head.dim=1"]),
+        ]:
+            with self.assertRaises(FrozenConfigError):
+                mutate()
+
+        self.assertEqual(model.opt.build(), Optimizer())
+
+    def test_hash_and_eq(self):
+        first = Model().freeze()
+        second = Model().freeze()
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, Model())
+
+        third = Model()
+        third.layers[0].dim = 4
+        self.assertNotEqual(first, third.freeze())
+
+        @functools.lru_cache
+        def build(config: Model):
+            return object()
+
+        self.assertIs(build(first), build(second))
+        self.assertIsNot(build(first), build(third))
+
+    def test_unfingerprintable(self):
+        pipeline = Pipeline()
+        apply_overrides(pipeline, ["model.head.dim=2"], freeze=True)
+        self.assertTrue(is_frozen(pipeline))
+        self.assertIsInstance(pipeline.model.layers, FrozenList)
+
+        # hashed and compared by identity, unlike what they hold
+        other = Pipeline()
+        apply_overrides(other, ["model.head.dim=2"], freeze=True)
+        self.assertEqual(hash(pipeline), hash(pipeline))
+        self.assertNotEqual(pipeline, other)
+        self.assertEqual(pipeline, pipeline)
+        self.assertEqual(pipeline.model, other.model)
+        self.assertEqual(len({pipeline, other, pipeline}), 2)
+
+    def test_all_or_nothing(self):
+        class Broken(tuple):
+            def __new__(cls, items=()):
+                if isinstance(items, list):
+                    raise RuntimeError("can't rebuild")
+                return super().__new__(cls, items)
+
+        model = Model()
+        model.broken = Broken(([1],))
+        with self.assertRaises(RuntimeError):
+            model.freeze()
+
+        self.assertFalse(is_frozen(model))
+        self.assertFalse(is_frozen(model.head))
+        self.assertNotIsInstance(model.layers, FrozenList)
+        self.assertNotIsInstance(model.opt.d, FrozenDict)
+        model.head.dim = 4
+
+    def test_apply_overrides(self):
+        model = Model()
+        apply_overrides(model, ["names.a=[3]"], freeze=True)
+        self.assertEqual(model.names["a"], [3])
+        self.assertTrue(is_frozen(model))
+
+        plan = compile_overrides(Model, ["head.dim=2"])
+        model = Model()
+        plan.apply(model, freeze=True)
+        self.assertEqual(model.head.dim, 2)
+        self.assertTrue(is_frozen(model.head))
+
+    def test_copies(self):
+        model = Model().freeze()
+        for copied in [
+            pickle.loads(pickle.dumps(model)),
+            dill.loads(dill.dumps(model)),
+            copy.deepcopy(model),
+            model.clone(),
+        ]:
+            self.assertEqual(copied, model)
+            self.assertIsNot(copied, model)
+            self.assertTrue(is_frozen(copied.layers[1]))
+            self.assertIsInstance(copied.names, FrozenDict)
+
+    def test_copy_on_write_clone(self):
+        model = Model()
+        clone = model.clone(copy_on_write=True).freeze()
+        self.assertTrue(is_frozen(clone.layers[0]))
+        self.assertFalse(is_frozen(model.layers[0]))
+        self.assertNotIsInstance(model.names, FrozenDict)
+        model.head.dim = 3
+        self.assertEqual(clone.head.dim, 8)
+
+    def test_slots(self):
+        shard = Shard().freeze()
+        self.assertEqual(shard, pickle.loads(pickle.dumps(shard)))
+        with self.assertRaises(FrozenConfigError):
+            shard.weight = 2.0
+
+    def test_threads(self):
+        model = Model().freeze()
+        expected = hash(model)
+        results = []
+
+        def worker():
+            results.append(all(hash(model) == expected for _ in range(100)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [True] * 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import tempfile
+import unittest
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+import yaml
+
+import pydra
+from pydra import Config, DataclassWrapper
+
+
+class Color(Enum):
+    RED = 1
+    BLUE = 2
+
+
+@dataclass
+class MyDataclass:
+    x: int
+    y: str = "y"
+
+
+class Layer(Config):
+    dim: int = 8
+
+    def __init__(self):
+        super().__init__()
+        self.act = "relu"
+
+
+class Head(Config):
+    def __init__(self):
+        self.size = 1
+
+
+class Model(Config):
+    head: Head
+    dropout: float = 0.1
+
+    def __init__(self):
+        super().__init__()
+        self.layers = [Layer(), Layer()]
+        self.by_name = {"first": Layer()}
+        self.shape = (1, 2)
+        self.path = Path("/tmp/data")
+        self.color = Color.RED
+        self.dc = DataclassWrapper(MyDataclass)
+
+    def finalize(self):
+        self.shape = tuple(self.shape)
+
+
+class TestFromDict(unittest.TestCase):
+    def test_round_trip(self):
+        model = Model()
+        model.head = Head()
+        model.head.size = 3
+        model.dropout = 0.5
+        model.by_name["first"].dim = 16
+        model.shape = (3, 4, 5)
+        model.path = Path("/tmp/other")
+        model.color = Color.BLUE
+        model.dc.x = 2
+        model.layers.append(7)
+
+        restored = Model.from_dict(model.to_dict())
+        self.assertEqual(restored.to_dict(), model.to_dict())
+        self.assertEqual(restored.fingerprint(), model.fingerprint())
+
+        self.assertIsInstance(restored.head, Head)
+        self.assertIsInstance(restored.layers[1], Layer)
+        self.assertIsInstance(restored.by_name["first"], Layer)
+        self.assertEqual(restored.shape, (3, 4, 5))
+        self.assertEqual(restored.path, Path("/tmp/other"))
+        self.assertIs(restored.color, Color.BLUE)
+        self.assertEqual(restored.dc.build(), MyDataclass(2))
+
+    def test_annotations_are_cast(self):
+        restored = Layer.from_dict({"dim": "32", "act": "gelu", "extra": [1]})
+        self.assertEqual(restored.dim, 32)
+        self.assertEqual(restored.act, "gelu")
+        self.assertEqual(restored.extra, [1])
+
+    def test_missing_fields_keep_defaults(self):
+        restored = Model.from_dict({"dropout": 0.3})
+        self.assertEqual(restored.dropout, 0.3)
+        self.assertEqual(len(restored.layers), 2)
+
+    def test_yaml(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            models = []
+            for dim in range(3):
+                model = Model()
+                model.head = Head()
+                model.layers[0].dim = dim
+                models.append(model)
+
+            model_path = Path(tmp_dir) / "model.yaml"
+            models[1].save_yaml(model_path)
+            self.assertEqual(Model.load_yaml(model_path).to_dict(), models[1].to_dict())
+
+            all_path = Path(tmp_dir) / "all.yaml"
+            with open(all_path, "w") as f:
+                yaml.dump_all([m.to_dict() for m in models], f)
+
+            restored = Model.load_yaml_all(all_path)
+            self.assertEqual([m.layers[0].dim for m in restored], [0, 1, 2])
+            self.assertEqual(
+                [m.fingerprint() for m in restored], [m.fingerprint() for m in models]
+            )
+            # each restored config is independent
+            self.assertIsNot(restored[0].layers, restored[1].layers)
+            self.assertIsNot(restored[0].dc, restored[1].dc)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+import pydra
+from pydra import BatchingSink, Config, apply_overrides, compile_overrides, observe
+from pydra.hooks import add_observer, remove_observer
+
+
+class ClampedInt(int):
+    def __new__(cls, value):
+        return int(min(int(value), 10))
+
+
+class Child(Config):
+    def __init__(self):
+        self.n = 1
+
+
+class HookConfig(Config):
+    lr: float = 0.1
+
+    def __init__(self):
+        super().__init__()
+        self.child = Child()
+        self.items = {"a": 1}
+
+    def scale(self, factor):
+        self.lr *= factor
+
+
+class TestHooks(unittest.TestCase):
+    def test_events(self):
+        events = []
+        with observe(events.append):
+            apply_overrides(HookConfig(), ["lr=1", "child.n=2", ".scale(3)"])
+
+        self.assertEqual(
+            [(e.kind, e.key) for e in events],
+            [
+                ("before_assign", "lr"),
+                ("coerce", "lr"),
+                ("after_assign", "lr"),
+                ("before_assign", "child.n"),
+                ("after_assign", "child.n"),
+                ("before_method_call", "scale"),
+                ("after_method_call", "scale"),
+                ("enforce_required", ""),
+                ("before_finalize", "child"),
+                ("after_finalize", "child"),
+                ("before_finalize", ""),
+                ("after_finalize", ""),
+            ],
+        )
+
+        before, coerce, after = events[:3]
+        self.assertEqual((before.value, before.old_value), (1, 0.1))
+        self.assertEqual((coerce.value, coerce.old_value), (1.0, 1))
+        self.assertIsInstance(coerce.value, float)
+        self.assertEqual((after.value, after.old_value), (1.0, 0.1))
+        self.assertEqual(events[5].value, ([3], {}))
+
+    def test_same_type_coercion(self):
+        class Clamped(Config):
+            size: ClampedInt = 5
+
+        events = []
+        with observe(events.append):
+            apply_overrides(Clamped(), ["size=100", "size=3"], finalize=False)
+
+        coerced = [(e.value, e.old_value) for e in events if e.kind == "coerce"]
+        self.assertEqual(coerced, [(10, 100)])
+
+    def test_plans(self):
+        events = []
+        plan = compile_overrides(HookConfig, ["items.a=2"])
+        with observe(events.append):
+            plan.apply(HookConfig(), finalize=False)
+
+        self.assertEqual(
+            [(e.kind, e.key, e.value, e.old_value) for e in events[:2]],
+            [("before_assign", "items.a", 2, 1), ("after_assign", "items.a", 2, 1)],
+        )
+
+    def test_registration(self):
+        events = []
+        add_observer(events.append)
+        try:
+            apply_overrides(HookConfig(), ["lr=1"], finalize=False)
+        finally:
+            remove_observer(events.append)
+        self.assertEqual(pydra.hooks.OBSERVERS, ())
+
+        count = len(events)
+        apply_overrides(HookConfig(), ["lr=1"])
+        self.assertEqual(len(events), count)
+
+    def test_batching_sink(self):
+        batches = []
+        sink = BatchingSink(batches.append, batch_size=2, kinds=["after_assign"])
+        with observe(sink):
+            apply_overrides(HookConfig(), ["lr=1", "lr=2", "lr=3"])
+
+        self.assertEqual([[e.value for e in b] for b in batches], [[1.0, 2.0], [3.0]])
+
+        with self.assertRaises(ValueError):
+            BatchingSink(batches.append, kinds=["assign"])
+
+
+if __name__ == "__main__":
+    unittest.main()
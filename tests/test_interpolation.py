@@ -0,0 +1,280 @@
+import unittest
+from dataclasses import dataclass
+
+import pydra
+from pydra import (
+    Config,
+    DataclassWrapper,
+    InterpolationError,
+    Ref,
+    apply_overrides,
+    compile_overrides,
+)
+from pydra.config import finalize_tree
+from pydra.interpolation import compile_template, resolution_order
+
+
+@dataclass
+class Optimizer:
+    lr: float = 0.1
+    name: str = "adam"
+
+
+class Model(Config):
+    def __init__(self):
+        self.dim = Ref("dim")
+        self.name = "model${dim}"
+        self.sizes = ["${dim}", 4]
+        self.extra = {"hidden": "${model.dim}"}
+
+
+class Root(Config):
+    width: int = "${model.dim}"
+    label: str = "${dim}"
+
+    def __init__(self):
+        super().__init__()
+        self.lr = 0.5
+        self.dim = 16
+        self.model = Model()
+        self.optimizer = DataclassWrapper(Optimizer)
+        self.optimizer.lr = "${lr}"
+        self.optimizer.name = "${model.name}-${width}"
+
+    def finalize(self):
+        self.seen_width = self.width
+
+
+class TestInterpolation(unittest.TestCase):
+    def test_resolved_after_overrides(self):
+        config = Root()
+        apply_overrides(config, ["dim=32"])
+
+        self.assertEqual(config.model.dim, 32)
+        self.assertEqual(config.model.name, "model32")
+        self.assertEqual(config.model.sizes, [32, 4])
+        self.assertEqual(config.model.extra, {"hidden": 32})
+        self.assertEqual(config.optimizer.d, {"lr": 0.5, "name": "model32-32"})
+        # annotated fields are cast once resolved
+        self.assertEqual(config.width, 32)
+        self.assertEqual(config.label, "32")
+        # before finalize() is called
+        self.assertEqual(config.seen_width, 32)
+
+    def test_override_with_reference(self):
+        config = Root()
+        apply_overrides(config, ["dim=8", "lr=${dim}", "label=${lr}-${width}"])
+        self.assertEqual(config.lr, 8)
+        self.assertEqual(config.label, "8-8")
+        self.assertEqual(config.optimizer.d["lr"], 8)
+
+        # overriding a reference with a value skips it
+        config = Root()
+        apply_overrides(config, ["width=3"])
+        self.assertEqual(config.width, 3)
+
+    def test_references_to_configs(self):
+        class Layer(Config):
+            def __init__(self):
+                self.dim = Ref("dim")
+
+        class Shared(Config):
+            def __init__(self):
+                self.dim = 4
+                self.shared = Layer()
+                self.encoder = Ref("shared")
+                self.encoder_dim = Ref("encoder.dim")
+
+        config = Shared()
+        finalize_tree(config)
+        self.assertIs(config.encoder, config.shared)
+        self.assertEqual(config.encoder_dim, 4)
+
+    def test_errors(self):
+        def resolve(**fields):
+            class Broken(Config):
+                def __init__(self):
+                    self.__dict__.update(fields)
+
+            finalize_tree(Broken())
+
+        with self.assertRaisesRegex(InterpolationError, "a -> b -> a"):
+            resolve(a=Ref("b"), b="${a}")
+        with self.assertRaisesRegex(InterpolationError, "x -> x"):
+            resolve(x="${x}")
+        with self.assertRaisesRegex(InterpolationError, "y.0 -> y.0"):
+            resolve(y=[Ref("y")])
+        with self.assertRaisesRegex(InterpolationError, "no value at 'c.d'"):
+            resolve(c={}, x="${c.d}")
+        with self.assertRaisesRegex(InterpolationError, "tuples"):
+            resolve(a=1, t=(Ref("a"),))
+
+    def test_resolution_order(self):
+        order = resolution_order(
+            {"a": ("b.x",), "b.x": ("c",), "c": ("d",), "e.f": ("b",)}
+        )
+        self.assertEqual(order, ["c", "b.x", "a", "e.f"])
+
+    def test_symbolic_to_dict(self):
+        config = Root()
+        apply_overrides(config, ["dim=2"])
+
+        data = config.to_dict()
+        self.assertEqual(data["width"], 2)
+        self.assertEqual(data["optimizer"]["name"], "model2-2")
+
+        symbolic = config.to_dict(symbolic=True)
+        self.assertEqual(symbolic["width"], "${model.dim}")
+        self.assertEqual(symbolic["model"]["dim"], "${dim}")
+        self.assertEqual(symbolic["model"]["sizes"], ["${dim}", 4])
+        self.assertEqual(symbolic["model"]["extra"], {"hidden": "${model.dim}"})
+        self.assertEqual(symbolic["optimizer"]["lr"], "${lr}")
+        self.assertEqual(config.model.to_dict(symbolic=True)["name"], "model${dim}")
+
+        # values assigned since then are shown as they are
+        config.width = 7
+        self.assertEqual(config.to_dict(symbolic=True)["width"], 7)
+
+        restored = Root.from_dict(symbolic)
+        finalize_tree(restored)
+        self.assertEqual(restored.to_dict(), data)
+
+    def test_templates_in_init(self):
+        class Plain(Config):
+            def __init__(self):
+                self.a = 1
+                self.b = "${a}"
+
+        config = Plain()
+        finalize_tree(config)
+        self.assertEqual(config.b, 1)
+
+    def test_copy_on_write(self):
+        base = Root()
+        clone = base.clone(copy_on_write=True)
+        apply_overrides(clone, ["dim=8"])
+        self.assertEqual(clone.model.sizes, [8, 4])
+        self.assertEqual(base.model.sizes, ["${dim}", 4])
+        self.assertEqual(base.model.dim, Ref("dim"))
+
+    def test_fingerprint(self):
+        config = Root()
+        before = config.fingerprint()
+        apply_overrides(config, [])
+        self.assertNotEqual(config.fingerprint(), before)
+        self.assertEqual(
+            config.fingerprint(), pydra.config._clone(config, {}).fingerprint()
+        )
+
+    def test_escape(self):
+        class Shell(Config):
+            def __init__(self):
+                self.user = "me"
+                self.cmd = "echo $${HOME} ${user}"
+                self.literal = "$${user}"
+
+        config = Shell()
+        apply_overrides(config, [])
+        self.assertEqual(config.cmd, "echo ${HOME} me")
+        self.assertEqual(config.literal, "${user}")
+        self.assertEqual(config.to_dict(symbolic=True)["cmd"], "echo $${HOME} ${user}")
+
+        # resolved values aren't read as references when finalizing again
+        apply_overrides(config, ["user=you"])
+        self.assertEqual(config.cmd, "echo ${HOME} you")
+        self.assertEqual(config.literal, "${user}")
+
+        clone = config.clone()
+        apply_overrides(clone, ["user=them"])
+        self.assertEqual(clone.cmd, "echo ${HOME} them")
+        self.assertEqual(config.cmd, "echo ${HOME} you")
+
+        config = Shell()
+        apply_overrides(config, ["cmd=$${PATH}"])
+        self.assertEqual(config.cmd, "${PATH}")
+
+        config = Root()
+        apply_overrides(config, ["optimizer.name=$${name}"])
+        self.assertEqual(config.optimizer.d["name"], "${name}")
+
+    def test_resolved_again(self):
+        config = Root()
+        apply_overrides(config, ["dim=128"])
+        self.assertEqual(config.model.dim, 128)
+
+        apply_overrides(config, ["dim=256"])
+        self.assertEqual(config.model.dim, 256)
+        self.assertEqual(config.width, 256)
+        self.assertEqual(config.model.sizes, [256, 4])
+        self.assertEqual(config.optimizer.d["name"], "model256-256")
+
+        # unless they've been overwritten since
+        apply_overrides(config, ["model.dim=3", "dim=512"])
+        self.assertEqual(config.model.dim, 3)
+        self.assertEqual(config.width, 3)
+        self.assertEqual(config.label, "512")
+
+    def test_references_assigned_later(self):
+        class Plain(Config):
+            def __init__(self):
+                self.a = 1
+                self.b = 2
+                self.items = []
+
+            def add(self, value):
+                self.items.append(value)
+
+        # finalizing instances without references doesn't stop later ones
+        # from being looked through
+        apply_overrides(Plain(), [])
+
+        config = Plain()
+        config.b = "${a}"
+        apply_overrides(config, ["a=5", ".add(${a})"])
+        self.assertEqual(config.b, 5)
+        self.assertEqual(config.items, [5])
+
+        config = Plain()
+        config.items.append("${a}")
+        finalize_tree(config)
+        self.assertEqual(config.items, [1])
+
+    def test_assigned_values_that_equal_resolved_ones(self):
+        class Small(Config):
+            def __init__(self):
+                self.a = 5
+                self.b = Ref("a")
+                self.extra = {"c": "${a}"}
+                self.optimizer = DataclassWrapper(Optimizer)
+                self.optimizer.lr = "${a}"
+
+        config = Small()
+        apply_overrides(config, [])
+        # the same (interned) objects that the references resolved to
+        apply_overrides(
+            config, ["a=7", "b=5", "extra.c=5", "optimizer.lr=5", "optimizer.name=x"]
+        )
+        self.assertEqual(config.b, 5)
+        self.assertEqual(config.extra, {"c": 5})
+        self.assertEqual(config.optimizer.d["lr"], 5)
+        self.assertEqual(
+            config.to_dict(symbolic=True),
+            {"a": 7, "b": 5, "extra": {"c": 5}, "optimizer": {"lr": 5, "name": "x"}},
+        )
+
+        config = Small()
+        apply_overrides(config, [])
+        compile_overrides(Small, ["a=7", "extra.c=5"]).apply(config)
+        self.assertEqual(config.extra, {"c": 5})
+        self.assertEqual(config.b, 7)
+
+    def test_compiled_once(self):
+        self.assertIs(compile_template("${a}-${b}"), compile_template("${a}-${b}"))
+        self.assertEqual(compile_template("${a}-${b}").parts, ("", "-", ""))
+        self.assertIsNone(compile_template("no references, just $ and {}"))
+        self.assertEqual(compile_template("$${a}-${b}").parts, ("${a}-", ""))
+        self.assertEqual(compile_template("$${a}").paths, ())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+
+import pydra
+from pydra import Config, Lazy, SlotsConfig, apply_overrides, observe
+from pydra.cli import show_config
+from pydra.config import unresolved_lazy_fields
+
+CALLS = []
+
+
+def load_vocab():
+    CALLS.append("vocab")
+    return ["a", "b", "c"]
+
+
+class Child(Config):
+    def __init__(self):
+        self.dim = 4
+        self.finalized = False
+
+    def finalize(self):
+        self.finalized = True
+
+
+def make_child():
+    CALLS.append("child")
+    return Child()
+
+
+class Model(Config):
+    vocab: list[str] = Lazy(load_vocab)
+    table = Lazy(lambda config: {w: i for i, w in enumerate(config.vocab)})
+    child = Lazy(make_child)
+
+    def __init__(self):
+        super().__init__()
+        self.size = 1
+
+
+class Derived(Model):
+    table = None
+
+
+class TestLazy(unittest.TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_built_on_first_access(self):
+        model = Model()
+        self.assertEqual(CALLS, [])
+        self.assertEqual(model.vocab, ["a", "b", "c"])
+        self.assertIs(model.vocab, model.vocab)
+        self.assertEqual(CALLS, ["vocab"])
+        self.assertEqual(model.table, {"a": 0, "b": 1, "c": 2})
+
+    def test_override_skips_factory(self):
+        model = Model()
+        apply_overrides(model, ["vocab=['x','y']"], finalize=False)
+        self.assertEqual(model.vocab, ["x", "y"])
+        self.assertEqual(CALLS, [])
+
+        # assigning into a lazy field needs it built
+        apply_overrides(model, ["child.dim=8"], finalize=False)
+        self.assertEqual(model.child.dim, 8)
+        self.assertEqual(CALLS, ["child"])
+
+    def test_finalize_builds(self):
+        model = Model()
+        apply_overrides(model, [], finalize=False)
+        self.assertEqual(CALLS, [])
+        self.assertEqual(unresolved_lazy_fields(model), ["vocab", "table", "child"])
+
+        apply_overrides(model, ["vocab=['x']"])
+        self.assertEqual(CALLS, ["child"])
+        self.assertEqual(model.table, {"x": 0})
+        # lazily built configs are finalized along with the rest of the tree
+        self.assertTrue(model.child.finalized)
+        self.assertEqual(unresolved_lazy_fields(model), [])
+
+    def test_subclass_override(self):
+        self.assertEqual(unresolved_lazy_fields(Derived()), ["vocab", "child"])
+        self.assertIsNone(Derived().table)
+
+    def test_serialization_leaves_lazy(self):
+        model = Model()
+        model.size = 2
+        data = model.to_dict()
+        self.assertEqual(data, {"size": 2})
+
+        restored = Model.from_dict(data)
+        self.assertEqual(unresolved_lazy_fields(restored), ["vocab", "table", "child"])
+
+        stream = io.StringIO()
+        show_config(model, "json", stream)
+        shown = json.loads(stream.getvalue())
+        self.assertEqual(shown["vocab"], "Lazy(load_vocab)")
+        self.assertEqual(CALLS, [])
+
+    def test_show_flag(self):
+        def show_fn(config: Model):
+            raise AssertionError("--show shouldn't call the function")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            pydra.run(show_fn, ["size=3", "--show=json"])
+        self.assertEqual(
+            json.loads(output.getvalue()),
+            {
+                "size": 3,
+                "vocab": "Lazy(load_vocab)",
+                "table": "Lazy(Model.<lambda>)",
+                "child": "Lazy(make_child)",
+            },
+        )
+        self.assertEqual(CALLS, [])
+
+    def test_nested_show(self):
+        class Outer(Config):
+            def __init__(self):
+                self.models = [Model()]
+
+        stream = io.StringIO()
+        show_config(Outer(), "json", stream)
+        self.assertEqual(
+            json.loads(stream.getvalue())["models"][0]["child"], "Lazy(make_child)"
+        )
+        self.assertEqual(CALLS, [])
+
+    def test_observers_dont_build(self):
+        events = []
+        with observe(events.append):
+            apply_overrides(Model(), ["vocab=['x']"], finalize=False)
+        self.assertIsInstance(events[0].old_value, Lazy)
+        self.assertEqual(CALLS, [])
+
+    def test_coerced(self):
+        model = Model()
+        apply_overrides(model, ["vocab=(1,2)"], finalize=False)
+        self.assertEqual(model.vocab, ["1", "2"])
+
+    def test_freeze_builds(self):
+        model = Model().freeze()
+        self.assertEqual(model.vocab, ["a", "b", "c"])
+        self.assertEqual(sorted(CALLS), ["child", "vocab"])
+
+    def test_slots_config(self):
+        with self.assertRaises(TypeError):
+
+            class Shard(SlotsConfig):
+                data: list = Lazy(list)
+
+
+if __name__ == "__main__":
+    unittest.main()
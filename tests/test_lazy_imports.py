@@ -0,0 +1,97 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_snippet(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+LOADED = "print(sorted(m for m in ('dill', 'yaml', 'pydantic') if m in sys.modules))"
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_import_is_light(self):
+        out = run_snippet(f"import sys, pydra; {LOADED}")
+        self.assertEqual(out, "[]")
+
+    def test_core_features_without_heavy_imports(self):
+        code = f"""
+import sys
+from dataclasses import dataclass
+import pydra
+
+@dataclass
+class DC:
+    x: int
+    y: int = 2
+
+class Conf(pydra.Config):
+    a: int = 1
+
+    def __init__(self):
+        super().__init__()
+        self.dc = pydra.DataclassWrapper(DC)
+
+conf = Conf()
+pydra.apply_overrides(conf, ["a=3", "dc.x=4"])
+assert conf.dc.build() == DC(4, 2)
+assert conf.to_dict()["a"] == 3
+{LOADED}
+"""
+        self.assertEqual(run_snippet(code), "[]")
+
+    def test_backends_imported_on_first_use(self):
+        code = f"""
+import sys, tempfile
+from pathlib import Path
+import pydra
+
+with tempfile.TemporaryDirectory() as d:
+    pydra.save_yaml({{"a": "x\\ny"}}, Path(d) / "conf.yaml")
+    assert pydra.load_yaml(Path(d) / "conf.yaml") == {{"a": "x\\ny"}}
+    pydra.save_dill([1, 2], Path(d) / "conf.dill")
+    assert pydra.load_dill(Path(d) / "conf.dill") == [1, 2]
+{LOADED}
+"""
+        self.assertEqual(run_snippet(code), "['dill', 'yaml']")
+
+    def test_rarely_used_modules_imported_on_first_use(self):
+        code = """
+import sys
+import pydra
+
+modules = ["pydra." + m for m in ("cache", "diffing", "expr", "hooks", "multirun", "parallel", "profile")]
+print(sorted(m for m in modules if m in sys.modules))
+class Conf(pydra.Config):
+    a: int = 0
+
+conf = Conf()
+pydra.apply_overrides(conf, ["a=1"])
+assert conf.a == 1
+print(sorted(m for m in modules if m in sys.modules))
+assert pydra.Profiler is sys.modules["pydra.profile"].Profiler
+assert "diff" in dir(pydra)
+try:
+    pydra.missing
+except AttributeError:
+    print("missing")
+print(sorted(m for m in modules if m in sys.modules))
+"""
+        self.assertEqual(
+            run_snippet(code).splitlines(),
+            ["[]", "[]", "missing", "['pydra.profile']"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
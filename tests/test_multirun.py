@@ -0,0 +1,118 @@
+import os
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+from pydra import Config, MultirunError, main, run
+from pydra.multirun import expand_sweep
+from pydra.parser import extract_launcher_args, split_top_level
+
+
+class SweepConfig(Config):
+    def __init__(self):
+        self.x = 1
+        self.lr = 0.1
+        self.name = "a"
+
+
+@main(SweepConfig)
+def sweep_main(config: SweepConfig):
+    if config.x < 0:
+        raise ValueError(f"negative x: {config.x}")
+    return (config.x, config.lr, config.name, os.getpid())
+
+
+def sweep_fn(config: SweepConfig):
+    return config.x * 10
+
+
+def crashing_fn(config: SweepConfig):
+    if config.x == 2:
+        # kills the worker process, breaking the pool
+        os._exit(1)
+    return config.x
+
+
+class TestSweepExpansion(unittest.TestCase):
+    def test_split_top_level(self):
+        self.assertEqual(
+            split_top_level("1,[2,3],'a,b',(4,5)"), ["1", "[2,3]", "'a,b'", "(4,5)"]
+        )
+        self.assertEqual(split_top_level("abc"), ["abc"])
+
+    def test_extract_launcher_args(self):
+        launcher_args, rest = extract_launcher_args(
+            ["x=1,2", "--multirun", "-j", "8", "y=3"]
+        )
+        self.assertTrue(launcher_args.multirun)
+        self.assertEqual(launcher_args.jobs, 8)
+        self.assertEqual(rest, ["x=1,2", "y=3"])
+
+        with self.assertRaises(ValueError):
+            extract_launcher_args(["-j", "zero"])
+
+    def test_cartesian_product(self):
+        points = list(
+            expand_sweep(["x=1,2", "--list", "l", "a,b", "list--", "lr=1e-3,1e-4"])
+        )
+        self.assertEqual(
+            points,
+            [
+                ["x=1", "--list", "l", "a,b", "list--", "lr=1e-3"],
+                ["x=1", "--list", "l", "a,b", "list--", "lr=1e-4"],
+                ["x=2", "--list", "l", "a,b", "list--", "lr=1e-3"],
+                ["x=2", "--list", "l", "a,b", "list--", "lr=1e-4"],
+            ],
+        )
+
+
+class TestMultirun(unittest.TestCase):
+    def test_multirun_in_process(self):
+        results = sweep_main(["x=1,2,3", "name=b", "--multirun", "-j", "1"])
+        self.assertEqual([r.index for r in results], [0, 1, 2])
+        self.assertEqual(
+            [r.result[:3] for r in results],
+            [(1, 0.1, "b"), (2, 0.1, "b"), (3, 0.1, "b")],
+        )
+        self.assertEqual({r.result[3] for r in results}, {os.getpid()})
+
+    def test_multirun_process_pool(self):
+        results = sweep_main(["x=1,2", "lr=1e-3,1e-4", "--multirun", "-j", "2"])
+        self.assertEqual(
+            [r.result[:2] for r in results],
+            [(1, 1e-3), (1, 1e-4), (2, 1e-3), (2, 1e-4)],
+        )
+        self.assertNotIn(os.getpid(), {r.result[3] for r in results})
+
+    def test_run_multirun(self):
+        results = run(sweep_fn, ["x=1,2", "--multirun", "-j", "2"])
+        self.assertEqual([r.result for r in results], [10, 20])
+
+    def test_failures_reported_separately(self):
+        with self.assertRaises(MultirunError) as ctx:
+            sweep_main(["x=1,-2,3,-4", "--multirun", "-j", "2"])
+
+        error = ctx.exception
+        self.assertEqual([r.ok for r in error.results], [True, False, True, False])
+        self.assertEqual([r.index for r in error.failures], [1, 3])
+        self.assertIsInstance(error.failures[0].error, ValueError)
+        self.assertIn("negative x: -2", error.failures[0].traceback)
+        self.assertIn("x=-4", str(error))
+
+    def test_broken_pool(self):
+        with self.assertRaises(MultirunError) as ctx:
+            run(crashing_fn, ["x=1,2,3,4,5,6,7,8", "--multirun", "-j", "2"])
+
+        error = ctx.exception
+        # every point is reported, whether it ran or not
+        self.assertEqual([r.index for r in error.results], list(range(8)))
+        self.assertIn(1, [r.index for r in error.failures])
+        for r in error.failures:
+            self.assertIsInstance(r.error, BrokenProcessPool)
+
+    def test_jobs_without_multirun(self):
+        with self.assertRaisesRegex(ValueError, "--multirun"):
+            run(sweep_fn, ["x=1", "-j", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from pydra import Config, apply_overrides
+from pydra import Config, Evaluator, apply_overrides
 
 
 class NestedStructConfig(Config):
@@ -74,7 +74,11 @@ class TestEndToEndNestedStructures(unittest.TestCase):
             "simple_list=([1,2] + [3,4])",
             'mixed_structure=({"a": 1, "b": 2}.items())',
         ]
-        apply_overrides(self.conf, args)
+        # method calls are only evaluated in unsafe mode
+        with self.assertRaises(ValueError):
+            apply_overrides(NestedStructConfig(), args)
+
+        apply_overrides(self.conf, args, evaluator=Evaluator(unsafe=True))
         self.assertEqual(self.conf.simple_list, [1, 2, 3, 4])
         self.assertEqual(list(self.conf.mixed_structure), [("a", 1), ("b", 2)])
 
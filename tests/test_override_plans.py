@@ -0,0 +1,125 @@
+import unittest
+from dataclasses import dataclass
+
+from pydra import Alias, Config, DataclassWrapper, compile_overrides
+
+
+@dataclass
+class MyDataclass:
+    x: int
+    y: int = 2
+
+
+class InnerConfig(Config):
+    a: int = 1
+
+    def __init__(self):
+        super().__init__()
+        self.items = {"p": 1}
+        self.short = Alias("a")
+
+
+class PlanConfig(Config):
+    def __init__(self):
+        super().__init__()
+        self.foo = 1
+        self.values = []
+        self.inner = InnerConfig()
+        self.alias_inner = Alias("inner")
+        self.dc = DataclassWrapper(MyDataclass)
+        self.finalized = False
+
+    def add_extra(self, value=3):
+        self.inner.items["extra"] = value
+
+    def finalize(self):
+        self.finalized = True
+
+
+class TestOverridePlans(unittest.TestCase):
+    def test_apply_to_many(self):
+        plan = compile_overrides(
+            PlanConfig,
+            ["foo=5", "alias_inner.short=7", "inner.items.p=2", "dc.x=4"],
+        )
+
+        for _ in range(3):
+            config = PlanConfig()
+            show = plan.apply(config)
+            self.assertFalse(show)
+            self.assertEqual(config.foo, 5)
+            self.assertEqual(config.inner.a, 7)
+            self.assertEqual(config.inner.items, {"p": 2})
+            self.assertEqual(config.dc.build(), MyDataclass(4, 2))
+            self.assertTrue(config.finalized)
+
+    def test_values_not_shared(self):
+        plan = compile_overrides(PlanConfig, ["values=[1,2]"])
+        first, second = PlanConfig(), PlanConfig()
+        plan.apply(first)
+        plan.apply(second)
+
+        first.values.append(3)
+        self.assertEqual(second.values, [1, 2])
+
+    def test_keys_created_by_method_call(self):
+        plan = compile_overrides(PlanConfig, [".add_extra", "inner.items.extra=4"])
+        config = PlanConfig()
+        plan.apply(config)
+        self.assertEqual(config.inner.items, {"p": 1, "extra": 4})
+
+    def test_show_and_finalize_flags(self):
+        plan = compile_overrides(PlanConfig, ["foo=2", "--show"])
+        config = PlanConfig()
+        self.assertTrue(plan.apply(config, enforce_required=False, finalize=False))
+        self.assertFalse(config.finalized)
+
+    def test_all_invalid_keys_reported(self):
+        with self.assertRaises(AttributeError) as ctx:
+            compile_overrides(PlanConfig, ["nope=1", "foo=2", "inner.missing=3"])
+
+        message = str(ctx.exception)
+        self.assertIn("'nope'", message)
+        self.assertIn("'inner.missing'", message)
+
+    def test_invalid_values_reported(self):
+        with self.assertRaises(AttributeError) as ctx:
+            compile_overrides(
+                PlanConfig, ["inner.a=abc", "nope=1", "foo=2", "inner.missing=3"]
+            )
+
+        message = str(ctx.exception)
+        self.assertIn("inner.a: CoercionError", message)
+        self.assertIn("'nope'", message)
+        self.assertIn("'inner.missing'", message)
+
+        with self.assertRaises(ValueError) as ctx:
+            compile_overrides(PlanConfig, ["inner.a=abc", "inner.a=[1]"])
+        self.assertEqual(str(ctx.exception).count("inner.a: "), 2)
+
+        # a single bad value is raised as it is
+        with self.assertRaisesRegex(ValueError, "abc"):
+            compile_overrides(PlanConfig, ["inner.a=abc"])
+
+    def test_falls_back_when_shape_differs(self):
+        plan = compile_overrides(PlanConfig, ["inner.items.p=5"])
+        config = PlanConfig()
+        config.inner = {"items": {"p": 0}}
+        plan.apply(config, finalize=False)
+        self.assertEqual(config.inner, {"items": {"p": 5}})
+
+    def test_falls_back_when_alias_replaced(self):
+        plan = compile_overrides(PlanConfig, ["alias_inner.short=5"])
+        config = PlanConfig()
+        config.inner.short = 0
+        plan.apply(config)
+        self.assertEqual((config.inner.short, config.inner.a), (5, 1))
+
+    def test_wrong_config_type(self):
+        plan = compile_overrides(PlanConfig, ["foo=2"])
+        with self.assertRaises(ValueError):
+            plan.apply(InnerConfig())
+
+
+if __name__ == "__main__":
+    unittest.main()
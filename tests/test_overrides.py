@@ -2,6 +2,7 @@ import unittest
 from dataclasses import dataclass
 
 from pydra import REQUIRED, Alias, Config, DataclassWrapper, apply_overrides
+from pydra.cli import _ACCESSOR_CACHE, drill_through_objects
 
 
 class TestConfig(Config):
@@ -291,5 +292,73 @@ class TestNestedConfig(unittest.TestCase):
         self.assertEqual(self.conf.inner.further_inner.x, 11)
 
 
+class DictGrowingConfig(Config):
+    def __init__(self):
+        self.d = {"a": 1}
+        self.nested = NestedConfig()
+
+    def add_key(self):
+        self.d["b"] = 0
+
+
+class TestAccessorCache(unittest.TestCase):
+    def test_accessor_cached_with_aliases_resolved(self):
+        conf = ComplexTestConfig()
+        apply_overrides(conf, ["alias_nest.short_name=7"])
+
+        accessor = _ACCESSOR_CACHE[(ComplexTestConfig, "alias_nest.short_name")]
+        self.assertEqual(accessor.final_hop[1], "long_name")
+
+        other = ComplexTestConfig()
+        self.assertEqual(accessor.resolve(other), (other.nested, "long_name"))
+        apply_overrides(other, ["alias_nest.short_name=8"])
+        self.assertEqual(other.nested.long_name, 8)
+
+    def test_fallback_when_dict_key_added(self):
+        conf = DictGrowingConfig()
+        apply_overrides(conf, [".add_key", "d.b=2"])
+        self.assertEqual(conf.d, {"a": 1, "b": 2})
+
+        # same key, but on a config whose dict doesn't have it yet
+        with self.assertRaises(AttributeError):
+            apply_overrides(DictGrowingConfig(), ["d.b=2"])
+
+    def test_fallback_when_types_differ(self):
+        conf = DictGrowingConfig()
+        apply_overrides(conf, ["nested.nested_value=x"])
+
+        other = DictGrowingConfig()
+        other.nested = {"nested_value": "y"}
+        self.assertEqual(
+            drill_through_objects(other, "nested.nested_value"),
+            (other.nested, "nested_value"),
+        )
+        apply_overrides(other, ["nested.nested_value=z"])
+        self.assertEqual(other.nested, {"nested_value": "z"})
+
+    def test_fallback_when_aliases_differ(self):
+        apply_overrides(ComplexTestConfig(), ["short_name=7", "alias_nest.long_name=1"])
+
+        # an alias assigned over with a value is written to, not followed
+        other = ComplexTestConfig()
+        other.short_name = 0
+        apply_overrides(other, ["short_name=7"])
+        self.assertEqual((other.short_name, other.long_name), (7, 5))
+
+        # and a name that now holds an alias is followed
+        other = ComplexTestConfig()
+        other.long_name = Alias("short_name")
+        other.short_name = 3
+        other.alias_nest = other.nested
+        apply_overrides(other, ["long_name=4", "alias_nest.long_name=1"])
+        self.assertEqual(other.short_name, 4)
+        self.assertEqual(other.nested.long_name, 1)
+
+        other = ComplexTestConfig()
+        other.alias_nest = Alias("normal_dict")
+        with self.assertRaises(AttributeError):
+            apply_overrides(other, ["alias_nest.long_name=1"])
+
+
 if __name__ == "__main__":
     unittest.main()
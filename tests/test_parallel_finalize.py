@@ -0,0 +1,127 @@
+import threading
+import unittest
+
+import pydra
+from pydra import (
+    Config,
+    FinalizeError,
+    ParallelFinalize,
+    Profiler,
+    apply_overrides,
+    observe,
+)
+
+ORDER = []
+LOCK = threading.Lock()
+
+
+def record(name: str):
+    with LOCK:
+        ORDER.append(name)
+
+
+class Loader(Config):
+    def __init__(self):
+        self.name = "loader"
+        self.barrier = None
+        self.fail = False
+        self.loaded = False
+
+    def finalize(self):
+        if self.barrier is not None:
+            # only passes if the other sibling is finalizing at the same time
+            self.barrier.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError(f"can't load {self.name}")
+        self.loaded = True
+        record(self.name)
+
+
+class Pipeline(Config):
+    def __init__(self):
+        self.tokenizer = Loader()
+        self.tokenizer.name = "tokenizer"
+        self.dataset = Loader()
+        self.dataset.name = "dataset"
+        self.shards = [Loader(), Loader()]
+        self.shards[0].name = "shard0"
+        self.shards[1].name = "shard1"
+        self.shared = self.tokenizer
+
+    def finalize(self):
+        assert self.tokenizer.loaded and self.dataset.loaded
+        assert all(s.loaded for s in self.shards)
+        record("pipeline")
+
+
+def finalized_fn(config: Pipeline):
+    return config.dataset.loaded
+
+
+class TestParallelFinalize(unittest.TestCase):
+    def setUp(self):
+        ORDER.clear()
+
+    def test_siblings_run_concurrently(self):
+        config = Pipeline()
+        barrier = threading.Barrier(2)
+        config.tokenizer.barrier = barrier
+        config.dataset.barrier = barrier
+
+        with ParallelFinalize(max_workers=4) as parallel:
+            apply_overrides(config, ["dataset.name=data"])
+
+        # the shared tokenizer is finalized once, and the root last
+        self.assertEqual(
+            sorted(ORDER), ["data", "pipeline", "shard0", "shard1", "tokenizer"]
+        )
+        self.assertEqual(ORDER[-1], "pipeline")
+        self.assertEqual(
+            {t.path for t in parallel.timings},
+            {"", "tokenizer", "dataset", "shards.0", "shards.1"},
+        )
+        self.assertIsNone(pydra.parallel.ACTIVE)
+
+    def test_errors_are_aggregated(self):
+        config = Pipeline()
+        config.dataset.fail = True
+        config.shards[1].fail = True
+
+        with self.assertRaises(FinalizeError) as caught:
+            with ParallelFinalize():
+                apply_overrides(config, [])
+
+        error = caught.exception
+        self.assertEqual(
+            sorted(path for path, _ in error.errors), ["dataset", "shards.1"]
+        )
+        self.assertIsInstance(error.errors[0][1], RuntimeError)
+        self.assertEqual(error.skipped, [""])
+        self.assertIn("dataset: RuntimeError: can't load dataset", str(error))
+        # siblings of the failures still finish
+        self.assertTrue(config.tokenizer.loaded)
+        self.assertTrue(config.shards[0].loaded)
+
+    def test_profiler_and_observers(self):
+        events = []
+        with Profiler() as profiler, ParallelFinalize(max_workers=2):
+            with observe(events.append):
+                self.assertTrue(pydra.run(finalized_fn, []))
+
+        self.assertEqual(len(profiler.nodes), 5)
+        self.assertIn("finalize", profiler.phases)
+
+        finalize_events = [(e.kind, e.key) for e in events if "finalize" in e.kind]
+        self.assertEqual(len(finalize_events), 10)
+        self.assertEqual(finalize_events[-1], ("after_finalize", ""))
+        for _, key in finalize_events:
+            before = finalize_events.index(("before_finalize", key))
+            self.assertLess(before, finalize_events.index(("after_finalize", key)))
+
+    def test_max_workers(self):
+        with self.assertRaises(ValueError):
+            ParallelFinalize(max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
+import gc
 import pickle
 import unittest
+import weakref
 from copy import deepcopy
 from dataclasses import dataclass
 
@@ -79,3 +81,116 @@ class TestPickle(unittest.TestCase):
         inner_copy = conf_copy.inner.build()
         self.assertEqual(inner_copy.x, 111)
         self.assertEqual(inner_copy.y, "bstring")
+
+
+class Leaf(pydra.Config):
+    def __init__(self):
+        self.x = 1
+        self.name = "leaf"
+        self.values = [1, 2]
+        self.required = pydra.REQUIRED
+
+
+class FinalizingLeaf(pydra.Config):
+    def __init__(self):
+        self.x = 1
+        self.total = None
+
+    def finalize(self):
+        self.total = self.x * 10
+
+
+class Tree(pydra.Config):
+    def __init__(self):
+        self.a = Leaf()
+        self.b = Leaf()
+        self.same_a = self.a
+        self.mapping = {"k": Leaf()}
+        self.inner = pydra.DataclassWrapper(MyClass)
+        self.finalizing = FinalizingLeaf()
+
+    def bump_a(self):
+        self.a.x += 100
+
+
+class TestClone(unittest.TestCase):
+    def setUp(self):
+        self.tree = Tree()
+
+    def test_clone_is_independent(self):
+        clone = self.tree.clone()
+        self.assertIsNot(clone.a, self.tree.a)
+        self.assertIsNot(clone.a.values, self.tree.a.values)
+        self.assertIs(clone.a.name, self.tree.a.name)
+        self.assertIs(clone.same_a, clone.a)
+        self.assertIs(clone.a.required, pydra.REQUIRED)
+
+        pydra.apply_overrides(
+            clone,
+            ["a.x=5", "mapping.k.x=6", "inner.x=7", "a.required=0", "b.required=0"],
+            enforce_required=False,
+        )
+        self.assertEqual(self.tree.a.x, 1)
+        self.assertEqual(self.tree.mapping["k"].x, 1)
+        self.assertIs(self.tree.inner.x, pydra.REQUIRED)
+        self.assertEqual(clone.inner.build(), MyClass(7))
+
+    def test_required_survives_copies(self):
+        self.assertIs(deepcopy(self.tree).a.required, pydra.REQUIRED)
+        self.assertIs(pickle.loads(pickle.dumps(self.tree)).a.required, pydra.REQUIRED)
+
+    def test_copy_on_write_shares_until_written(self):
+        clone = self.tree.clone(copy_on_write=True)
+        self.assertIs(clone.a, self.tree.a)
+        self.assertIs(clone.mapping, self.tree.mapping)
+
+        pydra.apply_overrides(
+            clone, ["mapping.k.x=5"], enforce_required=False, finalize=False
+        )
+        self.assertEqual(clone.mapping["k"].x, 5)
+        self.assertEqual(self.tree.mapping["k"].x, 1)
+        self.assertIs(clone.a, self.tree.a)
+        self.assertIs(clone.mapping["k"].values, self.tree.mapping["k"].values)
+
+        # writes to the source are isolated from the clone too
+        pydra.apply_overrides(
+            self.tree, ["a.x=3"], enforce_required=False, finalize=False
+        )
+        self.assertEqual(self.tree.a.x, 3)
+        self.assertEqual(clone.a.x, 1)
+
+    def test_copy_on_write_clones_are_collected(self):
+        clone = self.tree.clone(copy_on_write=True)
+        pydra.apply_overrides(
+            clone, ["mapping.k.x=5"], enforce_required=False, finalize=False
+        )
+        ref = weakref.ref(clone)
+        del clone
+        gc.collect()
+        self.assertIsNone(ref())
+
+        # and so is the source, once it's unreachable
+        ref = weakref.ref(self.tree)
+        self.tree.clone(copy_on_write=True)
+        self.tree = None
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_copy_on_write_method_call(self):
+        clone = self.tree.clone(copy_on_write=True)
+        pydra.apply_overrides(
+            clone, [".bump_a"], enforce_required=False, finalize=False
+        )
+        self.assertEqual(clone.a.x, 101)
+        self.assertEqual(self.tree.a.x, 1)
+        self.assertIs(clone.same_a, clone.a)
+
+    def test_copy_on_write_finalize(self):
+        clone = self.tree.clone(copy_on_write=True)
+        plan = pydra.compile_overrides(Tree, ["finalizing.x=2"])
+        plan.apply(clone, enforce_required=False)
+
+        self.assertEqual(clone.finalizing.total, 20)
+        self.assertIsNone(self.tree.finalizing.total)
+        # subtrees without a custom finalize stay shared
+        self.assertIs(clone.b, self.tree.b)
@@ -0,0 +1,92 @@
+import io
+import pstats
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+import pydra
+from pydra import Config, Profiler, apply_overrides, run
+
+
+class Tokenizer(Config):
+    def __init__(self):
+        self.vocab = 10
+        self.loaded = False
+
+    def finalize(self):
+        self.loaded = True
+
+
+class Root(Config):
+    def __init__(self):
+        self.tokenizer = Tokenizer()
+        self.layers = [Tokenizer()]
+        self.lr = 0.1
+
+    def double_lr(self):
+        self.lr *= 2
+
+
+def profiled_fn(config: Root):
+    return config.lr
+
+
+class TestProfile(unittest.TestCase):
+    def test_phases_and_nodes(self):
+        config = Root()
+        with Profiler() as profiler:
+            apply_overrides(config, ["lr=0.5", ".double_lr"])
+
+        self.assertEqual(config.lr, 1.0)
+        self.assertTrue(config.tokenizer.loaded)
+        self.assertEqual(
+            set(profiler.phases), {"parse", "apply", "enforce_required", "finalize"}
+        )
+
+        timed = {(t.path, t.kind) for t in profiler.nodes}
+        self.assertEqual(
+            timed,
+            {
+                ("double_lr", "method"),
+                ("tokenizer", "finalize"),
+                ("layers.0", "finalize"),
+                ("", "finalize"),
+            },
+        )
+        self.assertEqual(len(profiler.slowest(2)), 2)
+        self.assertIn("<root> (finalize)", profiler.report())
+
+        # nothing is recorded outside the block
+        apply_overrides(Root(), ["lr=0.5"])
+        self.assertEqual(len(profiler.nodes), 4)
+        self.assertIsNone(pydra.profile.ACTIVE)
+
+    def test_flag(self):
+        err = io.StringIO()
+        with redirect_stderr(err):
+            self.assertEqual(run(profiled_fn, ["lr=0.3", "--pydra-profile"]), 0.3)
+
+        report = err.getvalue()
+        for phase in ["construct", "parse", "apply", "finalize", "call"]:
+            self.assertIn(phase, report)
+        self.assertIn("tokenizer (finalize)", report)
+
+    def test_stats_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "run.prof"
+            with redirect_stderr(io.StringIO()):
+                run(profiled_fn, [f"--pydra-profile={path}"])
+
+            stats = pstats.Stats(str(path))
+            self.assertTrue(
+                any(fn_name == "profiled_fn" for _, _, fn_name in stats.stats)
+            )
+
+    def test_multirun_unsupported(self):
+        with self.assertRaises(ValueError):
+            run(profiled_fn, ["lr=1,2", "--multirun", "--pydra-profile"])
+
+
+if __name__ == "__main__":
+    unittest.main()
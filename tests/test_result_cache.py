@@ -0,0 +1,142 @@
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pydra import Config, ResultCache, main, run
+
+
+class CachedConfig(Config):
+    def __init__(self):
+        self.x = 1
+        self.name = "a"
+
+
+CALLS = []
+
+
+def cached_fn(config: CachedConfig):
+    CALLS.append(config.x)
+    return {"x": config.x, "name": config.name}
+
+
+class Model:
+    pass
+
+
+class ModelConfig(Config):
+    def __init__(self):
+        self.x = 1
+
+    def finalize(self):
+        self.model = Model()
+
+
+def hammer(cache_dir: str, worker: int):
+    # many processes reading and writing the same few keys at once
+    cache = ResultCache(cache_dir, max_entries=3)
+    for i in range(30):
+        key = f"key{(i + worker) % 5}"
+        hit, value = cache.get(key)
+        if hit:
+            assert value == key * 1000, value
+        cache.put(key, key * 1000)
+    return True
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp_dir.name) / "cache"
+        CALLS.clear()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_main_cache(self):
+        @main(CachedConfig, cache_dir=self.cache_dir)
+        def entry(config: CachedConfig):
+            return cached_fn(config)
+
+        self.assertEqual(entry(["x=2"]), {"x": 2, "name": "a"})
+        self.assertEqual(entry(["x=2"]), {"x": 2, "name": "a"})
+        self.assertEqual(entry(["x=3"]), {"x": 3, "name": "a"})
+        self.assertEqual(CALLS, [2, 3])
+
+    def test_run_cache(self):
+        cache = ResultCache(self.cache_dir, serializer="dill")
+        self.assertEqual(run(cached_fn, ["name=b"], cache=cache)["name"], "b")
+        self.assertEqual(run(cached_fn, ["name=b"], cache=cache)["name"], "b")
+        self.assertEqual(CALLS, [1])
+        self.assertEqual(len(cache), 1)
+
+    def test_multirun_cache(self):
+        run(cached_fn, ["x=1,2", "--multirun", "-j", "1"], cache_dir=self.cache_dir)
+        results = run(
+            cached_fn, ["x=1,2,3", "--multirun", "-j", "1"], cache_dir=self.cache_dir
+        )
+        self.assertEqual([r.result["x"] for r in results], [1, 2, 3])
+        self.assertEqual(CALLS, [1, 2, 3])
+
+    def test_unfingerprintable_config(self):
+        @main(ModelConfig, cache_dir=self.cache_dir)
+        def entry(config: ModelConfig):
+            return config.x
+
+        with self.assertWarnsRegex(UserWarning, "model: Can't fingerprint"):
+            self.assertEqual(entry(["x=2"]), 2)
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            main(CachedConfig, cache_dir=self.cache_dir, cache=ResultCache("x"))
+        with self.assertRaises(ValueError):
+            ResultCache(self.cache_dir, serializer="json")
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = ResultCache(self.cache_dir)
+        cache.put("key", 1)
+        cache._path("key").write_bytes(b"garbage")
+        self.assertEqual(cache.get("key"), (False, None))
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(self.cache_dir, max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        # make "b" the oldest entry, then use "a"
+        old = time.time() - 100
+        os.utime(cache._path("a"), (old, old))
+        os.utime(cache._path("b"), (old - 1, old - 1))
+        self.assertEqual(cache.get("a"), (True, 1))
+
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.get("a"), (True, 1))
+
+    def test_evicts_by_size(self):
+        cache = ResultCache(self.cache_dir, max_bytes=2500)
+        for i in range(5):
+            cache.put(str(i), b"x" * 1000)
+        self.assertEqual(len(cache), 2)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_concurrent_access(self):
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(hammer, str(self.cache_dir), i) for i in range(4)
+            ]
+            self.assertTrue(all(f.result() for f in futures))
+
+        names = os.listdir(self.cache_dir)
+        self.assertLessEqual(len([n for n in names if n.endswith(".result")]), 3)
+        self.assertFalse([n for n in names if n.startswith(".tmp-")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import yaml
+
+from pydra import Config, load_yaml, run, save_yaml
+from pydra.parser import parse
+from pydra.utils import _yaml_dumper
+
+
+class ShowConfig(Config):
+    def __init__(self):
+        self.x = 1
+        self.prompt = "first line\nsecond line\n"
+        self.items = [1, "two"]
+
+
+def show_fn(config: ShowConfig):
+    raise AssertionError("--show shouldn't call the function")
+
+
+def capture_show(args: list[str]) -> str:
+    out = io.StringIO()
+    with redirect_stdout(out):
+        run(show_fn, args)
+    return out.getvalue()
+
+
+class TestShow(unittest.TestCase):
+    def test_parse_show_format(self):
+        self.assertEqual(parse(["--show"]).show_format, "yaml")
+        parsed = parse(["--show=json"])
+        self.assertTrue(parsed.show)
+        self.assertEqual(parsed.show_format, "json")
+
+        with self.assertRaises(ValueError):
+            parse(["--show=toml"])
+
+    def test_show_yaml(self):
+        output = capture_show(["x=2", "--show"])
+        self.assertIn("prompt: |\n  first line\n  second line\n", output)
+        self.assertEqual(
+            yaml.safe_load(output),
+            {"x": 2, "prompt": "first line\nsecond line\n", "items": [1, "two"]},
+        )
+
+    def test_show_json(self):
+        output = capture_show(["x=3", "--show=json"])
+        self.assertEqual(
+            json.loads(output),
+            {"x": 3, "prompt": "first line\nsecond line\n", "items": [1, "two"]},
+        )
+
+    def test_save_yaml(self):
+        if hasattr(yaml, "CDumper"):
+            self.assertTrue(issubclass(_yaml_dumper(), yaml.CDumper))
+
+        data = {"prompt": "a\nb", "plain": "a b", "nested": [{"c": "x\ny\n"}]}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "data.yaml"
+            save_yaml(data, path)
+            self.assertIn("prompt: |-\n  a\n  b\n", path.read_text())
+            self.assertEqual(load_yaml(path), data)
+
+            save_yaml(data, path, transform=False)
+            self.assertNotIn("|", path.read_text())
+            self.assertEqual(load_yaml(path), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
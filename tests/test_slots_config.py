@@ -0,0 +1,128 @@
+import copy
+import pickle
+import sys
+import tracemalloc
+import unittest
+
+import dill
+
+from pydra import REQUIRED, Config, SlotsConfig, apply_overrides, iter_configs
+
+
+class Shard(SlotsConfig):
+    path: str = REQUIRED
+    weight: float = 1.0
+    loaded: bool = False
+
+    def finalize(self):
+        self.loaded = True
+
+
+class BigShard(Shard):
+    replicas: int = 2
+
+
+class Dataset(SlotsConfig):
+    shards: dict
+    name: str = "data"
+
+    def __init__(self):
+        super().__init__()
+        self.shards = {"a": BigShard(), "b": Shard()}
+        for name, shard in self.shards.items():
+            shard.path = name
+
+
+class DictShard(Config):
+    path: str = REQUIRED
+    weight: float = 1.0
+    loaded: bool = False
+
+    def __init__(self):
+        super().__init__()
+
+
+class TestSlotsConfig(unittest.TestCase):
+    def test_fields(self):
+        shard = BigShard()
+        self.assertFalse(hasattr(shard, "__dict__"))
+        self.assertIs(shard.path, REQUIRED)
+        self.assertEqual((shard.weight, shard.replicas), (1.0, 2))
+
+        with self.assertRaises(AttributeError):
+            shard.unannotated = 1
+
+    def test_overrides(self):
+        dataset = Dataset()
+        apply_overrides(
+            dataset, ["name=train", "shards.a.weight=3", "shards.b.weight=1"]
+        )
+        self.assertEqual(dataset.name, "train")
+        self.assertEqual(dataset.shards["a"].weight, 3.0)
+        self.assertIsInstance(dataset.shards["a"].weight, float)
+        self.assertTrue(all(shard.loaded for shard in dataset.shards.values()))
+        self.assertEqual(
+            [path for path, _ in iter_configs(dataset)], ["shards.a", "shards.b", ""]
+        )
+
+        with self.assertRaises(ValueError):
+            apply_overrides(Shard(), [])
+
+    def test_serialization(self):
+        dataset = Dataset()
+        dataset.shards["b"].weight = 0.5
+        data = dataset.to_dict()
+        self.assertEqual(
+            data["shards"]["b"], {"path": "b", "weight": 0.5, "loaded": False}
+        )
+
+        for copied in [
+            pickle.loads(pickle.dumps(dataset)),
+            dill.loads(dill.dumps(dataset)),
+            copy.deepcopy(dataset),
+            dataset.clone(),
+            Dataset.from_dict(data),
+        ]:
+            self.assertEqual(copied.to_dict(), data)
+            self.assertIsInstance(copied.shards["a"], BigShard)
+
+    def test_copy_on_write_and_fingerprint(self):
+        dataset = Dataset()
+        fingerprint = dataset.fingerprint()
+
+        clone = dataset.clone(copy_on_write=True)
+        apply_overrides(clone, ["shards.a.weight=2"], finalize=False)
+        self.assertEqual(dataset.shards["a"].weight, 1.0)
+        self.assertEqual(dataset.fingerprint(), fingerprint)
+
+        dataset.shards["b"].weight = 4.0
+        self.assertNotEqual(dataset.fingerprint(), fingerprint)
+
+    def test_memory(self):
+        def per_instance(cls):
+            # the first instances also allocate the class' schema and caches
+            warm_up = [cls() for _ in range(1000)]
+            tracemalloc.start()
+            shards = [cls() for _ in range(1000)]
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            # only count the instances (and their __dicts__), not transient
+            # objects that free lists keep allocated
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(True, __file__)])
+            allocated = sum(stat.size for stat in snapshot.statistics("filename"))
+            self.assertEqual(len(warm_up), len(shards))
+            return (allocated - sys.getsizeof(shards)) / len(shards)
+
+        # e.g. 64 vs 104 bytes on CPython 3.11
+        self.assertLess(per_instance(Shard), per_instance(DictShard) - 32)
+
+    def test_plain_configs_unaffected(self):
+        config = Config()
+        config.x = 1
+        self.assertEqual(config.to_dict(), {"x": 1})
+        self.assertTrue(hasattr(DictShard(), "__dict__"))
+        self.assertNotIsInstance(Shard(), Config)
+
+
+if __name__ == "__main__":
+    unittest.main()
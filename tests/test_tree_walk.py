@@ -0,0 +1,113 @@
+import unittest
+from dataclasses import dataclass
+
+from pydra import REQUIRED, Config, DataclassWrapper, iter_configs, iter_leaves
+
+
+@dataclass
+class MyDataclass:
+    x: int
+    y: str = "y"
+
+
+class LeafConfig(Config):
+    def __init__(self):
+        self.a = 1
+        self.required = 2
+        self.finalized = False
+
+    def finalize(self):
+        self.finalized = True
+        FINALIZE_ORDER.append(self)
+
+
+class TreeConfig(Config):
+    b: int = 3
+
+    def __init__(self):
+        super().__init__()
+        self.leaf = LeafConfig()
+        self.leaves = [LeafConfig(), 5]
+        self.mapping = {"k": LeafConfig(), "nested": {"deep": [LeafConfig()]}}
+        self.empty = []
+        self.dc = DataclassWrapper(MyDataclass)
+
+    def finalize(self):
+        FINALIZE_ORDER.append(self)
+
+
+FINALIZE_ORDER = []
+
+
+class TestTreeWalk(unittest.TestCase):
+    def setUp(self):
+        FINALIZE_ORDER.clear()
+        self.conf = TreeConfig()
+
+    def test_iter_configs_post_order(self):
+        paths = [path for path, _ in iter_configs(self.conf)]
+        self.assertEqual(
+            paths, ["leaf", "leaves.0", "mapping.k", "mapping.nested.deep.0", ""]
+        )
+
+    def test_iter_leaves(self):
+        leaves = dict(iter_leaves(self.conf))
+        self.assertEqual(leaves["b"], 3)
+        self.assertEqual(leaves["leaf.a"], 1)
+        self.assertEqual(leaves["leaves.1"], 5)
+        self.assertEqual(leaves["mapping.nested.deep.0.a"], 1)
+        self.assertEqual(leaves["empty"], [])
+        self.assertIs(leaves["dc.x"], REQUIRED)
+        self.assertEqual(leaves["dc.y"], "y")
+        self.assertNotIn("_annotations_initialized", leaves)
+        self.assertEqual(len(leaves), 17)
+
+    def test_finalize_children_first(self):
+        self.conf._recursive_finalize()
+        self.assertEqual(len(FINALIZE_ORDER), 5)
+        self.assertIs(FINALIZE_ORDER[-1], self.conf)
+        self.assertTrue(self.conf.mapping["nested"]["deep"][0].finalized)
+
+    def test_required_checked_before_finalize(self):
+        self.conf.mapping["nested"]["deep"][0].required = REQUIRED
+
+        with self.assertRaises(ValueError) as ctx:
+            self.conf._enforce_required()
+        self.assertIn("mapping.nested.deep.0.required", str(ctx.exception))
+
+        from pydra.config import finalize_tree
+
+        with self.assertRaises(ValueError):
+            finalize_tree(self.conf)
+        self.assertEqual(FINALIZE_ORDER, [])
+
+    def test_to_dict_nested_containers(self):
+        data = self.conf.to_dict()
+        self.assertEqual(data["mapping"]["nested"]["deep"][0]["a"], 1)
+        self.assertEqual(data["dc"]["y"], "y")
+        self.assertEqual(data["leaves"][1], 5)
+
+    def test_to_dict_output_unchanged(self):
+        from pydantic import BaseModel
+
+        from pydra import PydanticWrapper
+
+        class Model(BaseModel):
+            x: int = 1
+
+        self.conf.nothing = None
+        self.conf.model = PydanticWrapper(Model)
+        self.conf.mapping["none"] = None
+
+        data = self.conf.to_dict()
+        # as to_dict() has always given them
+        self.assertEqual(data["nothing"], "None")
+        self.assertEqual(data["model"], str(self.conf.model))
+        self.assertIsNone(data["mapping"]["none"])
+
+        restored = TreeConfig.from_dict(data)
+        self.assertIsNone(restored.nothing)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import array
+import importlib.util
+import unittest
+
+from pydra import Config, apply_overrides, compile_overrides
+from pydra.parser import parse
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class WeightsConfig(Config):
+    weights: array.array = array.array("d")
+
+    def __init__(self):
+        super().__init__()
+        self.schedule = []
+        self.ids = None
+
+
+def list_value(args: list[str]):
+    (command,) = parse(args).commands
+    return command.kv_pair.value
+
+
+class TestTypedLists(unittest.TestCase):
+    def test_dtypes(self):
+        value = list_value(["--list:f64", "x", "1", "2.5", "-3e2", "list--"])
+        self.assertEqual(value, array.array("d", [1, 2.5, -300]))
+
+        value = list_value(["--list:i32", "x", "1", "-2", "list--"])
+        self.assertEqual(value, array.array("i", [1, -2]))
+
+        value = list_value(["--list:u8", "x", "list--"])
+        self.assertEqual(value, array.array("B"))
+
+    def test_mixed_tokens(self):
+        value = list_value(["--list:i64", "x", "1", "(2 ** 10)", "T", "list--"])
+        self.assertEqual(value, array.array("q", [1, 1024, 1]))
+
+        for args in [
+            ["--list:i64", "x", "1.5", "list--"],
+            ["--list:u8", "x", "256", "list--"],
+            ["--list:f64", "x", "a", "list--"],
+            ["--list:f16", "x", "1", "list--"],
+        ]:
+            with self.assertRaises(ValueError, msg=args):
+                parse(args)
+
+    def test_assign(self):
+        config = WeightsConfig()
+        n = 100_000
+        apply_overrides(
+            config,
+            ["--list:f32", "schedule", *map(str, range(n)), "list--"],
+        )
+        self.assertEqual(config.schedule.typecode, "f")
+        self.assertEqual(len(config.schedule), n)
+
+        # the annotation decides the storage of untyped lists
+        apply_overrides(config, ["--list", "weights", "1", "2", "list--"])
+        self.assertEqual(config.weights, array.array("q", [1, 2]))
+        apply_overrides(config, ["weights=[0.5, 1]"])
+        self.assertEqual(config.weights, array.array("d", [0.5, 1]))
+
+    def test_plan_copies_arrays(self):
+        plan = compile_overrides(WeightsConfig, ["--list:f64", "ids", "1", "list--"])
+        first, second = WeightsConfig(), WeightsConfig()
+        plan.apply(first)
+        plan.apply(second)
+        first.ids.append(2)
+        self.assertEqual(second.ids, array.array("d", [1]))
+
+    def test_round_trip(self):
+        config = WeightsConfig()
+        apply_overrides(config, ["--list:f64", "weights", "0.5", "2", "list--"])
+
+        self.assertEqual(config.to_dict()["weights"], [0.5, 2])
+        restored = WeightsConfig.from_dict(config.to_dict())
+        self.assertEqual(restored.weights, array.array("d", [0.5, 2]))
+        self.assertEqual(restored.fingerprint(), config.fingerprint())
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy isn't installed")
+    def test_numpy_annotation(self):
+        import numpy as np
+
+        class NumpyConfig(Config):
+            weights: np.ndarray = np.zeros(0)
+
+        config = NumpyConfig()
+        apply_overrides(config, ["--list:f32", "weights", "1", "2", "list--"])
+        self.assertIsInstance(config.weights, np.ndarray)
+        self.assertEqual(config.weights.dtype, np.float32)
+        self.assertEqual(config.weights.tolist(), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,17 @@
 import unittest
-from pydra import DataclassWrapper, PydanticWrapper, Config, apply_overrides
-from pydantic import BaseModel, Field
+from unittest import mock
+from pydra import (
+    REQUIRED,
+    DataclassWrapper,
+    PydanticWrapper,
+    Config,
+    apply_overrides,
+    build_all,
+    build_many,
+)
+from pydantic import BaseModel, Field, ValidationError
 from dataclasses import dataclass, field
+import pydra.utils
 
 
 @dataclass
@@ -102,5 +112,114 @@ class TestWrappers(unittest.TestCase):
             self.conf.wrapped_pydantic.build()
 
 
+class MaybeNamed(BaseModel):
+    name: str | None = None
+    size: int
+
+
+class ComparesBadly:
+    def __eq__(self, other):
+        raise AssertionError("compared with ==")
+
+
+@dataclass
+class Holder:
+    value: object = None
+
+
+class Nested(Config):
+    def __init__(self):
+        self.wrapped = DataclassWrapper(MyDataclass)
+        self.models = {"x": PydanticWrapper(MyPydantic)}
+
+
+class Outer(Config):
+    def __init__(self):
+        self.nested = [Nested()]
+        self.holder = DataclassWrapper(Holder)
+
+
+class TestWrapperTables(unittest.TestCase):
+    def test_field_table_cached(self):
+        DataclassWrapper(MyDataclass)
+        with mock.patch.object(pydra.utils, "fields") as fields:
+            w = DataclassWrapper(MyDataclass)
+        fields.assert_not_called()
+        self.assertEqual(w.d, {"a": REQUIRED, "b": [], "c": 4.0})
+
+    def test_factories_per_instance(self):
+        first = DataclassWrapper(MyDataclass)
+        second = DataclassWrapper(MyDataclass)
+        self.assertIsNot(first.d["b"], second.d["b"])
+        self.assertIsNot(
+            PydanticWrapper(MyPydantic).d["b"], PydanticWrapper(MyPydantic).d["b"]
+        )
+
+    def test_pydantic_defaults(self):
+        w = PydanticWrapper(MaybeNamed)
+        self.assertIsNone(w.d["name"])
+        self.assertIs(w.d["size"], REQUIRED)
+        with self.assertRaises(ValueError):
+            w.build()
+        w.size = 3
+        self.assertEqual(w.build(), MaybeNamed(size=3))
+
+    def test_required_check_uses_identity(self):
+        w = DataclassWrapper(Holder)
+        w.value = ComparesBadly()
+        self.assertIs(type(w.build().value), ComparesBadly)
+        self.assertEqual(len(build_many([w])), 1)
+
+
+class TestBuildMany(unittest.TestCase):
+    def test_order_and_batches(self):
+        wrappers = []
+        for i in range(100):
+            if i % 3 == 0:
+                w = DataclassWrapper(MyDataclass)
+            else:
+                w = PydanticWrapper(MyPydantic)
+            w.a = i
+            wrappers.append(w)
+
+        built = build_many(wrappers)
+        self.assertEqual([b.a for b in built], list(range(100)))
+        for w, b in zip(wrappers, built):
+            self.assertIs(type(b), w.wrapped_type)
+        self.assertEqual(built[1], wrappers[1].build())
+
+    def test_validation(self):
+        wrappers = [PydanticWrapper(MyPydantic) for _ in range(100)]
+        for w in wrappers:
+            w.a = "1"
+        self.assertEqual(build_many(wrappers)[0].a, 1)
+
+        wrappers[50].a = "not a number"
+        with self.assertRaises(ValidationError):
+            build_many(wrappers)
+
+        # model_construct trusts the values as they are
+        self.assertEqual(build_many(wrappers, validate=False)[50].a, "not a number")
+        self.assertEqual(wrappers[0].build(validate=False).a, "1")
+
+    def test_missing(self):
+        with self.assertRaises(ValueError):
+            build_many([DataclassWrapper(Holder), DataclassWrapper(MyDataclass)])
+
+    def test_build_all(self):
+        conf = Outer()
+        apply_overrides(conf, ["holder.value=1"])
+        conf.nested[0].wrapped.a = 1
+        conf.nested[0].models["x"].a = 2
+
+        built = build_all(conf)
+        self.assertEqual(
+            list(built), ["nested.0.wrapped", "nested.0.models.x", "holder"]
+        )
+        self.assertEqual(built["nested.0.wrapped"], MyDataclass(a=1))
+        self.assertEqual(built["nested.0.models.x"].a, 2)
+        self.assertEqual(built["holder"], Holder(value=1))
+
+
 if __name__ == "__main__":
     unittest.main()